@@ -0,0 +1,53 @@
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "a3c5e1f09b42"
+down_revision: Union[str, Sequence[str], None] = "7e7b828ecb60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BTREE_INDEXES = {
+    "ix_telemetry_events_timestamp_event_id": ["timestamp", "event_id"],
+    "ix_telemetry_events_session_id_timestamp": ["session_id", "timestamp", "event_id"],
+    "ix_telemetry_events_procedure_id_timestamp": ["procedure_id", "timestamp", "event_id"],
+    "ix_telemetry_events_event_type_timestamp": ["event_type", "timestamp", "event_id"],
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps ingest writing while the indexes build; it cannot run in a transaction.
+    with op.get_context().autocommit_block():
+        for name, columns in _BTREE_INDEXES.items():
+            op.create_index(
+                name,
+                "telemetry_events",
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        op.create_index(
+            "brin_telemetry_events_timestamp",
+            "telemetry_events",
+            ["timestamp"],
+            postgresql_using="brin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "brin_telemetry_events_timestamp",
+            table_name="telemetry_events",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        for name in reversed(_BTREE_INDEXES):
+            op.drop_index(
+                name,
+                table_name="telemetry_events",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
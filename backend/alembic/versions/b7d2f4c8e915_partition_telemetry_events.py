@@ -0,0 +1,143 @@
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "b7d2f4c8e915"
+down_revision: Union[str, Sequence[str], None] = "a3c5e1f09b42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = {
+    "ix_telemetry_events_timestamp_event_id": ["timestamp", "event_id"],
+    "ix_telemetry_events_session_id_timestamp": ["session_id", "timestamp", "event_id"],
+    "ix_telemetry_events_procedure_id_timestamp": ["procedure_id", "timestamp", "event_id"],
+    "ix_telemetry_events_event_type_timestamp": ["event_type", "timestamp", "event_id"],
+}
+
+_COLUMNS = (
+    "event_id, timestamp, schema_version, event_type, procedure_id, procedure_version, "
+    "session_id, stage_id, device, metrics, prompt, habitus, exposure, performance, created_at"
+)
+
+# Monthly partitions from the oldest existing event through three months ahead; the
+# maintenance job (features/telemetry/partitions.py) keeps creating them from here on.
+# timestamp comes from the device clock, so the start is clamped: one event dated 1970 would
+# otherwise create hundreds of empty partitions. Anything older lands in the DEFAULT partition.
+_BACKFILL_MONTHS = 24
+
+_CREATE_MONTHLY_PARTITIONS = f"""
+DO $$
+DECLARE
+    from_month date := date_trunc(
+        'month',
+        greatest(
+            coalesce((SELECT min("timestamp") FROM telemetry_events_unpartitioned), now()),
+            now() - interval '{_BACKFILL_MONTHS} months'
+        ) AT TIME ZONE 'UTC'
+    )::date;
+    last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months')::date;
+BEGIN
+    WHILE from_month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF telemetry_events '
+            'FOR VALUES FROM (%L) TO (%L)',
+            'telemetry_events_p' || to_char(from_month, 'YYYYMM'),
+            from_month::text || ' 00:00:00+00',
+            (from_month + interval '1 month')::date::text || ' 00:00:00+00'
+        );
+        from_month := (from_month + interval '1 month')::date;
+    END LOOP;
+END $$
+"""
+
+
+def _columns() -> list[sa.Column]:
+    return [
+        sa.Column("event_id", sa.UUID(), nullable=False),
+        sa.Column("timestamp", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("schema_version", sa.String(length=64), nullable=False),
+        sa.Column("event_type", sa.String(length=64), nullable=False),
+        sa.Column("procedure_id", sa.String(length=128), nullable=False),
+        sa.Column("procedure_version", sa.String(length=64), nullable=True),
+        sa.Column("session_id", sa.UUID(), nullable=True),
+        sa.Column("stage_id", sa.String(length=64), nullable=True),
+        sa.Column("device", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("metrics", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("prompt", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("habitus", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("exposure", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("performance", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    ]
+
+
+def _drop_indexes() -> None:
+    op.drop_index("brin_telemetry_events_timestamp", table_name="telemetry_events")
+    for name in _INDEXES:
+        op.drop_index(name, table_name="telemetry_events")
+
+
+def _create_indexes() -> None:
+    for name, columns in _INDEXES.items():
+        op.create_index(name, "telemetry_events", columns)
+    op.create_index(
+        "brin_telemetry_events_timestamp",
+        "telemetry_events",
+        ["timestamp"],
+        postgresql_using="brin",
+    )
+
+
+def upgrade() -> None:
+    # Rewrites the table: run in a maintenance window sized to the current row count.
+    _drop_indexes()
+    op.rename_table("telemetry_events", "telemetry_events_unpartitioned")
+    op.execute(
+        "ALTER TABLE telemetry_events_unpartitioned "
+        "RENAME CONSTRAINT telemetry_events_pkey TO telemetry_events_unpartitioned_pkey"
+    )
+
+    # The partition key must be part of the primary key, so event_id is unique per timestamp;
+    # retries carry the same timestamp and still hit ON CONFLICT DO NOTHING.
+    op.create_table(
+        "telemetry_events",
+        *_columns(),
+        sa.PrimaryKeyConstraint("event_id", "timestamp"),
+        postgresql_partition_by="RANGE (timestamp)",
+    )
+    # Catches events with wildly wrong device clocks instead of failing their insert.
+    op.execute("CREATE TABLE telemetry_events_default PARTITION OF telemetry_events DEFAULT")
+    op.execute(_CREATE_MONTHLY_PARTITIONS)
+
+    op.execute(
+        f"INSERT INTO telemetry_events ({_COLUMNS}) "
+        f"SELECT {_COLUMNS} FROM telemetry_events_unpartitioned"
+    )
+    op.drop_table("telemetry_events_unpartitioned")
+    _create_indexes()
+
+
+def downgrade() -> None:
+    _drop_indexes()
+    op.rename_table("telemetry_events", "telemetry_events_partitioned")
+    op.execute(
+        "ALTER TABLE telemetry_events_partitioned "
+        "RENAME CONSTRAINT telemetry_events_pkey TO telemetry_events_partitioned_pkey"
+    )
+
+    op.create_table(
+        "telemetry_events",
+        *_columns(),
+        sa.PrimaryKeyConstraint("event_id"),
+    )
+    op.execute(
+        f"INSERT INTO telemetry_events ({_COLUMNS}) "
+        f"SELECT {_COLUMNS} FROM telemetry_events_partitioned "
+        "ON CONFLICT (event_id) DO NOTHING"
+    )
+    # Attached partitions go with the parent; partitions already detached are left alone.
+    op.drop_table("telemetry_events_partitioned")
+    _create_indexes()
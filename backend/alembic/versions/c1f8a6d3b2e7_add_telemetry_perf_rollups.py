@@ -0,0 +1,70 @@
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "c1f8a6d3b2e7"
+down_revision: Union[str, Sequence[str], None] = "b7d2f4c8e915"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Sketches are flat {"bucket": count} objects; merging two is a per-key sum.
+_CREATE_SKETCH_MERGE = """
+CREATE OR REPLACE FUNCTION telemetry_sketch_merge(a jsonb, b jsonb) RETURNS jsonb
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT coalesce(jsonb_object_agg(key, total), '{}'::jsonb)
+    FROM (
+        SELECT key, sum(value::bigint) AS total
+        FROM (
+            SELECT * FROM jsonb_each_text(coalesce(a, '{}'::jsonb))
+            UNION ALL
+            SELECT * FROM jsonb_each_text(coalesce(b, '{}'::jsonb))
+        ) AS entries
+        GROUP BY key
+    ) AS merged
+$$
+"""
+
+
+def upgrade() -> None:
+    op.execute(_CREATE_SKETCH_MERGE)
+    op.create_table(
+        "telemetry_perf_rollups",
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("procedure_id", sa.String(length=128), nullable=False),
+        sa.Column("stage_id", sa.String(length=64), nullable=False),
+        sa.Column("device_platform", sa.String(length=32), nullable=False),
+        sa.Column("device_model", sa.String(length=128), nullable=False),
+        sa.Column("event_count", sa.BigInteger(), nullable=False),
+        sa.Column("latency_count", sa.BigInteger(), nullable=False),
+        sa.Column("latency_sum", sa.Float(), nullable=False),
+        sa.Column("latency_sketch", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("fps_count", sa.BigInteger(), nullable=False),
+        sa.Column("fps_sum", sa.Float(), nullable=False),
+        sa.Column("fps_sketch", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "bucket_start", "procedure_id", "stage_id", "device_platform", "device_model"
+        ),
+    )
+    op.create_table(
+        "telemetry_rollup_watermarks",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_index(
+        "brin_telemetry_events_created_at",
+        "telemetry_events",
+        ["created_at"],
+        postgresql_using="brin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("brin_telemetry_events_created_at", table_name="telemetry_events")
+    op.drop_table("telemetry_rollup_watermarks")
+    op.drop_table("telemetry_perf_rollups")
+    op.execute("DROP FUNCTION IF EXISTS telemetry_sketch_merge(jsonb, jsonb)")
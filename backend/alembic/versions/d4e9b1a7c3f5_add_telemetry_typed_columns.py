@@ -0,0 +1,63 @@
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import context, op
+
+revision: str = "d4e9b1a7c3f5"
+down_revision: Union[str, Sequence[str], None] = "c1f8a6d3b2e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = [
+    sa.Column("perf_frame_latency_ms", sa.Float(), nullable=True),
+    sa.Column("perf_fps", sa.Float(), nullable=True),
+    sa.Column("exposure_kvp", sa.Float(), nullable=True),
+    sa.Column("exposure_mas", sa.Float(), nullable=True),
+    sa.Column("habitus_size_class_estimated", sa.String(length=16), nullable=True),
+    sa.Column("habitus_size_class_final", sa.String(length=16), nullable=True),
+    sa.Column("prompt_rule_id", sa.String(length=128), nullable=True),
+]
+
+_INDEX = "ix_telemetry_events_prompt_rule_id_timestamp"
+_INDEX_COLUMNS = "prompt_rule_id, timestamp, event_id"
+
+
+def upgrade() -> None:
+    # Nullable columns without a default are a catalog-only change; existing rows are filled
+    # by scripts/backfill_telemetry_columns.py in small batches.
+    for column in _COLUMNS:
+        op.add_column("telemetry_events", column)
+
+    if context.is_offline_mode():
+        op.create_index(_INDEX, "telemetry_events", ["prompt_rule_id", "timestamp", "event_id"])
+        return
+
+    # A plain CREATE INDEX on the parent would block ingest while every partition is indexed.
+    # Instead the parent index is created invalid (ON ONLY), each partition's index is built
+    # CONCURRENTLY and attached; the parent index becomes valid once all are attached.
+    op.execute(f"CREATE INDEX IF NOT EXISTS {_INDEX} ON ONLY telemetry_events ({_INDEX_COLUMNS})")
+    partitions = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'telemetry_events'::regclass ORDER BY c.relname"
+            )
+        )
+        .scalars()
+        .all()
+    )
+    with op.get_context().autocommit_block():
+        for partition in partitions:
+            name = f"ix_{partition}_prompt_rule_id"
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {partition} ({_INDEX_COLUMNS})"
+            )
+            op.execute(f"ALTER INDEX {_INDEX} ATTACH PARTITION {name}")
+
+
+def downgrade() -> None:
+    op.drop_index(_INDEX, table_name="telemetry_events")
+    for column in reversed(_COLUMNS):
+        op.drop_column("telemetry_events", column.name)
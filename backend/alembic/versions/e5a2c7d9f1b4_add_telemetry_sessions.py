@@ -0,0 +1,43 @@
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "e5a2c7d9f1b4"
+down_revision: Union[str, Sequence[str], None] = "d4e9b1a7c3f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "telemetry_sessions",
+        sa.Column("session_id", sa.UUID(), nullable=False),
+        sa.Column("procedure_id", sa.String(length=128), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("first_event_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_event_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("ready_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("ended_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("event_count", sa.BigInteger(), nullable=False),
+        sa.Column("prompt_counts", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("habitus_overridden", sa.Boolean(), nullable=False),
+        sa.Column("last_exposure", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("last_exposure_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("session_id"),
+    )
+    op.create_index(
+        "ix_telemetry_sessions_procedure_id_first_event_at",
+        "telemetry_sessions",
+        ["procedure_id", "first_event_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_telemetry_sessions_procedure_id_first_event_at", table_name="telemetry_sessions"
+    )
+    op.drop_table("telemetry_sessions")
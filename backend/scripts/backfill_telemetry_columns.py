@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import uuid
+
+from sqlalchemy import create_engine
+
+from radiobuddy_api.features.telemetry.backfill import backfill_typed_columns
+from radiobuddy_api.platform.config import settings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Fill the typed telemetry columns from the JSONB fields of older events."
+    )
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--pause-seconds", type=float, default=0.1)
+    parser.add_argument("--after-timestamp", type=dt.datetime.fromisoformat, default=None)
+    parser.add_argument("--after-event-id", type=uuid.UUID, default=None)
+    args = parser.parse_args()
+
+    if not settings.database_url:
+        raise SystemExit("RADIOBUDDY_DATABASE_URL is not set")
+
+    after = None
+    if args.after_timestamp is not None:
+        after = (args.after_timestamp, args.after_event_id or uuid.UUID(int=0))
+
+    engine = create_engine(settings.database_url, pool_pre_ping=True)
+    result = backfill_typed_columns(
+        engine, batch_size=args.batch_size, pause_seconds=args.pause_seconds, after=after
+    )
+    print(f"Scanned {result.scanned} events in {result.batches} batches")
+    print(f"Updated {result.updated} events")
+    if result.last_key is not None:
+        # Lets an interrupted run resume with --after-timestamp/--after-event-id.
+        print(f"Last key: {result.last_key[0].isoformat()} {result.last_key[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+from radiobuddy_api.features.telemetry.export import ExportUnavailableError, export_events
+from radiobuddy_api.platform.config import settings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export telemetry events to Parquet.")
+    parser.add_argument("--out", default=settings.telemetry_export_dir)
+    parser.add_argument("--since", type=dt.datetime.fromisoformat, default=None)
+    parser.add_argument("--until", type=dt.datetime.fromisoformat, default=None)
+    parser.add_argument("--chunk-rows", type=int, default=settings.telemetry_export_chunk_rows)
+    parser.add_argument(
+        "--max-open-files", type=int, default=settings.telemetry_export_max_open_files
+    )
+    args = parser.parse_args()
+
+    if not settings.database_url:
+        raise SystemExit("RADIOBUDDY_DATABASE_URL is not set")
+    if not args.out:
+        raise SystemExit("Pass --out or set RADIOBUDDY_TELEMETRY_EXPORT_DIR")
+
+    engine = create_engine(settings.database_url, pool_pre_ping=True)
+    try:
+        result = export_events(
+            engine,
+            Path(args.out),
+            since=args.since,
+            until=args.until,
+            chunk_rows=args.chunk_rows,
+            max_open_files=args.max_open_files,
+        )
+    except ExportUnavailableError as exc:
+        raise SystemExit(str(exc)) from exc
+    print(f"Exported {result.rows} events into {len(result.files)} files")
+    print(f"Watermark: {result.watermark.isoformat() if result.watermark else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
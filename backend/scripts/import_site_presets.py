@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from radiobuddy_api.features.site_presets.provisioning import (
+    InvalidManifestError,
+    import_manifest,
+    parse_manifest,
+)
+from radiobuddy_api.features.site_presets.schemas import ProvisioningResult
+from radiobuddy_api.platform.config import settings
+
+
+async def run(database_url: str, manifest_path: Path) -> ProvisioningResult:
+    try:
+        manifest = parse_manifest(
+            manifest_path.read_bytes(), ndjson=manifest_path.suffix in (".ndjson", ".jsonl")
+        )
+    except InvalidManifestError as exc:
+        raise SystemExit(f"{manifest_path}: {exc}") from exc
+
+    engine = create_async_engine(database_url, pool_pre_ping=True)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            return await import_manifest(db, manifest)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Create or update sites, rooms and room exposure protocols from a manifest."
+    )
+    parser.add_argument("manifest", type=Path, help=".json manifest or .ndjson/.jsonl rows")
+    args = parser.parse_args()
+
+    if not settings.database_url:
+        raise SystemExit("RADIOBUDDY_DATABASE_URL is not set")
+
+    result = asyncio.run(run(settings.database_url, args.manifest))
+    for row in result.results:
+        if row.status == "rejected":
+            print(f"rejected {row.kind} {row.index} {row.key or ''}: {row.errors}")
+    if not result.applied:
+        raise SystemExit(f"{result.rejected} rows rejected; nothing was written")
+    print(f"Inserted {result.inserted}, updated {result.updated}, unchanged {result.unchanged}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from sqlalchemy import create_engine
+
+from radiobuddy_api.features.telemetry.partitions import run_maintenance
+from radiobuddy_api.platform.config import settings
+
+
+def main() -> None:
+    if not settings.database_url:
+        raise SystemExit("RADIOBUDDY_DATABASE_URL is not set")
+
+    engine = create_engine(settings.database_url, pool_pre_ping=True)
+    result = run_maintenance(engine)
+    if result.skipped:
+        print("Skipped: maintenance is already running elsewhere")
+        return
+    print(f"Created partitions: {', '.join(result.created) or 'none'}")
+    print(f"Expired partitions: {', '.join(result.expired) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import json
 from pathlib import Path
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 from radiobuddy_api.features.site_presets.schemas import ExposureProtocolUpsertIn
 from radiobuddy_api.features.site_presets.service import (
@@ -15,11 +15,8 @@ from radiobuddy_api.features.site_presets.service import (
 from radiobuddy_api.platform.config import settings
 
 
-def main() -> None:
-    if not settings.database_url:
-        raise SystemExit("RADIOBUDDY_DATABASE_URL is not set")
-
-    engine = create_engine(settings.database_url, pool_pre_ping=True)
+async def seed(database_url: str) -> None:
+    engine = create_async_engine(database_url, pool_pre_ping=True)
 
     repo_root = Path(__file__).resolve().parents[2]
     exposure_protocol_path = repo_root / "backend" / "resources" / "exposure_protocol.json"
@@ -31,27 +28,34 @@ def main() -> None:
 
     upsert_in = ExposureProtocolUpsertIn.model_validate(payload)
 
-    with Session(engine) as db:
+    async with AsyncSession(engine, expire_on_commit=False) as db:
         try:
-            create_site(db, site_id=site_id, name="Demo Site")
+            await create_site(db, site_id=site_id, name="Demo Site")
         except Exception:
-            db.rollback()
+            await db.rollback()
 
         try:
-            create_room(db, site_id=site_id, room_id=room_id, name="Room 1")
+            await create_room(db, site_id=site_id, room_id=room_id, name="Room 1")
         except Exception:
-            db.rollback()
+            await db.rollback()
 
-        upsert_room_exposure_protocol(
+        await upsert_room_exposure_protocol(
             db,
             site_id=site_id,
             room_id=room_id,
             procedure_id=procedure_id,
             payload=upsert_in,
         )
+    await engine.dispose()
 
     print(f"Seeded site_id={site_id} room_id={room_id} procedure_id={procedure_id}")
 
 
+def main() -> None:
+    if not settings.database_url:
+        raise SystemExit("RADIOBUDDY_DATABASE_URL is not set")
+    asyncio.run(seed(settings.database_url))
+
+
 if __name__ == "__main__":
     main()
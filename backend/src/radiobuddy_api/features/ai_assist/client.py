@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import importlib.util
+import logging
+
+import httpx
+
+from radiobuddy_api.platform.config import settings
+
+logger = logging.getLogger("radiobuddy_api.ai_assist")
+
+_client: httpx.AsyncClient | None = None
+
+
+def _http2_enabled() -> bool:
+    if not settings.do_inference_http2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning(
+            "RADIOBUDDY_DO_INFERENCE_HTTP2 is set but h2 is not installed; using HTTP/1.1"
+        )
+        return False
+    return True
+
+
+def _build_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=_http2_enabled(),
+        timeout=httpx.Timeout(
+            settings.do_inference_timeout_seconds,
+            connect=settings.do_inference_connect_timeout_seconds,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.do_inference_max_connections,
+            max_keepalive_connections=settings.do_inference_max_keepalive_connections,
+            keepalive_expiry=settings.do_inference_keepalive_expiry_seconds,
+        ),
+    )
+
+
+async def start_inference_client() -> None:
+    global _client
+    if _client is None:
+        _client = _build_client()
+
+
+async def close_inference_client() -> None:
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.aclose()
+
+
+def get_inference_client() -> httpx.AsyncClient:
+    # The lifespan normally creates the client; build it lazily when it did not run.
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+from typing import Any
+
+from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from radiobuddy_api.features.ai_assist.schemas import AiAssistAnalyzeIn
+from radiobuddy_api.features.ai_assist.service import analyze_position
+
+logger = logging.getLogger("radiobuddy_api.ai_assist.live")
+
+
+class LatestFrameSlot:
+    # Holds at most one pending frame: a newer frame replaces an unprocessed one, so a
+    # slow consumer only ever sees the freshest state and memory stays constant.
+    def __init__(self) -> None:
+        self._frame: Any = None
+        self._ready = asyncio.Event()
+        self.closed = False
+        self.failed = False
+        self.dropped = 0
+
+    def put(self, frame: Any) -> None:
+        if self._frame is not None:
+            self.dropped += 1
+        self._frame = frame
+        self._ready.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self._ready.set()
+
+    async def take(self) -> Any:
+        # Returns None once the slot is closed and drained.
+        while self._frame is None and not self.closed:
+            await self._ready.wait()
+            self._ready.clear()
+        frame, self._frame = self._frame, None
+        return frame
+
+
+# Stands in for a binary frame or one that is not valid JSON, so the session reports it and
+# carries on.
+_MALFORMED_FRAME = object()
+
+
+def _parse_frame(message: dict[str, Any]) -> Any:
+    text = message.get("text")
+    if text is None:
+        return _MALFORMED_FRAME
+    try:
+        return json.loads(text)
+    except ValueError:
+        return _MALFORMED_FRAME
+
+
+async def _receive_frames(websocket: WebSocket, slot: LatestFrameSlot) -> None:
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            slot.put(_parse_frame(message))
+    except WebSocketDisconnect:
+        pass
+    except Exception:
+        logger.exception("live session receiver failed")
+        slot.failed = True
+    finally:
+        slot.close()
+
+
+async def run_live_session(websocket: WebSocket, procedure_id: str) -> None:
+    await websocket.accept()
+    slot = LatestFrameSlot()
+    receiver = asyncio.create_task(_receive_frames(websocket, slot))
+    last_instruction: str | None = None
+
+    try:
+        while True:
+            frame = await slot.take()
+            if frame is None:
+                if slot.failed:
+                    await websocket.close(code=1011)
+                break
+
+            try:
+                if not isinstance(frame, dict):
+                    raise ValueError("frame must be an object")
+                payload = AiAssistAnalyzeIn.model_validate(
+                    {**frame, "procedure_id": frame.get("procedure_id", procedure_id)}
+                )
+            except (ValidationError, ValueError):
+                await websocket.send_json({"type": "error", "detail": "invalid_frame"})
+                continue
+
+            result = await analyze_position(payload)
+            if result.instruction == last_instruction:
+                continue
+            last_instruction = result.instruction
+            await websocket.send_json(
+                {
+                    "type": "instruction",
+                    "stage_id": payload.stage_id,
+                    "frames_dropped": slot.dropped,
+                    **result.model_dump(),
+                }
+            )
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await receiver
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query, WebSocket
 
-from radiobuddy_api.features.ai_assist.schemas import AiAssistAnalyzeIn, AiAssistAnalyzeOut
-from radiobuddy_api.features.ai_assist.service import analyze_position
+from radiobuddy_api.features.ai_assist.live import run_live_session
+from radiobuddy_api.features.ai_assist.schemas import (
+    AiAssistAnalyzeIn,
+    AiAssistAnalyzeOut,
+    AiAssistBatchAnalyzeIn,
+    AiAssistBatchAnalyzeOut,
+)
+from radiobuddy_api.features.ai_assist.service import analyze_position, analyze_positions
 
 router = APIRouter(prefix="/ai", tags=["ai_assist"])
 
@@ -11,3 +17,16 @@ router = APIRouter(prefix="/ai", tags=["ai_assist"])
 @router.post("/positioning/analyze", response_model=AiAssistAnalyzeOut)
 async def analyze_positioning(payload: AiAssistAnalyzeIn) -> AiAssistAnalyzeOut:
     return await analyze_position(payload)
+
+
+@router.post("/positioning/analyze:batch", response_model=AiAssistBatchAnalyzeOut)
+async def analyze_positioning_batch(payload: AiAssistBatchAnalyzeIn) -> AiAssistBatchAnalyzeOut:
+    return AiAssistBatchAnalyzeOut(results=await analyze_positions(payload.items))
+
+
+@router.websocket("/positioning/live")
+async def live_positioning(
+    websocket: WebSocket,
+    procedure_id: str = Query(..., pattern=r"^[a-z0-9_]+$"),
+) -> None:
+    await run_live_session(websocket, procedure_id)
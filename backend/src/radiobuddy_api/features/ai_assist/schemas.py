@@ -4,6 +4,8 @@ from typing import Literal
 
 from pydantic import BaseModel, Field
 
+MAX_BATCH_ITEMS = 1000
+
 
 class AiAssistAnalyzeIn(BaseModel):
     procedure_id: str = Field(..., pattern=r"^[a-z0-9_]+$")
@@ -15,3 +17,12 @@ class AiAssistAnalyzeOut(BaseModel):
     instruction: str
     source: Literal["local", "do_inference", "do_inference_fallback"]
     model: str | None = None
+    cached: bool = False
+
+
+class AiAssistBatchAnalyzeIn(BaseModel):
+    items: list[AiAssistAnalyzeIn] = Field(..., max_length=MAX_BATCH_ITEMS)
+
+
+class AiAssistBatchAnalyzeOut(BaseModel):
+    results: list[AiAssistAnalyzeOut]
@@ -1,75 +1,148 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import math
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
 
-import httpx
+import numpy as np
 
+from radiobuddy_api.features.ai_assist.client import get_inference_client
 from radiobuddy_api.features.ai_assist.schemas import AiAssistAnalyzeIn, AiAssistAnalyzeOut
+from radiobuddy_api.platform.cache import MISSING, TTLCache
+from radiobuddy_api.platform.circuit_breaker import OPEN, Bulkhead, CircuitBreaker
 from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.metrics import register_gauge
+from radiobuddy_api.platform.singleflight import SingleFlight
+
+_INFERENCE_URL = "https://inference.do-ai.run/v1/chat/completions"
+
+_SYSTEM_PROMPT = (
+    "You are an xray positioning assistant for chest PA erect. "
+    "Return one concise instruction under 14 words. "
+    "Do not include warnings, disclaimers, or extra explanation."
+)
+
+_BATCH_SYSTEM_PROMPT = (
+    "You are an xray positioning assistant for chest PA erect. "
+    "You receive a JSON array of positioning frames. "
+    "Return only a JSON array of strings with exactly one concise instruction "
+    "under 14 words per frame, in the same order. "
+    "Do not include warnings, disclaimers, or extra explanation."
+)
+
+# Checked in order; the first matching check wins. Missing metrics count as 0.0.
+_LOCAL_CHECKS: list[tuple[str, str, float, str]] = [
+    ("pose_confidence", "lt", 0.55, "Step back and keep full torso in view."),
+    ("framing_score", "lt", 0.6, "Center the patient in frame."),
+    ("motion_score", "gt", 0.55, "Hold still briefly before exposure."),
+    ("rotation_risk", "gt", 0.6, "Reduce patient rotation slightly."),
+    ("tilt_risk", "gt", 0.6, "Straighten up to reduce lateral tilt."),
+    ("chin_risk", "gt", 0.6, "Lift the chin slightly."),
+    ("scapula_risk", "gt", 0.6, "Roll shoulders forward slightly."),
+]
+_LOCAL_READY = "Positioning looks good. Hold still."
+_LOCAL_METRICS = [metric for metric, _, _, _ in _LOCAL_CHECKS]
+
+# Remote instructions keyed by (procedure_id, stage_id, bucketed metrics).
+_instruction_cache = TTLCache(
+    max_entries=settings.do_inference_cache_max_entries,
+    ttl_seconds=settings.do_inference_cache_ttl_seconds,
+)
+register_gauge("ai_assist.instruction_cache.hits", lambda: _instruction_cache.hits)
+register_gauge("ai_assist.instruction_cache.misses", lambda: _instruction_cache.misses)
+register_gauge("ai_assist.instruction_cache.size", lambda: len(_instruction_cache))
+
+# Concurrent identical remote calls share one in-flight request.
+_inflight = SingleFlight()
+register_gauge("ai_assist.inflight.started", lambda: _inflight.started)
+register_gauge("ai_assist.inflight.coalesced", lambda: _inflight.coalesced)
+
+# Outbound calls trip the breaker on error rate or slowness and are capped by the bulkhead.
+_breaker = CircuitBreaker(
+    window_size=settings.do_inference_breaker_window,
+    min_calls=settings.do_inference_breaker_min_calls,
+    failure_rate_threshold=settings.do_inference_breaker_failure_rate,
+    slow_call_seconds=settings.do_inference_breaker_slow_call_seconds,
+    open_seconds=settings.do_inference_breaker_open_seconds,
+)
+_bulkhead = Bulkhead(settings.do_inference_max_concurrency)
+register_gauge("ai_assist.breaker.open", lambda: int(_breaker.state == OPEN))
+register_gauge("ai_assist.breaker.times_opened", lambda: _breaker.times_opened)
+register_gauge("ai_assist.breaker.rejected", lambda: _breaker.rejected)
+register_gauge("ai_assist.bulkhead.in_use", lambda: _bulkhead.in_use)
+register_gauge("ai_assist.bulkhead.rejected", lambda: _bulkhead.rejected)
+
+T = TypeVar("T")
+
+
+class RemoteUnavailableError(RuntimeError):
+    pass
 
 
 def _local_instruction(payload: AiAssistAnalyzeIn) -> str:
     metrics = payload.metrics
-    pose_conf = metrics.get("pose_confidence", 0.0)
-    framing = metrics.get("framing_score", 0.0)
-    motion = metrics.get("motion_score", 0.0)
-    rotation = metrics.get("rotation_risk", 0.0)
-    tilt = metrics.get("tilt_risk", 0.0)
-    chin = metrics.get("chin_risk", 0.0)
-    scap = metrics.get("scapula_risk", 0.0)
-
-    if pose_conf < 0.55:
-        return "Step back and keep full torso in view."
-    if framing < 0.6:
-        return "Center the patient in frame."
-    if motion > 0.55:
-        return "Hold still briefly before exposure."
-    if rotation > 0.6:
-        return "Reduce patient rotation slightly."
-    if tilt > 0.6:
-        return "Straighten up to reduce lateral tilt."
-    if chin > 0.6:
-        return "Lift the chin slightly."
-    if scap > 0.6:
-        return "Roll shoulders forward slightly."
-    return "Positioning looks good. Hold still."
+    for metric, op, threshold, instruction in _LOCAL_CHECKS:
+        value = metrics.get(metric, 0.0)
+        if (value < threshold) if op == "lt" else (value > threshold):
+            return instruction
+    return _LOCAL_READY
 
 
-async def _do_inference_instruction(payload: AiAssistAnalyzeIn) -> str:
-    key = settings.do_model_access_key
-    model = settings.do_model_id
-    if not key or not model:
-        raise RuntimeError("model_credentials_missing")
+def _local_instructions(payloads: list[AiAssistAnalyzeIn]) -> list[str]:
+    if not payloads:
+        return []
 
-    system_prompt = (
-        "You are an xray positioning assistant for chest PA erect. "
-        "Return one concise instruction under 14 words. "
-        "Do not include warnings, disclaimers, or extra explanation."
+    matrix = np.array(
+        [[p.metrics.get(metric, 0.0) for metric in _LOCAL_METRICS] for p in payloads],
+        dtype=np.float64,
     )
-    user_payload = {
+    thresholds = np.array([threshold for _, _, threshold, _ in _LOCAL_CHECKS])
+    is_lt = np.array([op == "lt" for _, op, _, _ in _LOCAL_CHECKS])
+    hits = np.where(is_lt, matrix < thresholds, matrix > thresholds)
+
+    choices = np.array([instruction for _, _, _, instruction in _LOCAL_CHECKS] + [_LOCAL_READY])
+    first_hit = np.where(hits.any(axis=1), hits.argmax(axis=1), len(_LOCAL_CHECKS))
+    return choices[first_hit].tolist()
+
+
+def _remote_enabled() -> bool:
+    return bool(settings.do_inference_enabled and settings.do_model_access_key)
+
+
+def _frame_payload(payload: AiAssistAnalyzeIn) -> dict[str, Any]:
+    return {
         "procedure_id": payload.procedure_id,
         "stage_id": payload.stage_id,
         "metrics": payload.metrics,
     }
 
+
+async def _chat_completion(system_prompt: str, user_content: str, max_tokens: int) -> str:
+    key = settings.do_model_access_key
+    model = settings.do_model_id
+    if not key or not model:
+        raise RuntimeError("model_credentials_missing")
+
     request_body = {
         "model": model,
         "temperature": 0.1,
-        "max_tokens": 40,
+        "max_tokens": max_tokens,
         "messages": [
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": json.dumps(user_payload)},
+            {"role": "user", "content": user_content},
         ],
     }
 
-    async with httpx.AsyncClient(timeout=settings.do_inference_timeout_seconds) as client:
-        response = await client.post(
-            "https://inference.do-ai.run/v1/chat/completions",
-            headers={"Authorization": f"Bearer {key}", "Content-Type": "application/json"},
-            json=request_body,
-        )
-        response.raise_for_status()
-        data = response.json()
+    response = await get_inference_client().post(
+        _INFERENCE_URL,
+        headers={"Authorization": f"Bearer {key}", "Content-Type": "application/json"},
+        json=request_body,
+    )
+    response.raise_for_status()
+    data = response.json()
 
     choices = data.get("choices", [])
     if not choices:
@@ -81,11 +154,93 @@ async def _do_inference_instruction(payload: AiAssistAnalyzeIn) -> str:
     return content.strip()
 
 
+async def _do_inference_instruction(payload: AiAssistAnalyzeIn) -> str:
+    return await _chat_completion(_SYSTEM_PROMPT, json.dumps(_frame_payload(payload)), 40)
+
+
+async def _do_inference_batch(payloads: list[AiAssistAnalyzeIn]) -> list[str]:
+    content = await _chat_completion(
+        _BATCH_SYSTEM_PROMPT,
+        json.dumps([_frame_payload(p) for p in payloads]),
+        40 * len(payloads),
+    )
+    instructions = json.loads(content)
+    if (
+        not isinstance(instructions, list)
+        or len(instructions) != len(payloads)
+        or not all(isinstance(i, str) and i.strip() for i in instructions)
+    ):
+        raise RuntimeError("malformed_batch_content")
+    return [i.strip() for i in instructions]
+
+
+async def _guarded_remote(call: Callable[[], Awaitable[T]]) -> T:
+    if not _bulkhead.try_acquire():
+        raise RemoteUnavailableError("bulkhead_full")
+    try:
+        if not _breaker.allow_request():
+            raise RemoteUnavailableError("circuit_open")
+        start = time.monotonic()
+        try:
+            result = await call()
+        except BaseException:
+            # Includes cancellation by an exhausted latency budget, which counts as slow.
+            _breaker.record_failure()
+            raise
+        _breaker.record_success(time.monotonic() - start)
+        return result
+    finally:
+        _bulkhead.release()
+
+
+async def _within_budget(call: Awaitable[T]) -> T:
+    return await asyncio.wait_for(call, settings.do_inference_latency_budget_seconds)
+
+
+def _cache_key(payload: AiAssistAnalyzeIn) -> tuple[Any, ...]:
+    resolution = settings.do_inference_cache_resolution
+    metrics = tuple(sorted((k, _metric_bucket(v, resolution)) for k, v in payload.metrics.items()))
+    return (payload.procedure_id, payload.stage_id, metrics)
+
+
+def _metric_bucket(value: float, resolution: float) -> float | int | str:
+    # NaN and +/-inf cannot be rounded, and NaN never equals itself; "nan"/"inf"/"-inf" are
+    # stable keys for them.
+    if not math.isfinite(value):
+        return str(value)
+    return round(value / resolution) if resolution > 0 else value
+
+
+def _cached_instruction(key: tuple[Any, ...]) -> str | None:
+    if not settings.do_inference_cache_enabled:
+        return None
+    cached = _instruction_cache.get(key)
+    return None if cached is MISSING else cached
+
+
+def _remember_instruction(key: tuple[Any, ...], instruction: str) -> None:
+    if settings.do_inference_cache_enabled:
+        _instruction_cache.set(key, instruction)
+
+
 async def analyze_position(payload: AiAssistAnalyzeIn) -> AiAssistAnalyzeOut:
     model = settings.do_model_id
-    if settings.do_inference_enabled and settings.do_model_access_key:
+    if _remote_enabled():
+        key = _cache_key(payload)
+        cached = _cached_instruction(key)
+        if cached is not None:
+            return AiAssistAnalyzeOut(
+                instruction=cached, source="do_inference", model=model, cached=True
+            )
         try:
-            instruction = await _do_inference_instruction(payload)
+            instruction = await _within_budget(
+                _inflight.do(
+                    key,
+                    lambda: _guarded_remote(lambda: _do_inference_instruction(payload)),
+                    timeout=settings.do_inference_singleflight_timeout_seconds,
+                )
+            )
+            _remember_instruction(key, instruction)
             return AiAssistAnalyzeOut(instruction=instruction, source="do_inference", model=model)
         except Exception:
             return AiAssistAnalyzeOut(
@@ -99,3 +254,76 @@ async def analyze_position(payload: AiAssistAnalyzeIn) -> AiAssistAnalyzeOut:
         source="local",
         model=model,
     )
+
+
+async def _remote_batch_results(
+    payloads: list[AiAssistAnalyzeIn], local: list[str]
+) -> list[AiAssistAnalyzeOut]:
+    model = settings.do_model_id
+
+    # Frames in the same metrics bucket (common when a stream is held still) share one
+    # key; keys already in the instruction cache are not sent at all.
+    keys = [_cache_key(payload) for payload in payloads]
+    resolved: dict[tuple[Any, ...], tuple[str, bool]] = {}
+    pending: dict[tuple[Any, ...], AiAssistAnalyzeIn] = {}
+    for key, payload in zip(keys, payloads):
+        if key in resolved or key in pending:
+            continue
+        cached = _cached_instruction(key)
+        if cached is not None:
+            resolved[key] = (cached, True)
+        else:
+            pending[key] = payload
+
+    chunk_size = max(1, settings.do_inference_batch_size)
+    pending_keys = list(pending)
+    chunks = [
+        pending_keys[start : start + chunk_size]
+        for start in range(0, len(pending_keys), chunk_size)
+    ]
+
+    # Chunks queue for a slot rather than all going out at once; each one's latency budget
+    # starts when it is sent.
+    slots = asyncio.Semaphore(max(1, settings.do_inference_batch_concurrency))
+
+    async def send(chunk: list[tuple[Any, ...]]) -> list[str]:
+        batch = [pending[key] for key in chunk]
+        async with slots:
+            return await _within_budget(_guarded_remote(lambda: _do_inference_batch(batch)))
+
+    outcomes = await asyncio.gather(*(send(chunk) for chunk in chunks), return_exceptions=True)
+    for chunk, outcome in zip(chunks, outcomes):
+        if isinstance(outcome, BaseException):
+            continue
+        for key, instruction in zip(chunk, outcome):
+            _remember_instruction(key, instruction)
+            resolved[key] = (instruction, False)
+
+    results = []
+    for key, fallback in zip(keys, local):
+        hit = resolved.get(key)
+        if hit is None:
+            results.append(
+                AiAssistAnalyzeOut(
+                    instruction=fallback, source="do_inference_fallback", model=model
+                )
+            )
+        else:
+            results.append(
+                AiAssistAnalyzeOut(
+                    instruction=hit[0], source="do_inference", model=model, cached=hit[1]
+                )
+            )
+    return results
+
+
+async def analyze_positions(payloads: list[AiAssistAnalyzeIn]) -> list[AiAssistAnalyzeOut]:
+    local = _local_instructions(payloads)
+    if _remote_enabled() and payloads:
+        return await _remote_batch_results(payloads, local)
+
+    model = settings.do_model_id
+    return [
+        AiAssistAnalyzeOut(instruction=instruction, source="local", model=model)
+        for instruction in local
+    ]
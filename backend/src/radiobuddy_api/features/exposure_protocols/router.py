@@ -1,25 +1,32 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
 
-from radiobuddy_api.features.exposure_protocols.service import get_chest_pa_protocol, get_protocol
+from radiobuddy_api.features.exposure_protocols.service import (
+    get_chest_pa_protocol_document,
+    get_protocol_document,
+)
+from radiobuddy_api.platform.http_cache import conditional_json_response
 
 router = APIRouter(prefix="/exposure-protocols", tags=["exposure_protocols"])
 
 
 @router.get("/chest-pa")
-def get_chest_pa_protocol_endpoint() -> JSONResponse:
-    return JSONResponse(content=get_chest_pa_protocol())
+def get_chest_pa_protocol_endpoint(request: Request) -> Response:
+    return conditional_json_response(request, get_chest_pa_protocol_document())
 
 
 @router.get("/{procedure_id}")
-def get_protocol_for_procedure(
+async def get_protocol_for_procedure(
+    request: Request,
     procedure_id: str,
     site_id: str | None = None,
     room_id: str | None = None,
-) -> JSONResponse:
-    payload = get_protocol(procedure_id=procedure_id, site_id=site_id, room_id=room_id)
-    if payload is None:
+) -> Response:
+    document = await get_protocol_document(
+        procedure_id=procedure_id, site_id=site_id, room_id=room_id
+    )
+    if document is None:
         raise HTTPException(status_code=404, detail="protocol_not_found")
-    return JSONResponse(content=payload)
+    return conditional_json_response(request, document)
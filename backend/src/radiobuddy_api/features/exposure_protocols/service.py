@@ -1,23 +1,51 @@
 from __future__ import annotations
 
+import datetime as dt
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
-
 from radiobuddy_api.features.site_presets.models import RoomExposureProtocol
+from radiobuddy_api.platform.cache import MISSING, TTLCache
 from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.db.routing import use_primary
+from radiobuddy_api.platform.db.session import get_async_sessionmaker
+from radiobuddy_api.platform.http_cache import JsonDocument, content_document, strong_etag
 from radiobuddy_api.platform.json_schema import validate_instance
+from radiobuddy_api.platform.metrics import register_gauge
 
 _RESOURCE_PATH = Path(__file__).resolve().parents[4] / "resources" / "exposure_protocol.json"
 
-
-def get_chest_pa_protocol() -> dict[str, Any]:
+# (site_id, room_id, procedure_id) -> JsonDocument, or None when the room has no override.
+_room_protocol_cache = TTLCache(
+    max_entries=settings.exposure_protocol_cache_max_entries,
+    ttl_seconds=settings.exposure_protocol_cache_ttl_seconds,
+)
+# Keys written by this process recently. Their lookups read the primary until replicas have
+# caught up, so a lagging replica cannot put the old row back into the cache.
+_recent_writes = TTLCache(
+    max_entries=settings.exposure_protocol_cache_max_entries,
+    ttl_seconds=settings.database_replica_max_lag_seconds,
+)
+register_gauge("exposure_protocols.room_cache.hits", lambda: _room_protocol_cache.hits)
+register_gauge("exposure_protocols.room_cache.misses", lambda: _room_protocol_cache.misses)
+
+
+@lru_cache(maxsize=1)
+def _bundled_chest_pa_document() -> JsonDocument:
     payload = json.loads(_RESOURCE_PATH.read_text(encoding="utf-8"))
     validate_instance("exposure_protocol.schema.json", payload)
-    return payload
+    last_modified = dt.datetime.fromtimestamp(_RESOURCE_PATH.stat().st_mtime, tz=dt.timezone.utc)
+    return content_document(payload, last_modified)
+
+
+def get_chest_pa_protocol_document() -> JsonDocument:
+    return _bundled_chest_pa_document()
+
+
+def get_chest_pa_protocol() -> dict[str, Any]:
+    return _bundled_chest_pa_document().payload
 
 
 def _normalize_procedure_id(procedure_id: str) -> str:
@@ -27,39 +55,74 @@ def _normalize_procedure_id(procedure_id: str) -> str:
     return normalized
 
 
-def _get_from_db(site_id: str, room_id: str, procedure_id: str) -> dict[str, Any] | None:
+def _row_document(row: RoomExposureProtocol) -> JsonDocument:
+    return JsonDocument(
+        payload=row.payload,
+        etag=strong_etag(row.site_id, row.room_id, row.procedure_id, row.updated_at.isoformat()),
+        last_modified=row.updated_at,
+    )
+
+
+async def _get_from_db(site_id: str, room_id: str, procedure_id: str) -> JsonDocument | None:
     if not settings.database_url:
         return None
 
-    engine = create_engine(settings.database_url, pool_pre_ping=True)
-    with Session(engine) as db:
-        row = db.get(
+    key = (site_id, room_id, procedure_id)
+    cached = _room_protocol_cache.get(key)
+    if cached is not MISSING:
+        return cached
+
+    async with get_async_sessionmaker()() as db:
+        if _recent_writes.get(key) is not MISSING:
+            use_primary(db)
+        row = await db.get(
             RoomExposureProtocol,
             {"site_id": site_id, "room_id": room_id, "procedure_id": procedure_id},
         )
-        if row is None:
-            return None
-        validate_instance("exposure_protocol.schema.json", row.payload)
-        return row.payload
+        document = None
+        if row is not None:
+            validate_instance("exposure_protocol.schema.json", row.payload)
+            document = _row_document(row)
 
+    _room_protocol_cache.set(key, document)
+    return document
 
-def get_protocol(
+
+def invalidate_room_protocol(site_id: str, room_id: str, procedure_id: str) -> None:
+    _room_protocol_cache.invalidate((site_id, room_id, procedure_id))
+    _recent_writes.set((site_id, room_id, procedure_id), True)
+
+
+async def get_protocol_document(
     procedure_id: str,
     site_id: str | None,
     room_id: str | None,
-) -> dict[str, Any] | None:
+) -> JsonDocument | None:
     normalized_procedure_id = _normalize_procedure_id(procedure_id)
 
     if site_id and room_id:
-        payload = _get_from_db(
+        document = await _get_from_db(
             site_id=site_id,
             room_id=room_id,
             procedure_id=normalized_procedure_id,
         )
-        if payload is not None:
-            return payload
+        if document is not None:
+            return document
 
     if normalized_procedure_id == "chest_pa_erect":
-        return get_chest_pa_protocol()
+        return _bundled_chest_pa_document()
 
     return None
+
+
+async def get_protocol(
+    procedure_id: str,
+    site_id: str | None,
+    room_id: str | None,
+) -> dict[str, Any] | None:
+    document = await get_protocol_document(
+        procedure_id=procedure_id, site_id=site_id, room_id=room_id
+    )
+    if document is None:
+        return None
+    return document.payload
@@ -2,9 +2,16 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
+from radiobuddy_api.platform.metrics import snapshot
+
 router = APIRouter(tags=["health"])
 
 
 @router.get("/health")
 def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/metrics")
+def metrics() -> dict[str, float | int]:
+    return snapshot()
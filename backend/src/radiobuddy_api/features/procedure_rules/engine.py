@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from radiobuddy_api.features.procedure_rules.registry import ProcedureRulesDocument
+
+_OPS = {
+    "lt": np.less,
+    "lte": np.less_equal,
+    "gt": np.greater,
+    "gte": np.greater_equal,
+    "eq": np.equal,
+    "neq": np.not_equal,
+}
+
+
+@dataclass(frozen=True)
+class CompiledPredicate:
+    column: int
+    op: str
+    value: float
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    rule_id: str
+    priority: int
+    mode: str
+    predicates: tuple[CompiledPredicate, ...]
+    prompt: dict[str, Any]
+    tag: str | None
+    is_ready_signal: bool
+
+
+@dataclass(frozen=True)
+class RuleDecision:
+    rule_id: str
+    prompt_id: str
+    text: str
+    tts: str
+    severity: str | None
+    tag: str | None
+    is_ready_signal: bool
+
+
+@dataclass(frozen=True)
+class Frame:
+    stage_id: str
+    metrics: dict[str, float]
+
+
+def _predicate_value(value: Any) -> float | None:
+    # Metrics are numeric; string thresholds can never match a metric frame.
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+
+class CompiledRules:
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self.procedure_id: str = payload["procedure_id"]
+        prompts = {p["prompt_id"]: p for p in payload.get("prompts", [])}
+
+        self.metric_ids: list[str] = []
+        columns: dict[str, int] = {}
+
+        def column(metric_id: str) -> int:
+            if metric_id not in columns:
+                columns[metric_id] = len(self.metric_ids)
+                self.metric_ids.append(metric_id)
+            return columns[metric_id]
+
+        # (position in file, rule, stage_ids or None for "all stages")
+        compiled: list[tuple[int, CompiledRule, tuple[str, ...] | None]] = []
+        for position, rule in enumerate(payload.get("rules", [])):
+            then = rule["then"]
+            prompt = prompts.get(then["prompt_id"])
+            if prompt is None:
+                continue
+
+            when = rule["when"]
+            if "all" in when:
+                mode, raw_predicates = "all", when["all"]
+            elif "any" in when:
+                mode, raw_predicates = "any", when["any"]
+            else:
+                mode, raw_predicates = "not", [when["not"]]
+
+            predicates = []
+            unmatchable = False
+            for raw in raw_predicates:
+                value = _predicate_value(raw["value"])
+                if value is None:
+                    unmatchable = True
+                    continue
+                predicates.append(CompiledPredicate(column(raw["metric"]), raw["op"], value))
+            if unmatchable and mode != "any":
+                continue
+            if not predicates:
+                continue
+
+            stage_ids = rule.get("stage_ids")
+            compiled.append(
+                (
+                    position,
+                    CompiledRule(
+                        rule_id=rule["rule_id"],
+                        priority=rule["priority"],
+                        mode=mode,
+                        predicates=tuple(predicates),
+                        prompt=prompt,
+                        tag=then.get("tag"),
+                        is_ready_signal=then.get("is_ready_signal") is True,
+                    ),
+                    tuple(stage_ids) if stage_ids else None,
+                )
+            )
+
+        # Highest priority first; file order breaks ties.
+        compiled.sort(key=lambda item: (-item[1].priority, item[0]))
+        self._wildcard = [rule for _, rule, stages in compiled if stages is None]
+        stage_ids = {stage for _, _, stages in compiled if stages for stage in stages}
+        self._by_stage: dict[str, list[CompiledRule]] = {
+            stage_id: [rule for _, rule, stages in compiled if stages is None or stage_id in stages]
+            for stage_id in stage_ids
+        }
+
+    def rules_for_stage(self, stage_id: str) -> list[CompiledRule]:
+        return self._by_stage.get(stage_id, self._wildcard)
+
+    def _matrix(self, frames: Sequence[Frame]) -> np.ndarray:
+        matrix = np.full((len(frames), len(self.metric_ids)), np.nan, dtype=np.float64)
+        for col, metric_id in enumerate(self.metric_ids):
+            matrix[:, col] = [frame.metrics.get(metric_id, np.nan) for frame in frames]
+        return matrix
+
+    @staticmethod
+    def _rule_mask(rule: CompiledRule, matrix: np.ndarray) -> np.ndarray:
+        masks = []
+        for predicate in rule.predicates:
+            values = matrix[:, predicate.column]
+            # A missing metric never satisfies a predicate, matching the on-device engine.
+            present = ~np.isnan(values)
+            with np.errstate(invalid="ignore"):
+                hit = _OPS[predicate.op](values, predicate.value)
+            if rule.mode == "not":
+                hit = ~hit
+            masks.append(present & hit)
+        if rule.mode == "any":
+            return np.logical_or.reduce(masks)
+        return np.logical_and.reduce(masks)
+
+    def evaluate(self, frames: Sequence[Frame]) -> list[RuleDecision | None]:
+        decisions: list[RuleDecision | None] = [None] * len(frames)
+        if not frames:
+            return decisions
+
+        matrix = self._matrix(frames)
+        stage_rows: dict[str, list[int]] = {}
+        for index, frame in enumerate(frames):
+            stage_rows.setdefault(frame.stage_id, []).append(index)
+
+        for stage_id, rows in stage_rows.items():
+            rules = self.rules_for_stage(stage_id)
+            if not rules:
+                continue
+            row_index = np.asarray(rows)
+            stage_matrix = matrix[row_index]
+            hits = np.vstack([self._rule_mask(rule, stage_matrix) for rule in rules])
+            matched = hits.any(axis=0)
+            winners = hits.argmax(axis=0)
+            stage_decisions = [_decision(rule) for rule in rules]
+            for row, winner in zip(row_index[matched], winners[matched]):
+                decisions[int(row)] = stage_decisions[int(winner)]
+
+        return decisions
+
+
+def _decision(rule: CompiledRule) -> RuleDecision:
+    prompt = rule.prompt
+    return RuleDecision(
+        rule_id=rule.rule_id,
+        prompt_id=prompt["prompt_id"],
+        text=prompt["text"],
+        tts=prompt.get("tts") or prompt["text"],
+        severity=prompt.get("severity"),
+        tag=rule.tag,
+        is_ready_signal=rule.is_ready_signal,
+    )
+
+
+_compiled: dict[str, tuple[ProcedureRulesDocument, CompiledRules]] = {}
+_compiled_lock = threading.Lock()
+
+
+def get_compiled_rules(document: ProcedureRulesDocument) -> CompiledRules:
+    entry = _compiled.get(document.procedure_id)
+    if entry is not None and entry[0] is document:
+        return entry[1]
+    with _compiled_lock:
+        entry = _compiled.get(document.procedure_id)
+        if entry is None or entry[0] is not document:
+            entry = (document, CompiledRules(document.payload))
+            _compiled[document.procedure_id] = entry
+    return entry[1]
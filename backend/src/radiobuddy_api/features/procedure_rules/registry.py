@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from radiobuddy_api.platform.http_cache import JsonDocument, render_json, strong_etag
+from radiobuddy_api.platform.json_schema import SchemaValidationError, validate_instance
+
+RESOURCES_DIR = Path(__file__).resolve().parents[4] / "resources"
+_RULES_GLOB = "*_rules.json"
+
+
+class ProcedureRulesLoadError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class ProcedureRulesDocument(JsonDocument):
+    procedure_id: str
+    source: Path
+
+
+def _load_document(path: Path) -> ProcedureRulesDocument:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        mtime = path.stat().st_mtime
+    except (OSError, ValueError) as exc:
+        raise ProcedureRulesLoadError(f"{path.name}: {exc}") from exc
+
+    try:
+        validate_instance("procedure_rules.schema.json", payload)
+    except SchemaValidationError as exc:
+        raise ProcedureRulesLoadError(f"{path.name}: {exc}") from exc
+
+    document = ProcedureRulesDocument(
+        payload=payload,
+        etag=strong_etag(render_json(payload)),
+        last_modified=dt.datetime.fromtimestamp(mtime, tz=dt.timezone.utc),
+        procedure_id=payload["procedure_id"],
+        source=path,
+    )
+    # Render once at load so requests only ever hand out the cached bytes.
+    _ = document.body
+    return document
+
+
+def load_documents(resources_dir: Path = RESOURCES_DIR) -> dict[str, ProcedureRulesDocument]:
+    documents: dict[str, ProcedureRulesDocument] = {}
+    for path in sorted(resources_dir.glob(_RULES_GLOB)):
+        document = _load_document(path)
+        existing = documents.get(document.procedure_id)
+        if existing is not None:
+            raise ProcedureRulesLoadError(
+                f"{path.name}: procedure_id {document.procedure_id!r} "
+                f"already defined in {existing.source.name}"
+            )
+        documents[document.procedure_id] = document
+    return documents
+
+
+_documents: dict[str, ProcedureRulesDocument] | None = None
+
+
+def load_registry(resources_dir: Path = RESOURCES_DIR) -> dict[str, ProcedureRulesDocument]:
+    global _documents
+    _documents = load_documents(resources_dir)
+    return _documents
+
+
+def get_document(procedure_id: str) -> ProcedureRulesDocument | None:
+    documents = _documents if _documents is not None else load_registry()
+    return documents.get(procedure_id)
@@ -1,21 +1,52 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from dataclasses import asdict
 
-from radiobuddy_api.features.procedure_rules.service import get_chest_pa_rules, get_rules
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+from radiobuddy_api.features.procedure_rules.engine import Frame
+from radiobuddy_api.features.procedure_rules.schemas import (
+    RuleDecisionOut,
+    RulesEvaluateIn,
+    RulesEvaluateOut,
+)
+from radiobuddy_api.features.procedure_rules.service import evaluate_rules, get_rules_document
+from radiobuddy_api.platform.http_cache import conditional_json_response
 
 router = APIRouter(prefix="/procedure-rules", tags=["procedure_rules"])
 
 
+def _rules_response(request: Request, procedure_id: str) -> Response:
+    document = get_rules_document(procedure_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail="procedure_not_found")
+    return conditional_json_response(request, document)
+
+
 @router.get("/chest-pa")
-def get_chest_pa_rules_endpoint() -> JSONResponse:
-    return JSONResponse(content=get_chest_pa_rules())
+def get_chest_pa_rules_endpoint(request: Request) -> Response:
+    return _rules_response(request, "chest_pa_erect")
 
 
 @router.get("/{procedure_id}")
-def get_rules_for_procedure(procedure_id: str) -> JSONResponse:
-    payload = get_rules(procedure_id)
-    if payload is None:
+def get_rules_for_procedure(request: Request, procedure_id: str) -> Response:
+    return _rules_response(request, procedure_id)
+
+
+@router.post("/{procedure_id}/evaluate", response_model=RulesEvaluateOut)
+def evaluate_rules_for_procedure(procedure_id: str, payload: RulesEvaluateIn) -> RulesEvaluateOut:
+    frames = [Frame(stage_id=frame.stage_id, metrics=frame.metrics) for frame in payload.frames]
+    result = evaluate_rules(procedure_id, frames)
+    if result is None:
         raise HTTPException(status_code=404, detail="procedure_not_found")
-    return JSONResponse(content=payload)
+
+    document, decisions = result
+    return RulesEvaluateOut(
+        procedure_id=document.procedure_id,
+        procedure_version=document.payload.get("procedure_version"),
+        decisions=[
+            RuleDecisionOut(**asdict(decision)) if decision is not None else None
+            for decision in decisions
+        ],
+    )
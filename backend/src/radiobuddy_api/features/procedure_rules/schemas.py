@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+MAX_EVALUATE_FRAMES = 10_000
+
+
+class RuleFrameIn(BaseModel):
+    stage_id: str = Field(..., pattern=r"^[a-z0-9_]+$")
+    metrics: dict[str, float] = Field(default_factory=dict)
+
+
+class RulesEvaluateIn(BaseModel):
+    frames: list[RuleFrameIn] = Field(..., max_length=MAX_EVALUATE_FRAMES)
+
+
+class RuleDecisionOut(BaseModel):
+    rule_id: str
+    prompt_id: str
+    text: str
+    tts: str
+    severity: str | None = None
+    tag: str | None = None
+    is_ready_signal: bool = False
+
+
+class RulesEvaluateOut(BaseModel):
+    procedure_id: str
+    procedure_version: str | None = None
+    decisions: list[RuleDecisionOut | None]
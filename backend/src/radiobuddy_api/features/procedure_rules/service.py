@@ -1,18 +1,9 @@
 from __future__ import annotations
 
-import json
-from pathlib import Path
 from typing import Any
 
-from radiobuddy_api.platform.json_schema import validate_instance
-
-_RESOURCE_PATH = Path(__file__).resolve().parents[4] / "resources" / "chest_pa_rules.json"
-
-
-def get_chest_pa_rules() -> dict[str, Any]:
-    payload = json.loads(_RESOURCE_PATH.read_text(encoding="utf-8"))
-    validate_instance("procedure_rules.schema.json", payload)
-    return payload
+from radiobuddy_api.features.procedure_rules.engine import Frame, RuleDecision, get_compiled_rules
+from radiobuddy_api.features.procedure_rules.registry import ProcedureRulesDocument, get_document
 
 
 def _normalize_procedure_id(procedure_id: str) -> str:
@@ -22,10 +13,28 @@ def _normalize_procedure_id(procedure_id: str) -> str:
     return normalized
 
 
+def get_rules_document(procedure_id: str) -> ProcedureRulesDocument | None:
+    return get_document(_normalize_procedure_id(procedure_id))
+
+
 def get_rules(procedure_id: str) -> dict[str, Any] | None:
-    normalized_procedure_id = _normalize_procedure_id(procedure_id)
+    document = get_rules_document(procedure_id)
+    if document is None:
+        return None
+    return document.payload
+
+
+def get_chest_pa_rules() -> dict[str, Any]:
+    payload = get_rules("chest_pa_erect")
+    if payload is None:
+        raise RuntimeError("chest_pa_erect procedure rules are not loaded")
+    return payload
 
-    if normalized_procedure_id == "chest_pa_erect":
-        return get_chest_pa_rules()
 
-    return None
+def evaluate_rules(
+    procedure_id: str, frames: list[Frame]
+) -> tuple[ProcedureRulesDocument, list[RuleDecision | None]] | None:
+    document = get_rules_document(procedure_id)
+    if document is None:
+        return None
+    return document, get_compiled_rules(document).evaluate(frames)
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Boolean, literal_column, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from radiobuddy_api.features.exposure_protocols.service import invalidate_room_protocol
+from radiobuddy_api.features.site_presets.models import Room, RoomExposureProtocol, Site
+from radiobuddy_api.features.site_presets.schemas import (
+    ProvisioningKind,
+    ProvisioningManifestIn,
+    ProvisioningProtocolIn,
+    ProvisioningResult,
+    ProvisioningRoomIn,
+    ProvisioningRowResult,
+    SiteCreate,
+)
+from radiobuddy_api.platform.db.base import Base
+from radiobuddy_api.platform.db.routing import use_primary
+from radiobuddy_api.platform.json_schema import SchemaValidationError, validate_instance
+
+# Rows per INSERT; keeps each statement well under the 65535 bind parameter limit.
+_UPSERT_CHUNK_ROWS = 1000
+
+# xmax is 0 on a freshly inserted row version and set on one written by DO UPDATE.
+_INSERTED = literal_column("xmax = 0", Boolean).label("inserted")
+
+_NDJSON_KINDS = {"site": "sites", "room": "rooms", "protocol": "protocols"}
+
+
+class InvalidManifestError(Exception):
+    pass
+
+
+@dataclass
+class _Row:
+    key: tuple[str, ...]
+    values: dict[str, Any]
+    result: ProvisioningRowResult
+
+
+@dataclass
+class _Plan:
+    results: list[ProvisioningRowResult]
+    sites: dict[tuple[str, ...], _Row]
+    rooms: dict[tuple[str, ...], _Row]
+    protocols: dict[tuple[str, ...], _Row]
+
+
+# A JSON manifest is {"sites": [...], "rooms": [...], "protocols": [...]}; NDJSON has one row
+# per line with a "kind" of site, room or protocol.
+def parse_manifest(body: bytes, ndjson: bool) -> ProvisioningManifestIn:
+    try:
+        if not ndjson:
+            return ProvisioningManifestIn.model_validate(json.loads(body))
+        raw: dict[str, list[Any]] = {"sites": [], "rooms": [], "protocols": []}
+        for number, line in enumerate(body.splitlines(), start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            kind = record.pop("kind", None) if isinstance(record, dict) else None
+            if kind not in _NDJSON_KINDS:
+                raise InvalidManifestError(f"line {number}: kind must be site, room or protocol")
+            raw[_NDJSON_KINDS[kind]].append(record)
+        return ProvisioningManifestIn.model_validate(raw)
+    except ValueError as exc:
+        # json.JSONDecodeError and pydantic's ValidationError are both ValueErrors.
+        raise InvalidManifestError(str(exc)) from exc
+
+
+def _reject(result: ProvisioningRowResult, errors: list[dict[str, Any]]) -> None:
+    result.status = "rejected"
+    result.errors = errors
+
+
+def _validate_rows(
+    plan: _Plan,
+    kind: ProvisioningKind,
+    raw_rows: list[dict[str, Any]],
+    model: type[BaseModel],
+    key_fields: Sequence[str],
+) -> dict[tuple[str, ...], _Row]:
+    rows: dict[tuple[str, ...], _Row] = {}
+    for index, raw in enumerate(raw_rows):
+        result = ProvisioningRowResult(kind=kind, index=index, status="skipped")
+        plan.results.append(result)
+        try:
+            values = model.model_validate(raw).model_dump(mode="json")
+        except ValidationError as exc:
+            errors = exc.errors(include_url=False, include_context=False, include_input=False)
+            _reject(result, [dict(error) for error in errors])
+            continue
+
+        key = tuple(values[field] for field in key_fields)
+        result.key = "/".join(key)
+        if kind == "protocol":
+            try:
+                validate_instance("exposure_protocol.schema.json", values)
+            except SchemaValidationError as exc:
+                _reject(result, [{"type": "schema", "loc": exc.json_path, "msg": exc.message}])
+                continue
+            values = dict(zip(key_fields, key, strict=True), payload=values)
+        # ON CONFLICT DO UPDATE cannot touch the same row twice in one statement.
+        if key in rows:
+            first = rows[key].result.index
+            _reject(result, [{"type": "duplicate_key", "msg": f"repeats {kind} {first}"}])
+            continue
+        rows[key] = _Row(key=key, values=values, result=result)
+    return rows
+
+
+def _validate_manifest(manifest: ProvisioningManifestIn) -> _Plan:
+    plan = _Plan(results=[], sites={}, rooms={}, protocols={})
+    plan.sites = _validate_rows(plan, "site", manifest.sites, SiteCreate, ["site_id"])
+    plan.rooms = _validate_rows(
+        plan, "room", manifest.rooms, ProvisioningRoomIn, ["site_id", "room_id"]
+    )
+    plan.protocols = _validate_rows(
+        plan,
+        "protocol",
+        manifest.protocols,
+        ProvisioningProtocolIn,
+        ["site_id", "room_id", "procedure_id"],
+    )
+    return plan
+
+
+# Parents may come from the manifest itself or already exist; one query per level finds the
+# ones that do neither, so they are reported per row instead of failing the foreign key.
+async def _reject_missing_parents(db: AsyncSession, plan: _Plan) -> None:
+    site_ids = {row.key[0] for row in plan.rooms.values()} - {key[0] for key in plan.sites}
+    if site_ids:
+        site_ids -= set(await db.scalars(select(Site.site_id).where(Site.site_id.in_(site_ids))))
+    for key, row in list(plan.rooms.items()):
+        if key[0] in site_ids:
+            _reject(row.result, [{"type": "site_not_found", "msg": key[0]}])
+            del plan.rooms[key]
+
+    room_keys = {row.key[:2] for row in plan.protocols.values()} - set(plan.rooms)
+    if room_keys:
+        existing = await db.execute(
+            select(Room.site_id, Room.room_id).where(
+                tuple_(Room.site_id, Room.room_id).in_(list(room_keys))
+            )
+        )
+        room_keys -= {tuple(row) for row in existing}
+    for key, row in list(plan.protocols.items()):
+        if key[:2] in room_keys:
+            _reject(row.result, [{"type": "room_not_found", "msg": "/".join(key[:2])}])
+            del plan.protocols[key]
+
+
+async def _upsert(
+    db: AsyncSession,
+    model: type[Base],
+    rows: list[_Row],
+    key_columns: Sequence[str],
+    update_columns: Sequence[str],
+    compare_columns: Sequence[str],
+) -> None:
+    table = model.__table__
+    for start in range(0, len(rows), _UPSERT_CHUNK_ROWS):
+        chunk = {row.key: row for row in rows[start : start + _UPSERT_CHUNK_ROWS]}
+        stmt = insert(model).values([row.values for row in chunk.values()])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[column] for column in key_columns],
+            set_={column: stmt.excluded[column] for column in update_columns},
+            # An identical row is left alone: no new row version, and no RETURNING row.
+            where=or_(
+                *(
+                    table.c[column].is_distinct_from(stmt.excluded[column])
+                    for column in compare_columns
+                )
+            ),
+        )
+        stmt = stmt.returning(*(table.c[column] for column in key_columns), _INSERTED)
+        for *key, inserted in await db.execute(stmt):
+            chunk.pop(tuple(key)).result.status = "inserted" if inserted else "updated"
+        for row in chunk.values():
+            row.result.status = "unchanged"
+
+
+# Validates every row first; if any is rejected nothing is written. Otherwise all rows go in
+# as multi-row upserts in one transaction, so an unchanged manifest writes nothing.
+async def import_manifest(db: AsyncSession, manifest: ProvisioningManifestIn) -> ProvisioningResult:
+    plan = _validate_manifest(manifest)
+    # The parent lookups must see rooms written moments ago, so skip the replicas.
+    use_primary(db)
+    await _reject_missing_parents(db, plan)
+
+    rejected = sum(1 for result in plan.results if result.status == "rejected")
+    if rejected:
+        return ProvisioningResult(applied=False, rejected=rejected, results=plan.results)
+
+    now = dt.datetime.now(dt.timezone.utc)
+    for row in plan.protocols.values():
+        row.values["updated_at"] = now
+
+    try:
+        await _upsert(db, Site, list(plan.sites.values()), ["site_id"], ["name"], ["name"])
+        await _upsert(
+            db, Room, list(plan.rooms.values()), ["site_id", "room_id"], ["name"], ["name"]
+        )
+        await _upsert(
+            db,
+            RoomExposureProtocol,
+            list(plan.protocols.values()),
+            ["site_id", "room_id", "procedure_id"],
+            ["payload", "updated_at"],
+            ["payload"],
+        )
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    for row in plan.protocols.values():
+        if row.result.status != "unchanged":
+            invalidate_room_protocol(*row.key)
+
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    for result in plan.results:
+        counts[result.status] += 1
+    return ProvisioningResult(applied=True, **counts, results=plan.results)
@@ -1,18 +1,29 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from radiobuddy_api.features.site_presets.provisioning import (
+    InvalidManifestError,
+    import_manifest,
+    parse_manifest,
+)
 from radiobuddy_api.features.site_presets.schemas import (
     ErrorResponse,
     ExposureProtocolOut,
     ExposureProtocolUpsertIn,
+    ProvisioningResult,
     RoomCreate,
     RoomOut,
     SiteCreate,
     SiteOut,
 )
 from radiobuddy_api.features.site_presets.service import (
+    RoomExistsError,
+    RoomNotFoundError,
+    SiteExistsError,
+    SiteNotFoundError,
     create_room,
     create_site,
     get_room_exposure_protocol,
@@ -25,36 +36,82 @@ from radiobuddy_api.platform.security import require_admin_api_key
 
 router = APIRouter(prefix="/sites", tags=["site_presets"])
 
+_NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl")
+
 
-@router.post("", response_model=SiteOut, responses={503: {"model": ErrorResponse}})
-def create_site_endpoint(
+@router.post(
+    "",
+    response_model=SiteOut,
+    responses={409: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+)
+async def create_site_endpoint(
     payload: SiteCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: None = Depends(require_admin_api_key),
 ) -> SiteOut:
-    site = create_site(db, site_id=payload.site_id, name=payload.name)
+    try:
+        site = await create_site(db, site_id=payload.site_id, name=payload.name)
+    except SiteExistsError as exc:
+        raise HTTPException(status_code=409, detail="site_exists") from exc
     return SiteOut(site_id=site.site_id, name=site.name, created_at=site.created_at)
 
 
+@router.post(
+    ":import",
+    response_model=ProvisioningResult,
+    responses={
+        400: {"model": ErrorResponse},
+        415: {"model": ErrorResponse},
+        422: {"model": ProvisioningResult},
+        503: {"model": ErrorResponse},
+    },
+)
+async def import_sites_endpoint(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    _: None = Depends(require_admin_api_key),
+) -> ProvisioningResult | JSONResponse:
+    media_type = request.headers.get("content-type", "application/json").split(";")[0].strip()
+    if media_type != "application/json" and media_type not in _NDJSON_MEDIA_TYPES:
+        raise HTTPException(status_code=415, detail="unsupported_media_type")
+    try:
+        manifest = parse_manifest(await request.body(), ndjson=media_type in _NDJSON_MEDIA_TYPES)
+    except InvalidManifestError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    result = await import_manifest(db, manifest)
+    if not result.applied:
+        return JSONResponse(status_code=422, content=result.model_dump(mode="json"))
+    return result
+
+
 @router.get("", response_model=list[SiteOut], responses={503: {"model": ErrorResponse}})
-def list_sites_endpoint(db: Session = Depends(get_db)) -> list[SiteOut]:
-    return [
-        SiteOut(site_id=s.site_id, name=s.name, created_at=s.created_at) for s in list_sites(db)
-    ]
+async def list_sites_endpoint(db: AsyncSession = Depends(get_db)) -> list[SiteOut]:
+    sites = await list_sites(db)
+    return [SiteOut(site_id=s.site_id, name=s.name, created_at=s.created_at) for s in sites]
 
 
 @router.post(
     "/{site_id}/rooms",
     response_model=RoomOut,
-    responses={503: {"model": ErrorResponse}},
+    responses={
+        404: {"model": ErrorResponse},
+        409: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
 )
-def create_room_endpoint(
+async def create_room_endpoint(
     site_id: str,
     payload: RoomCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: None = Depends(require_admin_api_key),
 ) -> RoomOut:
-    room = create_room(db, site_id=site_id, room_id=payload.room_id, name=payload.name)
+    try:
+        room = await create_room(db, site_id=site_id, room_id=payload.room_id, name=payload.name)
+    except SiteNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="site_not_found") from exc
+    except RoomExistsError as exc:
+        raise HTTPException(status_code=409, detail="room_exists") from exc
     return RoomOut(
         site_id=room.site_id,
         room_id=room.room_id,
@@ -68,8 +125,8 @@ def create_room_endpoint(
     response_model=list[RoomOut],
     responses={503: {"model": ErrorResponse}},
 )
-def list_rooms_endpoint(site_id: str, db: Session = Depends(get_db)) -> list[RoomOut]:
-    rooms = list_rooms(db, site_id=site_id)
+async def list_rooms_endpoint(site_id: str, db: AsyncSession = Depends(get_db)) -> list[RoomOut]:
+    rooms = await list_rooms(db, site_id=site_id)
     return [
         RoomOut(site_id=r.site_id, room_id=r.room_id, name=r.name, created_at=r.created_at)
         for r in rooms
@@ -79,23 +136,26 @@ def list_rooms_endpoint(site_id: str, db: Session = Depends(get_db)) -> list[Roo
 @router.put(
     "/{site_id}/rooms/{room_id}/exposure-protocols/{procedure_id}",
     response_model=ExposureProtocolOut,
-    responses={503: {"model": ErrorResponse}},
+    responses={404: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
 )
-def upsert_exposure_protocol_endpoint(
+async def upsert_exposure_protocol_endpoint(
     site_id: str,
     room_id: str,
     procedure_id: str,
     payload: ExposureProtocolUpsertIn,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: None = Depends(require_admin_api_key),
 ) -> ExposureProtocolOut:
-    protocol = upsert_room_exposure_protocol(
-        db,
-        site_id=site_id,
-        room_id=room_id,
-        procedure_id=procedure_id,
-        payload=payload,
-    )
+    try:
+        protocol = await upsert_room_exposure_protocol(
+            db,
+            site_id=site_id,
+            room_id=room_id,
+            procedure_id=procedure_id,
+            payload=payload,
+        )
+    except RoomNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="room_not_found") from exc
     return ExposureProtocolOut(**protocol.payload, updated_at=protocol.updated_at)
 
 
@@ -104,13 +164,13 @@ def upsert_exposure_protocol_endpoint(
     response_model=ExposureProtocolOut,
     responses={404: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
 )
-def get_exposure_protocol_endpoint(
+async def get_exposure_protocol_endpoint(
     site_id: str,
     room_id: str,
     procedure_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> ExposureProtocolOut:
-    protocol = get_room_exposure_protocol(
+    protocol = await get_room_exposure_protocol(
         db,
         site_id=site_id,
         room_id=room_id,
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
+MAX_MANIFEST_ROWS = 20000
+
 
 class SiteCreate(BaseModel):
     site_id: str = Field(..., pattern=r"^[a-z0-9_-]+$", min_length=1, max_length=64)
@@ -82,6 +84,43 @@ class ExposureProtocolOut(ExposureProtocolPayload):
     updated_at: datetime
 
 
+class ProvisioningRoomIn(RoomCreate):
+    site_id: str = Field(..., pattern=r"^[a-z0-9_-]+$", min_length=1, max_length=64)
+
+
+class ProvisioningProtocolIn(ExposureProtocolPayload):
+    site_id: str = Field(..., pattern=r"^[a-z0-9_-]+$", min_length=1, max_length=64)
+    room_id: str = Field(..., pattern=r"^[a-z0-9_-]+$", min_length=1, max_length=64)
+
+
+class ProvisioningManifestIn(BaseModel):
+    # Rows stay raw so each one is validated and reported on its own.
+    sites: list[dict[str, Any]] = Field(default_factory=list, max_length=MAX_MANIFEST_ROWS)
+    rooms: list[dict[str, Any]] = Field(default_factory=list, max_length=MAX_MANIFEST_ROWS)
+    protocols: list[dict[str, Any]] = Field(default_factory=list, max_length=MAX_MANIFEST_ROWS)
+
+
+ProvisioningKind = Literal["site", "room", "protocol"]
+
+
+class ProvisioningRowResult(BaseModel):
+    kind: ProvisioningKind
+    index: int
+    key: str | None = None
+    status: Literal["inserted", "updated", "unchanged", "rejected", "skipped"]
+    errors: list[dict[str, Any]] | None = None
+
+
+class ProvisioningResult(BaseModel):
+    # False when any row was rejected; nothing is written then and valid rows are "skipped".
+    applied: bool
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    rejected: int = 0
+    results: list[ProvisioningRowResult]
+
+
 class ErrorResponse(BaseModel):
     error: str
     detail: Any | None = None
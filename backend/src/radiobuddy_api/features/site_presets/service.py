@@ -4,39 +4,87 @@ import datetime as dt
 
 from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from radiobuddy_api.features.exposure_protocols.service import invalidate_room_protocol
 from radiobuddy_api.features.site_presets.models import Room, RoomExposureProtocol, Site
 from radiobuddy_api.features.site_presets.schemas import ExposureProtocolPayload
 from radiobuddy_api.platform.json_schema import validate_instance
 
+_FOREIGN_KEY_VIOLATION = "23503"
 
-def create_site(db: Session, site_id: str, name: str | None) -> Site:
-    site = Site(site_id=site_id, name=name)
-    db.add(site)
-    db.commit()
-    db.refresh(site)
+
+class SiteExistsError(Exception):
+    pass
+
+
+class RoomExistsError(Exception):
+    pass
+
+
+class SiteNotFoundError(Exception):
+    pass
+
+
+class RoomNotFoundError(Exception):
+    pass
+
+
+def _is_foreign_key_violation(exc: IntegrityError) -> bool:
+    return getattr(exc.orig, "sqlstate", None) == _FOREIGN_KEY_VIOLATION
+
+
+# Each write is one INSERT ... RETURNING and one commit. ON CONFLICT DO NOTHING returns no row
+# for an existing key, and a missing parent fails the foreign key inside the same statement.
+async def create_site(db: AsyncSession, site_id: str, name: str | None) -> Site:
+    stmt = (
+        insert(Site)
+        .values(site_id=site_id, name=name)
+        .on_conflict_do_nothing(index_elements=[Site.site_id])
+        .returning(Site)
+    )
+    site = await db.scalar(stmt)
+    if site is None:
+        await db.rollback()
+        raise SiteExistsError(site_id)
+    await db.commit()
     return site
 
 
-def list_sites(db: Session) -> list[Site]:
-    return list(db.scalars(select(Site).order_by(Site.site_id)))
+async def list_sites(db: AsyncSession) -> list[Site]:
+    return list(await db.scalars(select(Site).order_by(Site.site_id)))
 
 
-def create_room(db: Session, site_id: str, room_id: str, name: str | None) -> Room:
-    room = Room(site_id=site_id, room_id=room_id, name=name)
-    db.add(room)
-    db.commit()
-    db.refresh(room)
+async def create_room(db: AsyncSession, site_id: str, room_id: str, name: str | None) -> Room:
+    stmt = (
+        insert(Room)
+        .values(site_id=site_id, room_id=room_id, name=name)
+        .on_conflict_do_nothing(index_elements=[Room.site_id, Room.room_id])
+        .returning(Room)
+    )
+    try:
+        room = await db.scalar(stmt)
+    except IntegrityError as exc:
+        await db.rollback()
+        if _is_foreign_key_violation(exc):
+            raise SiteNotFoundError(site_id) from exc
+        raise
+    if room is None:
+        await db.rollback()
+        raise RoomExistsError(room_id)
+    await db.commit()
     return room
 
 
-def list_rooms(db: Session, site_id: str) -> list[Room]:
-    return list(db.scalars(select(Room).where(Room.site_id == site_id).order_by(Room.room_id)))
+async def list_rooms(db: AsyncSession, site_id: str) -> list[Room]:
+    return list(
+        await db.scalars(select(Room).where(Room.site_id == site_id).order_by(Room.room_id))
+    )
 
 
-def upsert_room_exposure_protocol(
-    db: Session,
+async def upsert_room_exposure_protocol(
+    db: AsyncSession,
     site_id: str,
     room_id: str,
     procedure_id: str,
@@ -65,20 +113,25 @@ def upsert_room_exposure_protocol(
         ],
         set_={"payload": payload_dict, "updated_at": now},
     )
-
-    db.execute(stmt)
-    db.commit()
-
-    return db.get(
-        RoomExposureProtocol,
-        {"site_id": site_id, "room_id": room_id, "procedure_id": procedure_id},
-    )
-
-
-def get_room_exposure_protocol(
-    db: Session, site_id: str, room_id: str, procedure_id: str
+    # populate_existing: an upsert may return a row this session already holds.
+    stmt = stmt.returning(RoomExposureProtocol).execution_options(populate_existing=True)
+
+    try:
+        protocol = (await db.scalars(stmt)).one()
+    except IntegrityError as exc:
+        await db.rollback()
+        if _is_foreign_key_violation(exc):
+            raise RoomNotFoundError(room_id) from exc
+        raise
+    await db.commit()
+    invalidate_room_protocol(site_id, room_id, procedure_id)
+    return protocol
+
+
+async def get_room_exposure_protocol(
+    db: AsyncSession, site_id: str, room_id: str, procedure_id: str
 ) -> RoomExposureProtocol | None:
-    return db.get(
+    return await db.get(
         RoomExposureProtocol,
         {"site_id": site_id, "room_id": room_id, "procedure_id": procedure_id},
     )
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import datetime as dt
+import time
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import Engine, text
+
+_SELECT_BATCH = text(
+    "SELECT timestamp, event_id FROM telemetry_events "
+    "WHERE (timestamp, event_id) > (:after_ts, :after_id) "
+    "ORDER BY timestamp, event_id LIMIT :batch_size"
+)
+
+# Only rows whose typed columns are still empty are rewritten, so rerunning the backfill (or
+# running it after ingest already fills the columns) creates no needless row versions.
+_UPDATE_BATCH = text(
+    """
+    UPDATE telemetry_events SET
+        perf_frame_latency_ms = (performance->>'frame_latency_ms')::double precision,
+        perf_fps = (performance->>'fps')::double precision,
+        exposure_kvp = (exposure->>'kvp')::double precision,
+        exposure_mas = (exposure->>'mas')::double precision,
+        habitus_size_class_estimated = habitus->>'size_class_estimated',
+        habitus_size_class_final = habitus->>'size_class_final',
+        prompt_rule_id = prompt->>'rule_id'
+    WHERE (timestamp, event_id) >= (:first_ts, :first_id)
+      AND (timestamp, event_id) <= (:last_ts, :last_id)
+      AND (
+        (performance IS NOT NULL AND perf_frame_latency_ms IS NULL AND perf_fps IS NULL)
+        OR (exposure IS NOT NULL AND exposure_kvp IS NULL AND exposure_mas IS NULL)
+        OR (habitus IS NOT NULL AND habitus_size_class_estimated IS NULL
+            AND habitus_size_class_final IS NULL)
+        OR (prompt IS NOT NULL AND prompt_rule_id IS NULL)
+      )
+    """
+)
+
+_START = (dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc), uuid.UUID(int=0))
+
+
+@dataclass
+class BackfillResult:
+    scanned: int = 0
+    updated: int = 0
+    batches: int = 0
+    last_key: tuple[dt.datetime, uuid.UUID] | None = None
+
+
+def backfill_typed_columns(
+    engine: Engine,
+    batch_size: int = 5000,
+    pause_seconds: float = 0.0,
+    after: tuple[dt.datetime, uuid.UUID] | None = None,
+) -> BackfillResult:
+    result = BackfillResult()
+    after_ts, after_id = after or _START
+    while True:
+        # One short transaction per key range: row locks are held only for a batch, and a
+        # stuck lock aborts the batch instead of queueing behind it.
+        with engine.begin() as conn:
+            conn.execute(text("SET LOCAL lock_timeout = '2s'"))
+            keys = conn.execute(
+                _SELECT_BATCH,
+                {"after_ts": after_ts, "after_id": after_id, "batch_size": batch_size},
+            ).all()
+            if not keys:
+                return result
+            (first_ts, first_id), (after_ts, after_id) = keys[0], keys[-1]
+            updated = conn.execute(
+                _UPDATE_BATCH,
+                {
+                    "first_ts": first_ts,
+                    "first_id": first_id,
+                    "last_ts": after_ts,
+                    "last_id": after_id,
+                },
+            ).rowcount
+        result.scanned += len(keys)
+        result.updated += updated
+        result.batches += 1
+        result.last_key = (after_ts, after_id)
+        if pause_seconds > 0:
+            time.sleep(pause_seconds)
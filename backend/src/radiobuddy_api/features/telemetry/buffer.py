@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import fcntl
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO
+
+from pydantic import ValidationError
+
+from radiobuddy_api.features.telemetry.schemas import TelemetryEventIn
+from radiobuddy_api.features.telemetry.service import store_events_sync
+from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.db.session import get_sessionmaker
+from radiobuddy_api.platform.metrics import register_gauge
+
+logger = logging.getLogger("radiobuddy_api.telemetry.buffer")
+
+OVERFLOW_REJECT = "reject"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+
+
+# Bounded in-process queue drained into the database by a background thread. With a spill
+# path, the thread writes each drained batch to a ".pending" segment before trying the
+# database and deletes it only after the batch commits, so a database outage or a crash
+# mid-flush leaves it on disk to be replayed on the next flush or restart. Events still
+# queued in memory are lost if the process crashes, and segments are not fsynced, so they
+# survive a process crash but not a host crash.
+class TelemetryWriteBuffer:
+    def __init__(
+        self,
+        write: Callable[[list[TelemetryEventIn]], None],
+        max_events: int,
+        batch_size: int,
+        flush_interval_seconds: float,
+        overflow_policy: str = OVERFLOW_REJECT,
+        spill_path: Path | None = None,
+        max_backoff_seconds: float = 30.0,
+    ) -> None:
+        if overflow_policy not in (OVERFLOW_REJECT, OVERFLOW_DROP_OLDEST):
+            raise ValueError(f"unknown overflow policy: {overflow_policy}")
+        self._write = write
+        self.max_events = max(1, max_events)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.overflow_policy = overflow_policy
+        self.spill_path = spill_path
+        self.max_backoff_seconds = max_backoff_seconds
+
+        self._queue: deque[TelemetryEventIn] = deque()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self._slot: int | None = None
+        self._slot_lock: IO[str] | None = None
+        self._consecutive_failures = 0
+
+        self.enqueued = 0
+        self.flushed = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.flush_failures = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._cond:
+            if self.running:
+                return
+            self._stopping = False
+            if self.spill_path is not None and self._slot is None:
+                self._claim_slot()
+            self._thread = threading.Thread(
+                target=self._run, name="telemetry-write-behind", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.error("telemetry write-behind did not stop within %ss", timeout)
+                return
+        self._thread = None
+        if self._slot_lock is not None:
+            # Closing the file releases the lock, so the next process can take over the slot.
+            self._slot_lock.close()
+            self._slot_lock = self._slot = None
+        if self._queue:
+            logger.error("telemetry write-behind stopped with %d unflushed events", len(self))
+
+    def enqueue(self, event: TelemetryEventIn) -> bool:
+        with self._cond:
+            if len(self._queue) >= self.max_events:
+                if self.overflow_policy == OVERFLOW_REJECT:
+                    self.rejected += 1
+                    return False
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append(event)
+            self.enqueued += 1
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+            return True
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._consecutive_failures:
+                    # After a failed flush, wait out the backoff whatever the queue depth, so a
+                    # database outage is not a busy loop of retries.
+                    deadline = time.monotonic() + self._backoff_seconds()
+                    while not self._stopping and (remaining := deadline - time.monotonic()) > 0:
+                        self._cond.wait(remaining)
+                elif not self._stopping and len(self._queue) < self.batch_size:
+                    self._cond.wait(self.flush_interval_seconds)
+                stopping = self._stopping
+                events = list(self._queue)
+                self._queue.clear()
+
+            segment = self._write_segment(events) if events else None
+            replayed = self._replay_segments(exclude=segment)
+            flushed = self._flush(events, segment, can_write=replayed) if events else replayed
+            self._consecutive_failures = 0 if flushed else self._consecutive_failures + 1
+
+            if stopping:
+                return
+
+    def _backoff_seconds(self) -> float:
+        exponent = min(self._consecutive_failures - 1, 16)
+        return min(self.max_backoff_seconds, self.flush_interval_seconds * 2**exponent)
+
+    def _flush(self, events: list[TelemetryEventIn], segment: Path | None, can_write: bool) -> bool:
+        written = 0
+        if can_write:
+            try:
+                for start in range(0, len(events), self.batch_size):
+                    chunk = events[start : start + self.batch_size]
+                    self._write(chunk)
+                    written += len(chunk)
+            except Exception:
+                self.flush_failures += 1
+                logger.exception("telemetry write-behind flush failed")
+        self.flushed += written
+
+        if written == len(events):
+            if segment is not None:
+                segment.unlink(missing_ok=True)
+            return True
+        if segment is not None:
+            # Left on disk; replayed (idempotently) on the next flush.
+            return False
+
+        with self._cond:
+            remaining = events[written:]
+            room = self.max_events - len(self._queue)
+            if len(remaining) > room:
+                self.dropped += len(remaining) - max(room, 0)
+                remaining = remaining[len(remaining) - max(room, 0) :]
+            self._queue.extendleft(reversed(remaining))
+        return False
+
+    def _replay_segments(self, exclude: Path | None) -> bool:
+        if self._slot is None:
+            return True
+        for segment in self._segments():
+            if segment == exclude:
+                continue
+            events = _read_segment(segment)
+            try:
+                for start in range(0, len(events), self.batch_size):
+                    self._write(events[start : start + self.batch_size])
+            except Exception:
+                self.flush_failures += 1
+                logger.exception("telemetry spill replay failed for %s", segment.name)
+                return False
+            self.flushed += len(events)
+            segment.unlink(missing_ok=True)
+        return True
+
+    def _slot_path(self, suffix: str) -> Path:
+        assert self.spill_path is not None
+        return self.spill_path.with_name(f"{self.spill_path.name}.{self._slot}.{suffix}")
+
+    # Workers sharing a spill path (uvicorn --workers) each hold an exclusive lock on their own
+    # numbered slot, so they never touch each other's segments. The lock dies with the process,
+    # so a restarted worker takes over the free slot and replays what its predecessor left.
+    def _claim_slot(self) -> None:
+        assert self.spill_path is not None
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        for slot in itertools.count():
+            handle = self.spill_path.with_name(f"{self.spill_path.name}.{slot}.lock").open("a")
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                handle.close()
+                continue
+            self._slot, self._slot_lock = slot, handle
+            return
+
+    def _segments(self) -> list[Path]:
+        assert self.spill_path is not None
+        pattern = f"{self.spill_path.name}.{self._slot}.*.pending"
+        return sorted(self.spill_path.parent.glob(pattern))
+
+    def _write_segment(self, events: list[TelemetryEventIn]) -> Path | None:
+        if self._slot is None:
+            return None
+        segment = self._slot_path(f"{time.time_ns()}.pending")
+        try:
+            with segment.open("w", encoding="utf-8") as handle:
+                handle.writelines(event.model_dump_json() + "\n" for event in events)
+        except OSError:
+            # The batch is requeued in memory instead, as without a spill path.
+            logger.exception("could not write telemetry spill segment %s", segment.name)
+            segment.unlink(missing_ok=True)
+            return None
+        return segment
+
+
+def _read_segment(segment: Path) -> list[TelemetryEventIn]:
+    events = []
+    with segment.open(encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                events.append(TelemetryEventIn.model_validate_json(line))
+            except ValidationError:
+                # A torn final line from a crash mid-write; everything before it is intact.
+                logger.warning("skipping unreadable line %d in %s", line_number, segment.name)
+    return events
+
+
+def _write_events(events: list[TelemetryEventIn]) -> None:
+    with get_sessionmaker()() as db:
+        store_events_sync(db, events)
+
+
+def _build_buffer() -> TelemetryWriteBuffer:
+    spill_path = settings.telemetry_buffer_spill_path
+    return TelemetryWriteBuffer(
+        _write_events,
+        max_events=settings.telemetry_buffer_max_events,
+        batch_size=settings.telemetry_buffer_flush_batch_size,
+        flush_interval_seconds=settings.telemetry_buffer_flush_interval_seconds,
+        overflow_policy=settings.telemetry_buffer_overflow_policy,
+        spill_path=Path(spill_path) if spill_path else None,
+        max_backoff_seconds=settings.telemetry_buffer_max_backoff_seconds,
+    )
+
+
+_buffer: TelemetryWriteBuffer | None = None
+_buffer_lock = threading.Lock()
+
+
+def _buffer_gauge(read: Callable[[TelemetryWriteBuffer], int]) -> Callable[[], int]:
+    return lambda: read(_buffer) if _buffer is not None else 0
+
+
+register_gauge("telemetry.buffer.depth", _buffer_gauge(len))
+register_gauge("telemetry.buffer.enqueued", _buffer_gauge(lambda b: b.enqueued))
+register_gauge("telemetry.buffer.flushed", _buffer_gauge(lambda b: b.flushed))
+register_gauge("telemetry.buffer.rejected", _buffer_gauge(lambda b: b.rejected))
+register_gauge("telemetry.buffer.dropped", _buffer_gauge(lambda b: b.dropped))
+register_gauge("telemetry.buffer.flush_failures", _buffer_gauge(lambda b: b.flush_failures))
+
+
+def get_write_buffer() -> TelemetryWriteBuffer:
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = _build_buffer()
+        # Started lazily too, for apps running without the lifespan (e.g. plain TestClient).
+        if not _buffer.running:
+            _buffer.start()
+        return _buffer
+
+
+def start_write_buffer() -> None:
+    if settings.telemetry_write_behind_enabled:
+        get_write_buffer()
+
+
+def stop_write_buffer() -> None:
+    global _buffer
+    with _buffer_lock:
+        buffer, _buffer = _buffer, None
+    if buffer is not None:
+        # Drains whatever is queued before the process exits.
+        buffer.stop()
@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import contextlib
+import datetime as dt
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import Engine, select
+
+from radiobuddy_api.features.telemetry.models import TelemetryEvent
+from radiobuddy_api.features.telemetry.rollups import committed_upper_bound
+from radiobuddy_api.features.telemetry.schemas import TelemetryExportStatus
+from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.db.session import get_engine
+
+logger = logging.getLogger("radiobuddy_api.telemetry.export")
+
+WATERMARK_FILE = "_watermark.json"
+
+# (column, arrow type name); the JSONB objects are flattened into prefixed typed columns.
+# `metrics` keys are free-form, so it stays a map<string, double>.
+EXPORT_COLUMNS: list[tuple[str, str]] = [
+    ("event_id", "string"),
+    ("timestamp", "timestamp"),
+    ("created_at", "timestamp"),
+    ("schema_version", "string"),
+    ("event_type", "string"),
+    ("procedure_id", "string"),
+    ("procedure_version", "string"),
+    ("session_id", "string"),
+    ("stage_id", "string"),
+    ("device_platform", "string"),
+    ("device_model", "string"),
+    ("device_app_version", "string"),
+    ("metrics", "map"),
+    ("prompt_id", "string"),
+    ("prompt_rule_id", "string"),
+    ("prompt_spoken", "bool"),
+    ("habitus_size_class_estimated", "string"),
+    ("habitus_size_class_final", "string"),
+    ("habitus_height_cm", "double"),
+    ("habitus_weight_kg", "double"),
+    ("habitus_source", "string"),
+    ("exposure_kvp", "double"),
+    ("exposure_mas", "double"),
+    ("exposure_protocol_id", "string"),
+    ("perf_frame_latency_ms", "double"),
+    ("perf_fps", "double"),
+]
+
+_NESTED_FIELDS: dict[str, dict[str, str]] = {
+    "device": {
+        "platform": "device_platform",
+        "model": "device_model",
+        "app_version": "device_app_version",
+    },
+    "prompt": {"prompt_id": "prompt_id", "rule_id": "prompt_rule_id", "spoken": "prompt_spoken"},
+    "habitus": {
+        "size_class_estimated": "habitus_size_class_estimated",
+        "size_class_final": "habitus_size_class_final",
+        "height_cm": "habitus_height_cm",
+        "weight_kg": "habitus_weight_kg",
+        "source": "habitus_source",
+    },
+    "exposure": {
+        "kvp": "exposure_kvp",
+        "mas": "exposure_mas",
+        "protocol_id": "exposure_protocol_id",
+    },
+    "performance": {"frame_latency_ms": "perf_frame_latency_ms", "fps": "perf_fps"},
+}
+_COLUMN_TYPES = dict(EXPORT_COLUMNS)
+
+
+class ExportUnavailableError(RuntimeError):
+    pass
+
+
+class ExportInProgressError(RuntimeError):
+    pass
+
+
+@dataclass
+class ExportResult:
+    rows: int = 0
+    files: list[str] = field(default_factory=list)
+    since: dt.datetime | None = None
+    watermark: dt.datetime | None = None
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as exc:
+        raise ExportUnavailableError(
+            "pyarrow is not installed; install the `export` extra (uv sync --extra export)"
+        ) from exc
+    return pyarrow
+
+
+def _arrow_schema(pa: Any) -> Any:
+    types = {
+        "string": pa.string(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+        "double": pa.float64(),
+        "bool": pa.bool_(),
+        "map": pa.map_(pa.string(), pa.float64()),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in EXPORT_COLUMNS])
+
+
+def _number(value: Any) -> float | None:
+    if isinstance(value, bool) or not isinstance(value, int | float):
+        return None
+    return float(value)
+
+
+def flatten_event(row: Any) -> dict[str, Any]:
+    flat: dict[str, Any] = {
+        "event_id": str(row.event_id),
+        "timestamp": row.timestamp,
+        "created_at": row.created_at,
+        "schema_version": row.schema_version,
+        "event_type": row.event_type,
+        "procedure_id": row.procedure_id,
+        "procedure_version": row.procedure_version,
+        "session_id": str(row.session_id) if row.session_id else None,
+        "stage_id": row.stage_id,
+        "metrics": None,
+    }
+    for source, columns in _NESTED_FIELDS.items():
+        data = getattr(row, source) or {}
+        for key, column in columns.items():
+            value = data.get(key)
+            kind = _COLUMN_TYPES[column]
+            if kind == "double":
+                value = _number(value)
+            elif kind == "bool":
+                value = value if isinstance(value, bool) else None
+            elif value is not None:
+                value = str(value)
+            flat[column] = value
+    if row.metrics:
+        flat["metrics"] = [
+            (key, number)
+            for key, value in row.metrics.items()
+            if (number := _number(value)) is not None
+        ]
+    return flat
+
+
+def partition_path(timestamp: dt.datetime, procedure_id: str) -> Path:
+    day = timestamp.astimezone(dt.timezone.utc).date().isoformat()
+    # Hive-style directories so engines prune on date and procedure_id.
+    safe_procedure = procedure_id.replace("/", "_") or "_"
+    return Path(f"date={day}") / f"procedure_id={safe_procedure}"
+
+
+def read_watermark(out_dir: Path) -> dt.datetime | None:
+    path = out_dir / WATERMARK_FILE
+    if not path.exists():
+        return None
+    return dt.datetime.fromisoformat(json.loads(path.read_text(encoding="utf-8"))["created_at"])
+
+
+def write_watermark(out_dir: Path, watermark: dt.datetime) -> None:
+    path = out_dir / WATERMARK_FILE
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"created_at": watermark.isoformat()}), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# Keeps at most `max_open` Parquet writers; an evicted partition continues in a new part file.
+class _PartitionWriters:
+    def __init__(self, pa: Any, out_dir: Path, run_id: str, max_open: int) -> None:
+        self._pa = pa
+        self._schema = _arrow_schema(pa)
+        self._out_dir = out_dir
+        self._run_id = run_id
+        self._max_open = max(1, max_open)
+        self._open: OrderedDict[Path, tuple[Any, Path]] = OrderedDict()
+        self._parts: dict[Path, int] = {}
+        self._closed: list[Path] = []
+        self.files: list[str] = []
+
+    def write(self, partition: Path, rows: list[dict[str, Any]]) -> None:
+        entry = self._open.get(partition)
+        if entry is None:
+            if len(self._open) >= self._max_open:
+                self._close(*self._open.popitem(last=False))
+            part = self._parts.get(partition, 0)
+            self._parts[partition] = part + 1
+            directory = self._out_dir / partition
+            directory.mkdir(parents=True, exist_ok=True)
+            final = directory / f"part-{self._run_id}-{part:05d}.parquet"
+            writer = self._pa.parquet.ParquetWriter(
+                str(final.with_suffix(".parquet.tmp")), self._schema, compression="zstd"
+            )
+            entry = self._open[partition] = (writer, final)
+        else:
+            self._open.move_to_end(partition)
+        table = self._pa.Table.from_pylist(rows, schema=self._schema)
+        entry[0].write_table(table)
+
+    def _close(self, partition: Path, entry: tuple[Any, Path]) -> None:
+        writer, final = entry
+        writer.close()
+        self._closed.append(final)
+
+    def _close_all(self) -> None:
+        while self._open:
+            self._close(*self._open.popitem(last=False))
+
+    # Files appear under their final name only once the whole run has succeeded; a failed run
+    # is exported again from the same watermark, so none of its files may be kept.
+    def commit(self) -> None:
+        self._close_all()
+        for final in self._closed:
+            os.replace(final.with_suffix(".parquet.tmp"), final)
+            self.files.append(str(final.relative_to(self._out_dir)))
+
+    def abort(self) -> None:
+        entries, self._open = list(self._open.values()), OrderedDict()
+        for writer, final in entries:
+            self._closed.append(final)
+            with contextlib.suppress(Exception):
+                writer.close()
+        for final in self._closed:
+            final.with_suffix(".parquet.tmp").unlink(missing_ok=True)
+
+
+def export_events(
+    engine: Engine,
+    out_dir: Path,
+    since: dt.datetime | None = None,
+    until: dt.datetime | None = None,
+    chunk_rows: int = 10_000,
+    max_open_files: int = 64,
+    lag_seconds: float = 60.0,
+) -> ExportResult:
+    pa = _import_pyarrow()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # Incremental by ingest time: resume from the last watermark and stop short of rows that
+    # may still be committing, with the same bound as the rollup job.
+    since = since or read_watermark(out_dir)
+    writers = _PartitionWriters(pa, out_dir, uuid.uuid4().hex[:12], max_open_files)
+    try:
+        with engine.connect() as conn:
+            upper = until or committed_upper_bound(conn, lag_seconds)
+            result = ExportResult(since=since, watermark=upper)
+            stmt = select(TelemetryEvent.__table__).where(TelemetryEvent.created_at <= upper)
+            if since is not None:
+                stmt = stmt.where(TelemetryEvent.created_at > since)
+            rows = conn.execution_options(stream_results=True, yield_per=chunk_rows).execute(stmt)
+            for chunk in rows.partitions():
+                groups: dict[Path, list[dict[str, Any]]] = {}
+                for row in chunk:
+                    path = partition_path(row.timestamp, row.procedure_id)
+                    groups.setdefault(path, []).append(flatten_event(row))
+                for path, flat_rows in groups.items():
+                    writers.write(path, flat_rows)
+                result.rows += len(chunk)
+    except BaseException:
+        writers.abort()
+        raise
+    writers.commit()
+    result.files = writers.files
+
+    if until is None:
+        write_watermark(out_dir, upper)
+    logger.info("telemetry export wrote %d rows to %d files", result.rows, len(result.files))
+    return result
+
+
+_MAX_TRACKED_JOBS = 20
+_jobs: OrderedDict[str, TelemetryExportStatus] = OrderedDict()
+_jobs_lock = threading.Lock()
+
+
+def begin_export_job() -> TelemetryExportStatus:
+    if not settings.telemetry_export_dir:
+        raise ExportUnavailableError("RADIOBUDDY_TELEMETRY_EXPORT_DIR is not set")
+    _import_pyarrow()
+    with _jobs_lock:
+        # Two runs against the same directory would both advance the watermark.
+        if any(job.status == "running" for job in _jobs.values()):
+            raise ExportInProgressError("telemetry_export_running")
+        job = TelemetryExportStatus(
+            export_id=uuid.uuid4().hex,
+            status="running",
+            started_at=dt.datetime.now(dt.timezone.utc),
+        )
+        _jobs[job.export_id] = job
+        while len(_jobs) > _MAX_TRACKED_JOBS:
+            _jobs.popitem(last=False)
+    return job
+
+
+def run_export_job(
+    export_id: str, since: dt.datetime | None = None, until: dt.datetime | None = None
+) -> None:
+    updates: dict[str, Any]
+    try:
+        result = export_events(
+            get_engine(),
+            Path(settings.telemetry_export_dir or ""),
+            since=since,
+            until=until,
+            chunk_rows=settings.telemetry_export_chunk_rows,
+            max_open_files=settings.telemetry_export_max_open_files,
+        )
+        updates = {
+            "status": "succeeded",
+            "since": result.since,
+            "watermark": result.watermark,
+            "rows": result.rows,
+            "files": result.files,
+        }
+    except Exception as exc:
+        logger.exception("telemetry export %s failed", export_id)
+        updates = {"status": "failed", "detail": str(exc)}
+    updates["finished_at"] = dt.datetime.now(dt.timezone.utc)
+    with _jobs_lock:
+        job = _jobs.get(export_id)
+        if job is not None:
+            _jobs[export_id] = job.model_copy(update=updates)
+
+
+def get_export_job(export_id: str) -> TelemetryExportStatus | None:
+    with _jobs_lock:
+        return _jobs.get(export_id)
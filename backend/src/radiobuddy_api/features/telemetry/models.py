@@ -3,7 +3,7 @@ from __future__ import annotations
 import datetime as dt
 import uuid
 
-from sqlalchemy import DateTime, String
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, Index, String
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -12,9 +12,31 @@ from radiobuddy_api.platform.db.base import Base
 
 class TelemetryEvent(Base):
     __tablename__ = "telemetry_events"
+    # Each composite index serves one equality filter plus the (timestamp, event_id) keyset
+    # order of GET /telemetry/events; the BRIN index covers plain time-range scans cheaply.
+    __table_args__ = (
+        Index("ix_telemetry_events_timestamp_event_id", "timestamp", "event_id"),
+        Index("ix_telemetry_events_session_id_timestamp", "session_id", "timestamp", "event_id"),
+        Index(
+            "ix_telemetry_events_procedure_id_timestamp", "procedure_id", "timestamp", "event_id"
+        ),
+        Index("ix_telemetry_events_event_type_timestamp", "event_type", "timestamp", "event_id"),
+        Index(
+            "ix_telemetry_events_prompt_rule_id_timestamp",
+            "prompt_rule_id",
+            "timestamp",
+            "event_id",
+        ),
+        Index("brin_telemetry_events_timestamp", "timestamp", postgresql_using="brin"),
+        # Rollup jobs read new rows by ingest time.
+        Index("brin_telemetry_events_created_at", "created_at", postgresql_using="brin"),
+        # Monthly partitions are managed by features/telemetry/partitions.py.
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
 
     event_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
-    timestamp: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # Part of the primary key because Postgres requires the partition key in it.
+    timestamp: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
 
     schema_version: Mapped[str] = mapped_column(String(64), nullable=False)
     event_type: Mapped[str] = mapped_column(String(64), nullable=False)
@@ -31,8 +53,76 @@ class TelemetryEvent(Base):
     exposure: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     performance: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
+    # Typed copies of the JSONB fields we filter and aggregate on, written at ingest and
+    # filled for older rows by scripts/backfill_telemetry_columns.py.
+    perf_frame_latency_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    perf_fps: Mapped[float | None] = mapped_column(Float, nullable=True)
+    exposure_kvp: Mapped[float | None] = mapped_column(Float, nullable=True)
+    exposure_mas: Mapped[float | None] = mapped_column(Float, nullable=True)
+    habitus_size_class_estimated: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    habitus_size_class_final: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    prompt_rule_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
+
     created_at: Mapped[dt.datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
         default=lambda: dt.datetime.now(dt.timezone.utc),
     )
+
+
+class TelemetryPerfRollup(Base):
+    __tablename__ = "telemetry_perf_rollups"
+
+    # Empty strings stand in for a missing stage or device so the key stays NOT NULL.
+    bucket_start: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    procedure_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    stage_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    device_platform: Mapped[str] = mapped_column(String(32), primary_key=True)
+    device_model: Mapped[str] = mapped_column(String(128), primary_key=True)
+
+    event_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    latency_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    latency_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    latency_sketch: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    fps_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    fps_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    fps_sketch: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+
+    updated_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class TelemetryRollupWatermark(Base):
+    __tablename__ = "telemetry_rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    watermark: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+# One row per session, merged from every newly stored event at ingest time.
+class TelemetrySession(Base):
+    __tablename__ = "telemetry_sessions"
+    __table_args__ = (
+        Index(
+            "ix_telemetry_sessions_procedure_id_first_event_at", "procedure_id", "first_event_at"
+        ),
+    )
+
+    session_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    procedure_id: Mapped[str] = mapped_column(String(128), nullable=False)
+
+    started_at: Mapped[dt.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    first_event_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_event_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    ready_at: Mapped[dt.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Set by session_end; the summary is final from then on, apart from late events.
+    ended_at: Mapped[dt.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    event_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    prompt_counts: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    habitus_overridden: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    last_exposure: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    last_exposure_at: Mapped[dt.datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    updated_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import re
+from dataclasses import dataclass, field
+
+from sqlalchemy import Connection, Engine, text
+
+from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.db.session import get_engine
+from radiobuddy_api.platform.periodic import PeriodicTask
+
+logger = logging.getLogger("radiobuddy_api.telemetry.partitions")
+
+PARENT_TABLE = "telemetry_events"
+DEFAULT_PARTITION = "telemetry_events_default"
+_PARTITION_NAME = re.compile(r"^telemetry_events_p(\d{4})(\d{2})$")
+# Only one API instance runs maintenance at a time; the others skip that round.
+_ADVISORY_LOCK_KEY = 7_405_016
+# Expired rows are deleted from the default partition this many at a time.
+_DEFAULT_DELETE_BATCH_ROWS = 10_000
+
+
+@dataclass
+class MaintenanceResult:
+    created: list[str] = field(default_factory=list)
+    expired: list[str] = field(default_factory=list)
+    skipped: bool = False
+
+
+def add_months(month: dt.date, months: int) -> dt.date:
+    index = month.year * 12 + month.month - 1 + months
+    return dt.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: dt.date) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y%m}"
+
+
+def _bound(month: dt.date) -> str:
+    return f"{month.isoformat()} 00:00:00+00"
+
+
+def attached_partition_months(conn: Connection) -> list[dt.date]:
+    rows = conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "WHERE parent.relname = :parent"
+        ),
+        {"parent": PARENT_TABLE},
+    ).scalars()
+    months = []
+    for name in rows:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            months.append(dt.date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def create_partition(conn: Connection, month: dt.date) -> None:
+    name = partition_name(month)
+    lower, upper = _bound(month), _bound(add_months(month, 1))
+    has_default_rows = conn.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+            "WHERE timestamp >= CAST(:lower AS timestamptz) "
+            "AND timestamp < CAST(:upper AS timestamptz))"
+        ),
+        {"lower": lower, "upper": upper},
+    ).scalar()
+
+    if not has_default_rows:
+        conn.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+                f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+            )
+        )
+        return
+
+    # Postgres refuses a new partition whose range already has rows in the default
+    # partition, so those rows are moved into the new table before it is attached.
+    conn.execute(
+        text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    )
+    conn.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE timestamp >= CAST(:lower AS timestamptz) "
+            "AND timestamp < CAST(:upper AS timestamptz) RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"lower": lower, "upper": upper},
+    )
+    conn.execute(
+        text(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        )
+    )
+
+
+def ensure_partitions(conn: Connection, today: dt.date, months_ahead: int) -> list[str]:
+    existing = set(attached_partition_months(conn))
+    current = today.replace(day=1)
+    created = []
+    for offset in range(max(0, months_ahead) + 1):
+        month = add_months(current, offset)
+        if month not in existing:
+            create_partition(conn, month)
+            created.append(partition_name(month))
+    return created
+
+
+def _default_partition_months(conn: Connection, before: dt.date) -> list[dt.date]:
+    rows = conn.execute(
+        text(
+            "SELECT DISTINCT CAST(date_trunc('month', timestamp AT TIME ZONE 'UTC') AS date) "
+            f"FROM {DEFAULT_PARTITION} WHERE timestamp < CAST(:cutoff AS timestamptz)"
+        ),
+        {"cutoff": _bound(before)},
+    ).scalars()
+    return sorted(rows)
+
+
+def _delete_default_rows(conn: Connection, before: dt.date) -> int:
+    deleted = 0
+    while True:
+        count = conn.execute(
+            text(
+                f"DELETE FROM {DEFAULT_PARTITION} WHERE ctid IN ("
+                f"SELECT ctid FROM {DEFAULT_PARTITION} "
+                "WHERE timestamp < CAST(:cutoff AS timestamptz) LIMIT :limit)"
+            ),
+            {"cutoff": _bound(before), "limit": _DEFAULT_DELETE_BATCH_ROWS},
+        ).rowcount
+        deleted += count
+        if count < _DEFAULT_DELETE_BATCH_ROWS:
+            return deleted
+
+
+def expire_partitions(
+    conn: Connection, today: dt.date, retention_months: int, action: str
+) -> list[str]:
+    # A partition expires once its whole range is older than the retention window.
+    cutoff = add_months(today.replace(day=1), -retention_months)
+    # Rows older than the monthly partitions land in the default partition and expire too:
+    # deleted in batches when dropping, or moved into their own monthly partitions so they
+    # are detached with the rest.
+    if action == "drop":
+        deleted = _delete_default_rows(conn, cutoff)
+        if deleted:
+            logger.info("deleted %d expired rows from %s", deleted, DEFAULT_PARTITION)
+    else:
+        attached = set(attached_partition_months(conn))
+        for month in _default_partition_months(conn, cutoff):
+            if month not in attached:
+                create_partition(conn, month)
+    expired = []
+    for month in attached_partition_months(conn):
+        if add_months(month, 1) > cutoff:
+            continue
+        name = partition_name(month)
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        if action == "drop":
+            conn.execute(text(f"DROP TABLE {name}"))
+        expired.append(name)
+    return expired
+
+
+def run_maintenance(engine: Engine, today: dt.date | None = None) -> MaintenanceResult:
+    today = today or dt.datetime.now(dt.timezone.utc).date()
+    result = MaintenanceResult()
+    with engine.begin() as conn:
+        if not conn.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY}
+        ).scalar():
+            result.skipped = True
+            return result
+        # ATTACH/DETACH lock the parent; give up quickly rather than stall ingest behind them.
+        conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+        result.created = ensure_partitions(conn, today, settings.telemetry_partition_months_ahead)
+        if settings.telemetry_retention_months is not None:
+            result.expired = expire_partitions(
+                conn,
+                today,
+                settings.telemetry_retention_months,
+                settings.telemetry_retention_action,
+            )
+    if result.created or result.expired:
+        logger.info("telemetry partitions created=%s expired=%s", result.created, result.expired)
+    return result
+
+
+_task: PeriodicTask | None = None
+
+
+def start_partition_maintenance() -> None:
+    global _task
+    interval = settings.telemetry_partition_maintenance_interval_seconds
+    if not settings.database_url or interval <= 0 or _task is not None:
+        return
+    _task = PeriodicTask(
+        "telemetry-partition-maintenance", interval, lambda: run_maintenance(get_engine())
+    )
+    _task.start()
+
+
+def stop_partition_maintenance() -> None:
+    global _task
+    if _task is not None:
+        _task.stop()
+        _task = None
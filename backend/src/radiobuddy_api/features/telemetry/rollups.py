@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import datetime as dt
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from sqlalchemy import Connection, Engine, Float, func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from radiobuddy_api.features.telemetry.models import (
+    TelemetryEvent,
+    TelemetryPerfRollup,
+    TelemetryRollupWatermark,
+)
+from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.db.session import get_engine
+from radiobuddy_api.platform.periodic import PeriodicTask
+from radiobuddy_api.platform.sketch import LogHistogram
+
+ROLLUP_NAME = "perf_hourly"
+# Stored sketches depend on this; changing it needs a rollup rebuild.
+RELATIVE_ACCURACY = 0.01
+GROUP_COLUMNS = ("hour", "procedure_id", "stage_id", "device_platform", "device_model")
+_ADVISORY_LOCK_KEY = 7_405_017
+_UPSERT_CHUNK_ROWS = 500
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc)
+
+RollupKey = tuple[dt.datetime, str, str, str, str]
+
+
+@dataclass
+class PerfAggregate:
+    event_count: int = 0
+    latency_count: int = 0
+    latency_sum: float = 0.0
+    latency_sketch: LogHistogram = field(default_factory=lambda: LogHistogram(RELATIVE_ACCURACY))
+    fps_count: int = 0
+    fps_sum: float = 0.0
+    fps_sketch: LogHistogram = field(default_factory=lambda: LogHistogram(RELATIVE_ACCURACY))
+
+    def add(self, latency: float | None, fps: float | None) -> None:
+        self.event_count += 1
+        if latency is not None:
+            self.latency_count += 1
+            self.latency_sum += latency
+            self.latency_sketch.add(latency)
+        if fps is not None:
+            self.fps_count += 1
+            self.fps_sum += fps
+            self.fps_sketch.add(fps)
+
+    def merge(self, other: PerfAggregate) -> None:
+        self.event_count += other.event_count
+        self.latency_count += other.latency_count
+        self.latency_sum += other.latency_sum
+        self.latency_sketch.merge(other.latency_sketch)
+        self.fps_count += other.fps_count
+        self.fps_sum += other.fps_sum
+        self.fps_sketch.merge(other.fps_sketch)
+
+    @classmethod
+    def from_row(cls, row: TelemetryPerfRollup) -> PerfAggregate:
+        return cls(
+            event_count=row.event_count,
+            latency_count=row.latency_count,
+            latency_sum=row.latency_sum,
+            latency_sketch=LogHistogram.from_json(row.latency_sketch, RELATIVE_ACCURACY),
+            fps_count=row.fps_count,
+            fps_sum=row.fps_sum,
+            fps_sketch=LogHistogram.from_json(row.fps_sketch, RELATIVE_ACCURACY),
+        )
+
+
+@dataclass
+class RollupResult:
+    rows: int = 0
+    groups: int = 0
+    watermark: dt.datetime | None = None
+    skipped: bool = False
+
+
+def aggregate_rows(rows: Iterable[tuple]) -> dict[RollupKey, PerfAggregate]:
+    aggregates: dict[RollupKey, PerfAggregate] = {}
+    for hour, procedure_id, stage_id, platform, model, latency, fps in rows:
+        key = (hour, procedure_id, stage_id or "", platform or "", model or "")
+        aggregate = aggregates.get(key)
+        if aggregate is None:
+            aggregate = aggregates[key] = PerfAggregate()
+        aggregate.add(latency, fps)
+    return aggregates
+
+
+# Events are stamped with their transaction's start time (now()), so an event that is not yet
+# committed has created_at >= the xact_start of some open transaction. Stopping just short of
+# the oldest one keeps such rows above the watermark however long their commit takes; the lag
+# is an extra margin. xact_start of other roles' sessions is only visible with
+# pg_read_all_stats, and without it the bound falls back to the lag alone.
+_COMMITTED_UPPER_BOUND = text(
+    """
+    SELECT least(
+        clock_timestamp() - make_interval(secs => :lag_seconds),
+        (
+            SELECT min(xact_start) - interval '1 microsecond'
+            FROM pg_stat_activity
+            WHERE datname = current_database()
+              AND pid <> pg_backend_pid()
+              AND xact_start IS NOT NULL
+        )
+    )
+    """
+)
+
+
+def committed_upper_bound(conn: Connection, lag_seconds: float) -> dt.datetime:
+    return conn.execute(_COMMITTED_UPPER_BOUND, {"lag_seconds": lag_seconds}).scalar_one()
+
+
+def _new_events_query(lower: dt.datetime, upper: dt.datetime):
+    performance = TelemetryEvent.performance
+    return select(
+        func.date_trunc("hour", TelemetryEvent.timestamp, "UTC"),
+        TelemetryEvent.procedure_id,
+        TelemetryEvent.stage_id,
+        TelemetryEvent.device["platform"].astext,
+        TelemetryEvent.device["model"].astext,
+        # The JSONB fallback only runs for rows ingested before the typed columns existed
+        # and not yet backfilled.
+        func.coalesce(
+            TelemetryEvent.perf_frame_latency_ms,
+            performance["frame_latency_ms"].astext.cast(Float),
+        ),
+        func.coalesce(TelemetryEvent.perf_fps, performance["fps"].astext.cast(Float)),
+    ).where(
+        TelemetryEvent.created_at > lower,
+        TelemetryEvent.created_at <= upper,
+        performance.is_not(None),
+    )
+
+
+def merge_into_rollups(
+    conn: Connection, aggregates: dict[RollupKey, PerfAggregate], now: dt.datetime
+) -> None:
+    rows = [
+        {
+            "bucket_start": key[0],
+            "procedure_id": key[1],
+            "stage_id": key[2],
+            "device_platform": key[3],
+            "device_model": key[4],
+            "event_count": aggregate.event_count,
+            "latency_count": aggregate.latency_count,
+            "latency_sum": aggregate.latency_sum,
+            "latency_sketch": aggregate.latency_sketch.to_json(),
+            "fps_count": aggregate.fps_count,
+            "fps_sum": aggregate.fps_sum,
+            "fps_sketch": aggregate.fps_sketch.to_json(),
+            "updated_at": now,
+        }
+        for key, aggregate in aggregates.items()
+    ]
+    table = TelemetryPerfRollup.__table__
+    for start in range(0, len(rows), _UPSERT_CHUNK_ROWS):
+        stmt = pg_insert(table).values(rows[start : start + _UPSERT_CHUNK_ROWS])
+        excluded = stmt.excluded
+        conn.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[column.name for column in table.primary_key.columns],
+                set_={
+                    "event_count": table.c.event_count + excluded.event_count,
+                    "latency_count": table.c.latency_count + excluded.latency_count,
+                    "latency_sum": table.c.latency_sum + excluded.latency_sum,
+                    "latency_sketch": func.telemetry_sketch_merge(
+                        table.c.latency_sketch, excluded.latency_sketch
+                    ),
+                    "fps_count": table.c.fps_count + excluded.fps_count,
+                    "fps_sum": table.c.fps_sum + excluded.fps_sum,
+                    "fps_sketch": func.telemetry_sketch_merge(
+                        table.c.fps_sketch, excluded.fps_sketch
+                    ),
+                    "updated_at": excluded.updated_at,
+                },
+            )
+        )
+
+
+def run_rollup(engine: Engine, now: dt.datetime | None = None) -> RollupResult:
+    now = now or dt.datetime.now(dt.timezone.utc)
+    result = RollupResult()
+    with engine.begin() as conn:
+        if not conn.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY}
+        ).scalar():
+            result.skipped = True
+            return result
+
+        lower = (
+            conn.execute(
+                select(TelemetryRollupWatermark.watermark).where(
+                    TelemetryRollupWatermark.name == ROLLUP_NAME
+                )
+            ).scalar()
+            or _EPOCH
+        )
+        upper = committed_upper_bound(conn, settings.telemetry_rollup_lag_seconds)
+        if upper <= lower:
+            result.watermark = lower
+            return result
+
+        rows = conn.execute(
+            _new_events_query(lower, upper).execution_options(stream_results=True, yield_per=5000)
+        )
+        aggregates = aggregate_rows(rows)
+        merge_into_rollups(conn, aggregates, now)
+
+        # Advanced in the same transaction as the merge, so a failed run leaves no partial
+        # rollup behind and the next run picks up the same rows.
+        watermark_stmt = pg_insert(TelemetryRollupWatermark).values(
+            name=ROLLUP_NAME, watermark=upper
+        )
+        conn.execute(
+            watermark_stmt.on_conflict_do_update(
+                index_elements=["name"], set_={"watermark": watermark_stmt.excluded.watermark}
+            )
+        )
+        result.rows = sum(aggregate.event_count for aggregate in aggregates.values())
+        result.groups = len(aggregates)
+        result.watermark = upper
+    return result
+
+
+async def query_rollups(
+    db: AsyncSession,
+    since: dt.datetime,
+    until: dt.datetime,
+    group_by: list[str],
+    procedure_id: str | None = None,
+    stage_id: str | None = None,
+    device_platform: str | None = None,
+    device_model: str | None = None,
+) -> dict[tuple, PerfAggregate]:
+    stmt = select(TelemetryPerfRollup).where(
+        TelemetryPerfRollup.bucket_start >= func.date_trunc("hour", since, "UTC"),
+        TelemetryPerfRollup.bucket_start < until,
+    )
+    if procedure_id is not None:
+        stmt = stmt.where(TelemetryPerfRollup.procedure_id == procedure_id)
+    if stage_id is not None:
+        stmt = stmt.where(TelemetryPerfRollup.stage_id == stage_id)
+    if device_platform is not None:
+        stmt = stmt.where(TelemetryPerfRollup.device_platform == device_platform)
+    if device_model is not None:
+        stmt = stmt.where(TelemetryPerfRollup.device_model == device_model)
+
+    groups: dict[tuple, PerfAggregate] = {}
+    for row in await db.scalars(stmt):
+        key = tuple(
+            row.bucket_start if column == "hour" else getattr(row, column) for column in group_by
+        )
+        aggregate = PerfAggregate.from_row(row)
+        if key in groups:
+            groups[key].merge(aggregate)
+        else:
+            groups[key] = aggregate
+    return groups
+
+
+_task: PeriodicTask | None = None
+
+
+def start_rollup_job() -> None:
+    global _task
+    interval = settings.telemetry_rollup_interval_seconds
+    if not settings.database_url or interval <= 0 or _task is not None:
+        return
+    _task = PeriodicTask("telemetry-perf-rollup", interval, lambda: run_rollup(get_engine()))
+    _task.start()
+
+
+def stop_rollup_job() -> None:
+    global _task
+    if _task is not None:
+        _task.stop()
+        _task = None
@@ -1,31 +1,343 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import datetime as dt
+import uuid
+from collections.abc import AsyncIterator
 
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import ClientDisconnect
+
+from radiobuddy_api.features.telemetry.buffer import get_write_buffer
+from radiobuddy_api.features.telemetry.export import (
+    ExportInProgressError,
+    ExportUnavailableError,
+    begin_export_job,
+    get_export_job,
+    run_export_job,
+)
+from radiobuddy_api.features.telemetry.rollups import RELATIVE_ACCURACY, query_rollups
 from radiobuddy_api.features.telemetry.schemas import (
+    MAX_PAGE_EVENTS,
     ErrorResponse,
+    HabitusSizeClass,
+    PerfGroupColumn,
+    PerfMetric,
+    PerfPercentileGroup,
+    PerfPercentilesOut,
+    TelemetryBatchAccepted,
+    TelemetryBatchIn,
+    TelemetryBatchItemResult,
     TelemetryEventAccepted,
     TelemetryEventIn,
+    TelemetryEventOut,
+    TelemetryEventPage,
+    TelemetryEventType,
+    TelemetryExportIn,
+    TelemetryExportStatus,
+    TelemetrySessionOut,
+    TelemetryUploadResult,
+)
+from radiobuddy_api.features.telemetry.service import (
+    InvalidCursorError,
+    list_events,
+    parse_batch,
+    store_event,
+    store_events,
+)
+from radiobuddy_api.features.telemetry.sessions import (
+    get_session_summary,
+    list_session_summaries,
+    to_session_out,
 )
-from radiobuddy_api.features.telemetry.service import store_event
+from radiobuddy_api.features.telemetry.upload import (
+    TruncatedUploadError,
+    gunzip_chunks,
+    ingest_ndjson,
+)
+from radiobuddy_api.platform.config import settings
 from radiobuddy_api.platform.db.session import get_db
+from radiobuddy_api.platform.security import require_admin_api_key
 
 router = APIRouter(prefix="/telemetry", tags=["telemetry"])
 
 
+@router.get(
+    "/events",
+    response_model=TelemetryEventPage,
+    responses={400: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+)
+async def list_events_endpoint(
+    session_id: uuid.UUID | None = None,
+    procedure_id: str | None = None,
+    event_type: TelemetryEventType | None = None,
+    prompt_rule_id: str | None = None,
+    habitus_size_class: HabitusSizeClass | None = None,
+    since: dt.datetime | None = None,
+    until: dt.datetime | None = None,
+    cursor: str | None = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_EVENTS),
+    _: None = Depends(require_admin_api_key),
+    db: AsyncSession = Depends(get_db),
+) -> TelemetryEventPage:
+    try:
+        rows, next_cursor = await list_events(
+            db,
+            session_id=session_id,
+            procedure_id=procedure_id,
+            event_type=event_type,
+            prompt_rule_id=prompt_rule_id,
+            habitus_size_class=habitus_size_class,
+            since=since,
+            until=until,
+            cursor=cursor,
+            limit=limit,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    return TelemetryEventPage(
+        items=[TelemetryEventOut.model_validate(row, from_attributes=True) for row in rows],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/performance/percentiles",
+    response_model=PerfPercentilesOut,
+    responses={400: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+)
+async def performance_percentiles_endpoint(
+    metric: PerfMetric = "frame_latency_ms",
+    q: list[float] = Query([0.5, 0.95, 0.99]),
+    group_by: list[PerfGroupColumn] = Query(["hour"]),
+    since: dt.datetime | None = None,
+    until: dt.datetime | None = None,
+    procedure_id: str | None = None,
+    stage_id: str | None = None,
+    device_platform: str | None = None,
+    device_model: str | None = None,
+    _: None = Depends(require_admin_api_key),
+    db: AsyncSession = Depends(get_db),
+) -> PerfPercentilesOut:
+    if not q or any(not 0 <= quantile <= 1 for quantile in q):
+        raise HTTPException(status_code=400, detail="invalid_quantile")
+    until = until or dt.datetime.now(dt.timezone.utc)
+    since = since or until - dt.timedelta(hours=24)
+    group_by = list(dict.fromkeys(group_by))
+
+    groups = await query_rollups(
+        db,
+        since=since,
+        until=until,
+        group_by=group_by,
+        procedure_id=procedure_id,
+        stage_id=stage_id,
+        device_platform=device_platform,
+        device_model=device_model,
+    )
+
+    out = []
+    for key, aggregate in sorted(groups.items(), key=lambda item: item[0]):
+        if metric == "fps":
+            count, total, sketch = aggregate.fps_count, aggregate.fps_sum, aggregate.fps_sketch
+        else:
+            count, total, sketch = (
+                aggregate.latency_count,
+                aggregate.latency_sum,
+                aggregate.latency_sketch,
+            )
+        # Rollups store a missing stage or device as "".
+        labels = {column: value or None for column, value in zip(group_by, key)}
+        out.append(
+            PerfPercentileGroup(
+                **labels,
+                count=count,
+                mean=total / count if count else None,
+                quantiles={f"p{quantile * 100:g}": sketch.quantile(quantile) for quantile in q},
+            )
+        )
+    return PerfPercentilesOut(metric=metric, relative_accuracy=RELATIVE_ACCURACY, groups=out)
+
+
+@router.get(
+    "/sessions",
+    response_model=list[TelemetrySessionOut],
+    responses={503: {"model": ErrorResponse}},
+)
+async def list_sessions_endpoint(
+    procedure_id: str | None = None,
+    since: dt.datetime | None = None,
+    until: dt.datetime | None = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_EVENTS),
+    _: None = Depends(require_admin_api_key),
+    db: AsyncSession = Depends(get_db),
+) -> list[TelemetrySessionOut]:
+    rows = await list_session_summaries(
+        db, procedure_id=procedure_id, since=since, until=until, limit=limit
+    )
+    return [to_session_out(row) for row in rows]
+
+
+@router.get(
+    "/sessions/{session_id}",
+    response_model=TelemetrySessionOut,
+    responses={404: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+)
+async def get_session_endpoint(
+    session_id: uuid.UUID,
+    _: None = Depends(require_admin_api_key),
+    db: AsyncSession = Depends(get_db),
+) -> TelemetrySessionOut:
+    row = await get_session_summary(db, session_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="session_not_found")
+    return to_session_out(row)
+
+
+@router.post(
+    "/exports",
+    status_code=202,
+    response_model=TelemetryExportStatus,
+    responses={409: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+)
+def start_export_endpoint(
+    background_tasks: BackgroundTasks,
+    body: TelemetryExportIn | None = None,
+    _: None = Depends(require_admin_api_key),
+) -> TelemetryExportStatus:
+    try:
+        job = begin_export_job()
+    except ExportInProgressError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except ExportUnavailableError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    body = body or TelemetryExportIn()
+    background_tasks.add_task(run_export_job, job.export_id, body.since, body.until)
+    return job
+
+
+@router.get(
+    "/exports/{export_id}",
+    response_model=TelemetryExportStatus,
+    responses={404: {"model": ErrorResponse}},
+)
+def get_export_endpoint(
+    export_id: str,
+    _: None = Depends(require_admin_api_key),
+) -> TelemetryExportStatus:
+    job = get_export_job(export_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="export_not_found")
+    return job
+
+
 @router.post(
     "/events",
     response_model=TelemetryEventAccepted,
-    responses={503: {"model": ErrorResponse}},
+    responses={202: {"model": TelemetryEventAccepted}, 503: {"model": ErrorResponse}},
 )
-def ingest_event(
-    payload: TelemetryEventIn, db: Session = Depends(get_db)
-) -> TelemetryEventAccepted:
+async def ingest_event(
+    payload: TelemetryEventIn, db: AsyncSession = Depends(get_db)
+) -> TelemetryEventAccepted | JSONResponse:
+    if settings.telemetry_write_behind_enabled:
+        if not get_write_buffer().enqueue(payload):
+            raise HTTPException(status_code=503, detail="telemetry_buffer_full")
+        return _accepted(TelemetryEventAccepted(event_id=payload.event_id))
+
     try:
-        store_event(db, payload)
+        await store_event(db, payload)
     except RuntimeError as exc:
         # Most likely missing DB config.
         raise HTTPException(status_code=503, detail=str(exc)) from exc
 
     return TelemetryEventAccepted(event_id=payload.event_id)
+
+
+@router.post(
+    "/events:batch",
+    response_model=TelemetryBatchAccepted,
+    responses={202: {"model": TelemetryBatchAccepted}, 503: {"model": ErrorResponse}},
+)
+async def ingest_events_batch(
+    payload: TelemetryBatchIn, db: AsyncSession = Depends(get_db)
+) -> TelemetryBatchAccepted | JSONResponse:
+    events, results = parse_batch(payload.events)
+    if settings.telemetry_write_behind_enabled:
+        results = _enqueue_batch(events, results)
+        return _accepted(_batch_summary(results))
+
+    try:
+        await store_events(db, events)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+    return _batch_summary(results)
+
+
+@router.post(
+    "/events:upload",
+    response_model=TelemetryUploadResult,
+    responses={415: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+)
+async def upload_events(
+    request: Request,
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+) -> TelemetryUploadResult:
+    encoding = request.headers.get("content-encoding", "identity").strip().lower()
+    if encoding not in ("gzip", "identity"):
+        raise HTTPException(status_code=415, detail="unsupported_content_encoding")
+
+    chunks = _body_chunks(request)
+    if encoding == "gzip":
+        chunks = gunzip_chunks(chunks)
+
+    try:
+        return await ingest_ndjson(
+            chunks,
+            lambda events: store_events(db, events),
+            chunk_events=settings.telemetry_upload_chunk_events,
+            max_line_bytes=settings.telemetry_upload_max_line_bytes,
+            max_errors=settings.telemetry_upload_max_errors,
+            start_offset=offset,
+        )
+    except RuntimeError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+
+async def _body_chunks(request: Request) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in request.stream():
+            yield chunk
+    except ClientDisconnect as exc:
+        raise TruncatedUploadError("client_disconnected") from exc
+
+
+def _accepted(body: TelemetryEventAccepted | TelemetryBatchAccepted) -> JSONResponse:
+    return JSONResponse(status_code=202, content=body.model_dump(mode="json"))
+
+
+def _enqueue_batch(
+    events: list[TelemetryEventIn], results: list[TelemetryBatchItemResult]
+) -> list[TelemetryBatchItemResult]:
+    buffer = get_write_buffer()
+    full = {event.event_id for event in events if not buffer.enqueue(event)}
+    if not full:
+        return results
+    return [
+        result.model_copy(update={"status": "rejected", "errors": [{"type": "buffer_full"}]})
+        if result.status == "accepted" and result.event_id in full
+        else result
+        for result in results
+    ]
+
+
+def _batch_summary(results: list[TelemetryBatchItemResult]) -> TelemetryBatchAccepted:
+    accepted = sum(1 for result in results if result.status == "accepted")
+    return TelemetryBatchAccepted(
+        accepted=accepted,
+        rejected=len(results) - accepted,
+        results=results,
+    )
@@ -6,6 +6,9 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
+MAX_BATCH_EVENTS = 500
+MAX_PAGE_EVENTS = 500
+
 TelemetryEventType = Literal[
     "session_start",
     "session_end",
@@ -30,9 +33,12 @@ class TelemetryPrompt(BaseModel):
     spoken: bool | None = None
 
 
+HabitusSizeClass = Literal["small", "average", "large"]
+
+
 class TelemetryHabitus(BaseModel):
-    size_class_estimated: Literal["small", "average", "large"] | None = None
-    size_class_final: Literal["small", "average", "large"] | None = None
+    size_class_estimated: HabitusSizeClass | None = None
+    size_class_final: HabitusSizeClass | None = None
     height_cm: float | None = None
     weight_kg: float | None = None
     source: Literal["camera_estimate", "manual"] | None = None
@@ -95,6 +101,44 @@ class TelemetryEventAccepted(BaseModel):
     event_id: UUID
 
 
+class TelemetryBatchIn(BaseModel):
+    # Items stay raw so one malformed event is rejected on its own instead of failing
+    # validation of the whole request.
+    events: list[dict[str, Any]] = Field(..., min_length=1, max_length=MAX_BATCH_EVENTS)
+
+
+class TelemetryBatchItemResult(BaseModel):
+    index: int
+    event_id: UUID | None = None
+    status: Literal["accepted", "rejected"]
+    errors: list[dict[str, Any]] | None = None
+
+
+class TelemetryBatchAccepted(BaseModel):
+    accepted: int
+    rejected: int
+    results: list[TelemetryBatchItemResult]
+
+
+class TelemetryUploadLineError(BaseModel):
+    line: int
+    offset: int
+    errors: list[dict[str, Any]]
+
+
+class TelemetryUploadResult(BaseModel):
+    accepted: int = 0
+    rejected: int = 0
+    lines: int = 0
+    # Uncompressed byte offset up to which every line has been processed and committed;
+    # an interrupted upload resumes by sending the NDJSON from here with ?offset=.
+    committed_offset: int = 0
+    complete: bool = True
+    detail: str | None = None
+    errors: list[TelemetryUploadLineError] = Field(default_factory=list)
+    errors_truncated: bool = False
+
+
 class TelemetryEventOut(BaseModel):
     event_id: UUID
     timestamp: datetime
@@ -116,6 +160,72 @@ class TelemetryEventOut(BaseModel):
     created_at: datetime
 
 
+class TelemetryEventPage(BaseModel):
+    items: list[TelemetryEventOut]
+    # Opaque; pass back unchanged with the same filters to fetch the next page.
+    next_cursor: str | None = None
+
+
+PerfMetric = Literal["frame_latency_ms", "fps"]
+PerfGroupColumn = Literal["hour", "procedure_id", "stage_id", "device_platform", "device_model"]
+
+
+class PerfPercentileGroup(BaseModel):
+    hour: datetime | None = None
+    procedure_id: str | None = None
+    stage_id: str | None = None
+    device_platform: str | None = None
+    device_model: str | None = None
+
+    count: int
+    mean: float | None = None
+    quantiles: dict[str, float | None]
+
+
+class PerfPercentilesOut(BaseModel):
+    metric: PerfMetric
+    relative_accuracy: float
+    groups: list[PerfPercentileGroup]
+
+
+class TelemetrySessionOut(BaseModel):
+    session_id: UUID
+    procedure_id: str
+    status: Literal["active", "ended"]
+
+    started_at: datetime | None = None
+    first_event_at: datetime
+    last_event_at: datetime
+    ready_at: datetime | None = None
+    ended_at: datetime | None = None
+    seconds_to_ready: float | None = None
+    duration_seconds: float | None = None
+
+    event_count: int
+    prompt_counts: dict[str, int]
+    habitus_overridden: bool
+    last_exposure: dict[str, Any] | None = None
+    last_exposure_at: datetime | None = None
+
+
+class TelemetryExportIn(BaseModel):
+    # Both default to incremental: from the stored watermark up to now minus the ingest lag.
+    since: datetime | None = None
+    until: datetime | None = None
+
+
+class TelemetryExportStatus(BaseModel):
+    export_id: str
+    status: Literal["running", "succeeded", "failed"]
+    started_at: datetime
+    finished_at: datetime | None = None
+    since: datetime | None = None
+    watermark: datetime | None = None
+    rows: int = 0
+    files: list[str] = Field(default_factory=list)
+    detail: str | None = None
+
+
 class ErrorResponse(BaseModel):
     error: str
     detail: Any | None = None
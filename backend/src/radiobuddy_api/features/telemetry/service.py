@@ -1,37 +1,267 @@
 from __future__ import annotations
 
-from sqlalchemy import desc, select
+import base64
+import datetime as dt
+import json
+import threading
+import uuid
+from typing import Any
+
+from pydantic import ValidationError
+from sqlalchemy import desc, func, select, tuple_
+from sqlalchemy.dialects.postgresql import Insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from radiobuddy_api.features.telemetry.models import TelemetryEvent
-from radiobuddy_api.features.telemetry.schemas import TelemetryEventIn
-
-
-def store_event(db: Session, event: TelemetryEventIn) -> None:
-    row = TelemetryEvent(
-        event_id=event.event_id,
-        timestamp=event.timestamp,
-        schema_version=event.schema_version,
-        event_type=event.event_type,
-        procedure_id=event.procedure_id,
-        procedure_version=event.procedure_version,
-        session_id=event.session_id,
-        stage_id=event.stage_id,
-        device=event.device.model_dump() if event.device else None,
-        metrics=event.metrics,
-        prompt=event.prompt.model_dump() if event.prompt else None,
-        habitus=event.habitus.model_dump() if event.habitus else None,
-        exposure=event.exposure.model_dump() if event.exposure else None,
-        performance=event.performance.model_dump() if event.performance else None,
+from radiobuddy_api.features.telemetry.schemas import TelemetryBatchItemResult, TelemetryEventIn
+from radiobuddy_api.features.telemetry.sessions import session_upsert_statement, summarize_events
+from radiobuddy_api.platform.bloom import RotatingBloomFilter
+from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.metrics import register_gauge
+
+# Recently committed event_ids. A false positive acknowledges a new event without storing
+# it, so the error rate is kept very low.
+_stored_event_ids = RotatingBloomFilter(
+    capacity=settings.telemetry_dedupe_filter_capacity,
+    error_rate=settings.telemetry_dedupe_filter_error_rate,
+)
+_duplicate_counts = {"received": 0, "filtered": 0, "conflicts": 0}
+_duplicate_lock = threading.Lock()
+
+
+def _duplicate_rate() -> float:
+    received = _duplicate_counts["received"]
+    if not received:
+        return 0.0
+    return (_duplicate_counts["filtered"] + _duplicate_counts["conflicts"]) / received
+
+
+register_gauge("telemetry.dedupe.received", lambda: _duplicate_counts["received"])
+register_gauge("telemetry.dedupe.filtered", lambda: _duplicate_counts["filtered"])
+register_gauge("telemetry.dedupe.conflicts", lambda: _duplicate_counts["conflicts"])
+register_gauge("telemetry.dedupe.duplicate_rate", _duplicate_rate)
+register_gauge("telemetry.dedupe.filter_rotations", lambda: _stored_event_ids.rotations)
+
+
+def _event_row(event: TelemetryEventIn) -> dict[str, Any]:
+    return {
+        "event_id": event.event_id,
+        "timestamp": event.timestamp,
+        "schema_version": event.schema_version,
+        "event_type": event.event_type,
+        "procedure_id": event.procedure_id,
+        "procedure_version": event.procedure_version,
+        "session_id": event.session_id,
+        "stage_id": event.stage_id,
+        "device": event.device.model_dump() if event.device else None,
+        "metrics": event.metrics,
+        "prompt": event.prompt.model_dump() if event.prompt else None,
+        "habitus": event.habitus.model_dump() if event.habitus else None,
+        "exposure": event.exposure.model_dump() if event.exposure else None,
+        "performance": event.performance.model_dump() if event.performance else None,
+        **typed_columns(event),
+        # The database's transaction start time, not the app clock: the rollup and export
+        # watermarks compare it with the start of transactions still in flight.
+        "created_at": func.now(),
+    }
+
+
+def typed_columns(event: TelemetryEventIn) -> dict[str, Any]:
+    performance, exposure = event.performance, event.exposure
+    habitus, prompt = event.habitus, event.prompt
+    return {
+        "perf_frame_latency_ms": performance.frame_latency_ms if performance else None,
+        "perf_fps": performance.fps if performance else None,
+        "exposure_kvp": exposure.kvp if exposure else None,
+        "exposure_mas": exposure.mas if exposure else None,
+        "habitus_size_class_estimated": habitus.size_class_estimated if habitus else None,
+        "habitus_size_class_final": habitus.size_class_final if habitus else None,
+        "prompt_rule_id": prompt.rule_id if prompt else None,
+    }
+
+
+async def store_event(db: AsyncSession, event: TelemetryEventIn) -> None:
+    await store_events(db, [event])
+
+
+async def store_events(db: AsyncSession, events: list[TelemetryEventIn]) -> int:
+    fresh = _fresh_events(events)
+    inserted_ids: set[uuid.UUID] = set()
+    if fresh:
+        now = dt.datetime.now(dt.timezone.utc)
+        result = await db.execute(_insert_statement(fresh))
+        inserted_ids = set(result.scalars().all())
+        summaries = _session_summaries(fresh, inserted_ids, now)
+        if summaries:
+            await db.execute(session_upsert_statement(summaries))
+        await db.commit()
+    _record_stored(events, fresh, inserted_ids)
+    return len(inserted_ids)
+
+
+# Same as store_events, for the write-behind buffer thread and other sync callers.
+def store_events_sync(db: Session, events: list[TelemetryEventIn]) -> int:
+    fresh = _fresh_events(events)
+    inserted_ids: set[uuid.UUID] = set()
+    if fresh:
+        now = dt.datetime.now(dt.timezone.utc)
+        inserted_ids = set(db.execute(_insert_statement(fresh)).scalars().all())
+        summaries = _session_summaries(fresh, inserted_ids, now)
+        if summaries:
+            db.execute(session_upsert_statement(summaries))
+        db.commit()
+    _record_stored(events, fresh, inserted_ids)
+    return len(inserted_ids)
+
+
+# Retries resend the same event_id: anything the filter has probably stored already is
+# acknowledged without a round trip, and the rest relies on ON CONFLICT DO NOTHING. A repeat
+# within one call is dropped here too (keeping the first): RETURNING reports its id only once,
+# so both copies would otherwise count towards the session summary.
+def _fresh_events(events: list[TelemetryEventIn]) -> list[TelemetryEventIn]:
+    fresh: dict[uuid.UUID, TelemetryEventIn] = {}
+    for event in events:
+        if event.event_id not in fresh and not _probably_stored(event):
+            fresh[event.event_id] = event
+    return list(fresh.values())
+
+
+def _insert_statement(events: list[TelemetryEventIn]) -> Insert:
+    # One multi-row INSERT and one commit for the whole batch.
+    return (
+        pg_insert(TelemetryEvent)
+        .values([_event_row(event) for event in events])
+        .on_conflict_do_nothing()
+        .returning(TelemetryEvent.event_id)
     )
 
-    db.add(row)
-    db.commit()
 
+def _session_summaries(
+    fresh: list[TelemetryEventIn], inserted_ids: set[uuid.UUID], now: dt.datetime
+) -> list[dict[str, Any]]:
+    # Only rows this statement actually inserted count towards the session summaries,
+    # so a retried event is never counted twice.
+    return summarize_events([event for event in fresh if event.event_id in inserted_ids], now)
+
+
+def _record_stored(
+    events: list[TelemetryEventIn], fresh: list[TelemetryEventIn], inserted_ids: set[uuid.UUID]
+) -> None:
+    if settings.telemetry_dedupe_filter_enabled:
+        for event in fresh:
+            _stored_event_ids.add(event.event_id.bytes)
+    with _duplicate_lock:
+        _duplicate_counts["received"] += len(events)
+        _duplicate_counts["filtered"] += len(events) - len(fresh)
+        _duplicate_counts["conflicts"] += len(fresh) - len(inserted_ids)
+
+
+def _probably_stored(event: TelemetryEventIn) -> bool:
+    return settings.telemetry_dedupe_filter_enabled and event.event_id.bytes in _stored_event_ids
+
+
+def parse_batch(
+    raw_events: list[dict[str, Any]],
+) -> tuple[list[TelemetryEventIn], list[TelemetryBatchItemResult]]:
+    events: list[TelemetryEventIn] = []
+    results: list[TelemetryBatchItemResult] = []
+    seen: set[Any] = set()
+    for index, raw in enumerate(raw_events):
+        try:
+            event = TelemetryEventIn.model_validate(raw)
+        except ValidationError as exc:
+            errors = exc.errors(include_url=False, include_context=False, include_input=False)
+            results.append(
+                TelemetryBatchItemResult(
+                    index=index,
+                    event_id=_raw_event_id(raw),
+                    status="rejected",
+                    errors=[dict(error) for error in errors],
+                )
+            )
+            continue
+
+        # A repeated event_id inside one batch is the same event; store it once.
+        if event.event_id not in seen:
+            seen.add(event.event_id)
+            events.append(event)
+        results.append(
+            TelemetryBatchItemResult(index=index, event_id=event.event_id, status="accepted")
+        )
+    return events, results
+
+
+def _raw_event_id(raw: Any) -> uuid.UUID | None:
+    if not isinstance(raw, dict) or not isinstance(raw.get("event_id"), str):
+        return None
+    try:
+        return uuid.UUID(raw["event_id"])
+    except ValueError:
+        return None
 
-def list_events(db: Session, session_id: str | None, limit: int) -> list[TelemetryEvent]:
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(timestamp: dt.datetime, event_id: uuid.UUID) -> str:
+    raw = json.dumps([timestamp.isoformat(), str(event_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[dt.datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, event_id = json.loads(raw)
+        return dt.datetime.fromisoformat(timestamp), uuid.UUID(event_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError("invalid_cursor") from exc
+
+
+async def list_events(
+    db: AsyncSession,
+    session_id: uuid.UUID | None = None,
+    procedure_id: str | None = None,
+    event_type: str | None = None,
+    prompt_rule_id: str | None = None,
+    habitus_size_class: str | None = None,
+    since: dt.datetime | None = None,
+    until: dt.datetime | None = None,
+    cursor: str | None = None,
+    limit: int = 100,
+) -> tuple[list[TelemetryEvent], str | None]:
     safe_limit = max(1, min(int(limit), 500))
-    stmt = select(TelemetryEvent).order_by(desc(TelemetryEvent.timestamp)).limit(safe_limit)
+    # Keyset pagination on (timestamp, event_id) descending: every page is an index range
+    # scan starting at the cursor, so deep pages cost the same as the first one.
+    stmt = (
+        select(TelemetryEvent)
+        .order_by(desc(TelemetryEvent.timestamp), desc(TelemetryEvent.event_id))
+        .limit(safe_limit + 1)
+    )
     if session_id:
         stmt = stmt.where(TelemetryEvent.session_id == session_id)
-    return list(db.scalars(stmt))
+    if procedure_id:
+        stmt = stmt.where(TelemetryEvent.procedure_id == procedure_id)
+    if event_type:
+        stmt = stmt.where(TelemetryEvent.event_type == event_type)
+    if prompt_rule_id:
+        stmt = stmt.where(TelemetryEvent.prompt_rule_id == prompt_rule_id)
+    if habitus_size_class:
+        stmt = stmt.where(TelemetryEvent.habitus_size_class_final == habitus_size_class)
+    if since:
+        stmt = stmt.where(TelemetryEvent.timestamp >= since)
+    if until:
+        stmt = stmt.where(TelemetryEvent.timestamp < until)
+    if cursor:
+        stmt = stmt.where(
+            tuple_(TelemetryEvent.timestamp, TelemetryEvent.event_id)
+            < tuple_(*decode_cursor(cursor))
+        )
+
+    rows = list(await db.scalars(stmt))
+    if len(rows) <= safe_limit:
+        return rows, None
+    rows = rows[:safe_limit]
+    return rows, encode_cursor(rows[-1].timestamp, rows[-1].event_id)
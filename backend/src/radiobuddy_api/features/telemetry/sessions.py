@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import datetime as dt
+import uuid
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import and_, case, desc, func, or_, select
+from sqlalchemy.dialects.postgresql import Insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from radiobuddy_api.features.telemetry.models import TelemetrySession
+from radiobuddy_api.features.telemetry.schemas import TelemetryEventIn, TelemetrySessionOut
+
+
+def _empty_summary(session_id: uuid.UUID, procedure_id: str, now: dt.datetime) -> dict[str, Any]:
+    return {
+        "session_id": session_id,
+        "procedure_id": procedure_id,
+        "started_at": None,
+        "first_event_at": None,
+        "last_event_at": None,
+        "ready_at": None,
+        "ended_at": None,
+        "event_count": 0,
+        "prompt_counts": {},
+        "habitus_overridden": False,
+        "last_exposure": None,
+        "last_exposure_at": None,
+        "updated_at": now,
+    }
+
+
+def _earliest(a: dt.datetime | None, b: dt.datetime) -> dt.datetime:
+    return b if a is None or b < a else a
+
+
+def _latest(a: dt.datetime | None, b: dt.datetime) -> dt.datetime:
+    return b if a is None or b > a else a
+
+
+def summarize_events(events: Iterable[TelemetryEventIn], now: dt.datetime) -> list[dict[str, Any]]:
+    summaries: dict[uuid.UUID, dict[str, Any]] = {}
+    for event in events:
+        if event.session_id is None:
+            continue
+        summary = summaries.get(event.session_id)
+        if summary is None:
+            summary = summaries[event.session_id] = _empty_summary(
+                event.session_id, event.procedure_id, now
+            )
+        ts = event.timestamp
+        summary["event_count"] += 1
+        summary["first_event_at"] = _earliest(summary["first_event_at"], ts)
+        summary["last_event_at"] = _latest(summary["last_event_at"], ts)
+        if event.event_type == "session_start":
+            summary["started_at"] = _earliest(summary["started_at"], ts)
+        elif event.event_type == "ready_state_entered":
+            summary["ready_at"] = _earliest(summary["ready_at"], ts)
+        elif event.event_type == "session_end":
+            summary["ended_at"] = _latest(summary["ended_at"], ts)
+        elif event.event_type == "habitus_overridden":
+            summary["habitus_overridden"] = True
+        if event.event_type == "prompt_emitted" and event.prompt and event.prompt.rule_id:
+            counts = summary["prompt_counts"]
+            counts[event.prompt.rule_id] = counts.get(event.prompt.rule_id, 0) + 1
+        if event.exposure is not None and (
+            summary["last_exposure_at"] is None or ts >= summary["last_exposure_at"]
+        ):
+            summary["last_exposure"] = event.exposure.model_dump()
+            summary["last_exposure_at"] = ts
+    # A fixed lock order keeps concurrent batches touching the same sessions from deadlocking.
+    return [summaries[session_id] for session_id in sorted(summaries)]
+
+
+def session_upsert_statement(summaries: list[dict[str, Any]]) -> Insert:
+    table = TelemetrySession.__table__
+    stmt = pg_insert(table).values(summaries)
+    excluded = stmt.excluded
+    # Every merge is order-independent, so events may arrive late, out of order or split
+    # across batches (and even after session_end) and still produce the same row.
+    newer_exposure = and_(
+        excluded.last_exposure_at.is_not(None),
+        or_(
+            table.c.last_exposure_at.is_(None),
+            excluded.last_exposure_at >= table.c.last_exposure_at,
+        ),
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=["session_id"],
+        set_={
+            "started_at": func.least(table.c.started_at, excluded.started_at),
+            "first_event_at": func.least(table.c.first_event_at, excluded.first_event_at),
+            "last_event_at": func.greatest(table.c.last_event_at, excluded.last_event_at),
+            "ready_at": func.least(table.c.ready_at, excluded.ready_at),
+            "ended_at": func.greatest(table.c.ended_at, excluded.ended_at),
+            "event_count": table.c.event_count + excluded.event_count,
+            # Per-key sum of two {"key": count} objects (added with the rollup sketches).
+            "prompt_counts": func.telemetry_sketch_merge(
+                table.c.prompt_counts, excluded.prompt_counts
+            ),
+            "habitus_overridden": table.c.habitus_overridden | excluded.habitus_overridden,
+            "last_exposure": case(
+                (newer_exposure, excluded.last_exposure), else_=table.c.last_exposure
+            ),
+            "last_exposure_at": func.greatest(table.c.last_exposure_at, excluded.last_exposure_at),
+            "updated_at": excluded.updated_at,
+        },
+    )
+
+
+async def get_session_summary(db: AsyncSession, session_id: uuid.UUID) -> TelemetrySession | None:
+    return await db.get(TelemetrySession, session_id)
+
+
+async def list_session_summaries(
+    db: AsyncSession,
+    procedure_id: str | None = None,
+    since: dt.datetime | None = None,
+    until: dt.datetime | None = None,
+    limit: int = 100,
+) -> list[TelemetrySession]:
+    stmt = (
+        select(TelemetrySession)
+        .order_by(desc(TelemetrySession.first_event_at))
+        .limit(max(1, min(int(limit), 500)))
+    )
+    if procedure_id:
+        stmt = stmt.where(TelemetrySession.procedure_id == procedure_id)
+    if since:
+        stmt = stmt.where(TelemetrySession.first_event_at >= since)
+    if until:
+        stmt = stmt.where(TelemetrySession.first_event_at < until)
+    return list(await db.scalars(stmt))
+
+
+def to_session_out(row: TelemetrySession) -> TelemetrySessionOut:
+    # A session whose session_start was lost still has a usable origin.
+    origin = row.started_at or row.first_event_at
+    return TelemetrySessionOut(
+        session_id=row.session_id,
+        procedure_id=row.procedure_id,
+        status="ended" if row.ended_at else "active",
+        started_at=row.started_at,
+        first_event_at=row.first_event_at,
+        last_event_at=row.last_event_at,
+        ready_at=row.ready_at,
+        ended_at=row.ended_at,
+        seconds_to_ready=(row.ready_at - origin).total_seconds() if row.ready_at else None,
+        duration_seconds=(row.ended_at - origin).total_seconds() if row.ended_at else None,
+        event_count=row.event_count,
+        prompt_counts=row.prompt_counts,
+        habitus_overridden=row.habitus_overridden,
+        last_exposure=row.last_exposure,
+        last_exposure_at=row.last_exposure_at,
+    )
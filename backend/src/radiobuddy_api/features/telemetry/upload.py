@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import zlib
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+from pydantic import ValidationError
+
+from radiobuddy_api.features.telemetry.schemas import (
+    TelemetryEventIn,
+    TelemetryUploadLineError,
+    TelemetryUploadResult,
+)
+
+# Upper bound on bytes produced per decompress call, so a small, highly compressed body
+# cannot expand into one huge buffer.
+_DECOMPRESS_CHUNK_BYTES = 64 * 1024
+
+
+class TruncatedUploadError(Exception):
+    pass
+
+
+async def gunzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    # wbits=47 accepts gzip or zlib framing; concatenated gzip members are decoded in turn.
+    decompressor = zlib.decompressobj(wbits=47)
+    in_member = False
+    async for data in chunks:
+        while data:
+            in_member = True
+            try:
+                out = decompressor.decompress(data, _DECOMPRESS_CHUNK_BYTES)
+            except zlib.error as exc:
+                raise TruncatedUploadError("corrupt_gzip_stream") from exc
+            if out:
+                yield out
+            if decompressor.eof:
+                data = decompressor.unused_data
+                decompressor = zlib.decompressobj(wbits=47)
+                in_member = False
+            else:
+                data = decompressor.unconsumed_tail
+    if in_member:
+        raise TruncatedUploadError("truncated_gzip_stream")
+
+
+# Yields (start, end, line) with byte offsets into the stream; end is just past the newline.
+# line is None for a line longer than max_line_bytes, which is discarded as it streams in.
+async def ndjson_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[tuple[int, int, bytes | None]]:
+    buffer = bytearray()
+    buffer_offset = 0
+    line_start = 0
+    oversized = False
+    async for chunk in chunks:
+        buffer += chunk
+        while (newline := buffer.find(b"\n")) >= 0:
+            end = buffer_offset + newline + 1
+            yield line_start, end, None if oversized else bytes(buffer[:newline])
+            del buffer[: newline + 1]
+            buffer_offset = line_start = end
+            oversized = False
+        if len(buffer) > max_line_bytes:
+            buffer_offset += len(buffer)
+            buffer.clear()
+            oversized = True
+    if oversized or buffer:
+        yield line_start, buffer_offset + len(buffer), None if oversized else bytes(buffer)
+
+
+def _validation_errors(exc: ValidationError) -> list[dict[str, Any]]:
+    errors = exc.errors(include_url=False, include_context=False, include_input=False)
+    return [dict(error) for error in errors]
+
+
+async def ingest_ndjson(
+    chunks: AsyncIterator[bytes],
+    store: Callable[[list[TelemetryEventIn]], Awaitable[object]],
+    chunk_events: int,
+    max_line_bytes: int,
+    max_errors: int,
+    start_offset: int = 0,
+) -> TelemetryUploadResult:
+    result = TelemetryUploadResult(committed_offset=start_offset)
+    pending: list[TelemetryEventIn] = []
+    processed_offset = start_offset
+
+    async def flush() -> None:
+        if pending:
+            await store(pending)
+            result.accepted += len(pending)
+            pending.clear()
+        result.committed_offset = processed_offset
+
+    def reject(offset: int, errors: list[dict[str, Any]]) -> None:
+        result.rejected += 1
+        if len(result.errors) < max_errors:
+            result.errors.append(
+                TelemetryUploadLineError(line=result.lines, offset=offset, errors=errors)
+            )
+        else:
+            result.errors_truncated = True
+
+    try:
+        async for start, end, raw in ndjson_lines(chunks, max_line_bytes):
+            processed_offset = start_offset + end
+            if raw is not None and not raw.strip():
+                continue
+            result.lines += 1
+            if raw is None:
+                reject(start_offset + start, [{"type": "line_too_long"}])
+                continue
+            try:
+                pending.append(TelemetryEventIn.model_validate_json(raw))
+            except ValidationError as exc:
+                reject(start_offset + start, _validation_errors(exc))
+                continue
+            if len(pending) >= chunk_events:
+                await flush()
+    except TruncatedUploadError as exc:
+        # Lines before the cut were seen whole and are kept; a partial last line is not.
+        result.complete = False
+        result.detail = str(exc)
+    await flush()
+    return result
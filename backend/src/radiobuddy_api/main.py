@@ -1,16 +1,32 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from radiobuddy_api.features.ai_assist.client import (
+    close_inference_client,
+    start_inference_client,
+)
 from radiobuddy_api.features.ai_assist.router import router as ai_assist_router
 from radiobuddy_api.features.exposure_protocols.router import router as exposure_protocols_router
 from radiobuddy_api.features.health.router import router as health_router
+from radiobuddy_api.features.procedure_rules.registry import load_registry
 from radiobuddy_api.features.procedure_rules.router import router as procedure_rules_router
 from radiobuddy_api.features.site_presets.router import router as site_presets_router
+from radiobuddy_api.features.telemetry.buffer import start_write_buffer, stop_write_buffer
+from radiobuddy_api.features.telemetry.partitions import (
+    start_partition_maintenance,
+    stop_partition_maintenance,
+)
+from radiobuddy_api.features.telemetry.rollups import start_rollup_job, stop_rollup_job
 from radiobuddy_api.features.telemetry.router import router as telemetry_router
 from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.db.session import dispose_async_engine
 from radiobuddy_api.platform.error_handlers import (
     http_exception_handler,
     schema_validation_exception_handler,
@@ -22,12 +38,32 @@ from radiobuddy_api.platform.logging import configure_logging
 from radiobuddy_api.platform.middleware import RequestIdMiddleware
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    await start_inference_client()
+    start_write_buffer()
+    start_partition_maintenance()
+    start_rollup_job()
+    try:
+        yield
+    finally:
+        # These join background threads (the buffer also waits for queued telemetry to be
+        # written or spilled), so they run off the loop.
+        await asyncio.to_thread(stop_rollup_job)
+        await asyncio.to_thread(stop_partition_maintenance)
+        await asyncio.to_thread(stop_write_buffer)
+        await close_inference_client()
+        await dispose_async_engine()
+
+
 def create_app() -> FastAPI:
     configure_logging(settings.log_level)
+    load_registry()
 
     app = FastAPI(
         title="Radio Buddy API",
         version="0.1.0",
+        lifespan=lifespan,
     )
 
     app.add_middleware(RequestIdMiddleware)
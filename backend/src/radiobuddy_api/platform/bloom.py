@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = max(1, int(capacity))
+        error_rate = min(max(error_rate, 1e-12), 0.5)
+        self.num_bits = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: bytes) -> list[int]:
+        # Kirsch-Mitzenmacher double hashing over one 128-bit digest.
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key: bytes) -> None:
+        for p in self._positions(key):
+            self._bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+# Two generations of Bloom filters: once the current one holds `capacity` keys it becomes
+# the previous one and a fresh filter takes over, so memory stays bounded and the filter
+# remembers between `capacity` and 2 * `capacity` of the most recently added keys.
+class RotatingBloomFilter:
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = max(1, int(capacity))
+        # Each key is checked against both generations, so each gets half the error budget.
+        self.error_rate = error_rate / 2
+        self._current = BloomFilter(self.capacity, self.error_rate)
+        self._previous: BloomFilter | None = None
+        self._lock = threading.Lock()
+        self.rotations = 0
+
+    def __contains__(self, key: bytes) -> bool:
+        with self._lock:
+            return key in self._current or (self._previous is not None and key in self._previous)
+
+    def add(self, key: bytes) -> None:
+        with self._lock:
+            if self._current.count >= self.capacity:
+                self._previous = self._current
+                self._current = BloomFilter(self.capacity, self.error_rate)
+                self.rotations += 1
+            self._current.add(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._current = BloomFilter(self.capacity, self.error_rate)
+            self._previous = None
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,11 +15,64 @@ class Settings(BaseSettings):
     environment: str = "dev"
     log_level: str = "INFO"
     database_url: str | None = None
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout_seconds: float = 30.0
+    database_pool_recycle_seconds: int = -1
+    database_statement_timeout_ms: int | None = None
+    database_application_name: str = "radiobuddy-api"
+    database_disable_prepared_statements: bool = False
+    database_replica_url: str | None = None
+    database_replica_eject_seconds: float = 30.0
+    database_replica_max_lag_seconds: float = 5.0
     admin_api_key: str | None = None
     do_inference_enabled: bool = False
     do_model_access_key: str | None = None
     do_model_id: str = "llama3.3-70b-instruct"
     do_inference_timeout_seconds: float = 8.0
+    do_inference_connect_timeout_seconds: float = 3.0
+    do_inference_max_connections: int = 20
+    do_inference_max_keepalive_connections: int = 10
+    do_inference_keepalive_expiry_seconds: float = 60.0
+    do_inference_http2: bool = False
+    do_inference_cache_enabled: bool = True
+    do_inference_cache_resolution: float = 0.05
+    do_inference_cache_ttl_seconds: float = 30.0
+    do_inference_cache_max_entries: int = 4096
+    do_inference_singleflight_timeout_seconds: float = 10.0
+    do_inference_latency_budget_seconds: float = 2.5
+    do_inference_max_concurrency: int = 32
+    do_inference_breaker_window: int = 20
+    do_inference_breaker_min_calls: int = 10
+    do_inference_breaker_failure_rate: float = 0.5
+    do_inference_breaker_slow_call_seconds: float = 2.0
+    do_inference_breaker_open_seconds: float = 30.0
+    do_inference_batch_size: int = 16
+    do_inference_batch_concurrency: int = 4
+    exposure_protocol_cache_ttl_seconds: float = 30.0
+    exposure_protocol_cache_max_entries: int = 1024
+    telemetry_write_behind_enabled: bool = False
+    telemetry_buffer_max_events: int = 10_000
+    telemetry_buffer_flush_batch_size: int = 500
+    telemetry_buffer_flush_interval_seconds: float = 1.0
+    telemetry_buffer_overflow_policy: Literal["reject", "drop_oldest"] = "reject"
+    telemetry_buffer_spill_path: str | None = None
+    telemetry_buffer_max_backoff_seconds: float = 30.0
+    telemetry_dedupe_filter_enabled: bool = True
+    telemetry_dedupe_filter_capacity: int = 500_000
+    telemetry_dedupe_filter_error_rate: float = 1e-6
+    telemetry_partition_months_ahead: int = 3
+    telemetry_partition_maintenance_interval_seconds: float = 3600.0
+    telemetry_retention_months: int | None = None
+    telemetry_retention_action: Literal["drop", "detach"] = "drop"
+    telemetry_rollup_interval_seconds: float = 60.0
+    telemetry_rollup_lag_seconds: float = 60.0
+    telemetry_upload_chunk_events: int = 500
+    telemetry_upload_max_line_bytes: int = 64 * 1024
+    telemetry_upload_max_errors: int = 100
+    telemetry_export_dir: str | None = None
+    telemetry_export_chunk_rows: int = 10_000
+    telemetry_export_max_open_files: int = 64
 
 
 settings = Settings()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import Connection, Engine, event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.metrics import register_gauge
+from radiobuddy_api.platform.sketch import LogHistogram
+
+
+class CheckoutStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self._wait_ms = LogHistogram(0.01)
+
+    def record(self, wait_ms: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+            self._wait_ms.add(wait_ms)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def wait_ms_quantile(self, q: float) -> float:
+        with self._lock:
+            return self._wait_ms.quantile(q) or 0.0
+
+
+# Times every checkout: the wait for a free connection (or for opening a new one), which is
+# what grows first when workers outnumber the pool.
+class _TimedCheckout:
+    checkout_stats: CheckoutStats
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            self.checkout_stats.record_timeout()
+            raise
+        self.checkout_stats.record((time.perf_counter() - start) * 1000)
+        return connection
+
+
+sync_checkout_stats = CheckoutStats()
+async_checkout_stats = CheckoutStats()
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    checkout_stats = sync_checkout_stats
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    checkout_stats = async_checkout_stats
+
+
+def connect_args() -> dict[str, Any]:
+    args: dict[str, Any] = {"application_name": settings.database_application_name}
+    if settings.database_disable_prepared_statements:
+        # PgBouncer in transaction mode can route a prepared statement to another backend.
+        args["prepare_threshold"] = None
+    elif settings.database_statement_timeout_ms is not None:
+        args["options"] = f"-c statement_timeout={settings.database_statement_timeout_ms}"
+    return args
+
+
+# Behind PgBouncer in transaction mode a startup `options` parameter is rejected (or dropped
+# via ignore_startup_parameters) and session settings do not stay with one server backend,
+# so the timeout is set per transaction instead, at the cost of one extra statement.
+def apply_statement_timeout(engine: Engine) -> None:
+    timeout_ms = settings.database_statement_timeout_ms
+    if timeout_ms is None or not settings.database_disable_prepared_statements:
+        return
+
+    def set_local_timeout(conn: Connection) -> None:
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+    event.listen(engine, "begin", set_local_timeout)
+
+
+def engine_options() -> dict[str, Any]:
+    return {
+        "pool_pre_ping": True,
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": settings.database_pool_timeout_seconds,
+        "pool_recycle": settings.database_pool_recycle_seconds,
+        "connect_args": connect_args(),
+    }
+
+
+def register_pool_gauges(
+    prefix: str, current_pool: Callable[[], Pool | None], stats: CheckoutStats
+) -> None:
+    def read(attribute: str) -> Callable[[], int]:
+        def gauge() -> int:
+            pool = current_pool()
+            if not isinstance(pool, QueuePool):
+                return 0
+            # overflow() counts down from -pool_size until the pool is full.
+            return max(0, getattr(pool, attribute)())
+
+        return gauge
+
+    register_gauge(f"{prefix}.size", read("size"))
+    register_gauge(f"{prefix}.in_use", read("checkedout"))
+    register_gauge(f"{prefix}.idle", read("checkedin"))
+    register_gauge(f"{prefix}.overflow", read("overflow"))
+    register_gauge(f"{prefix}.checkouts", lambda: stats.checkouts)
+    register_gauge(f"{prefix}.checkout_timeouts", lambda: stats.timeouts)
+    register_gauge(f"{prefix}.checkout_wait_ms_total", lambda: stats.wait_ms_total)
+    register_gauge(f"{prefix}.checkout_wait_ms_max", lambda: stats.wait_ms_max)
+    register_gauge(f"{prefix}.checkout_wait_ms_p99", lambda: stats.wait_ms_quantile(0.99))
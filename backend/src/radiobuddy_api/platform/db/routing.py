@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from sqlalchemy import Engine, Select, event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger("radiobuddy_api.db.routing")
+
+
+# Round-robin over replica engines. A replica whose connections fail is skipped for
+# `eject_seconds`, then tried again; with every replica ejected, reads go to the primary.
+class ReplicaSet:
+    def __init__(
+        self,
+        engines: Sequence[AsyncEngine],
+        eject_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.engines = list(engines)
+        self.eject_seconds = eject_seconds
+        self.ejections = 0
+        self._clock = clock
+        self._ejected_until: dict[int, float] = {}
+        self._order = itertools.cycle(range(len(self.engines)))
+        self._lock = threading.Lock()
+        for index, engine in enumerate(self.engines):
+            event.listen(engine.sync_engine, "handle_error", self._error_listener(index))
+
+    @property
+    def healthy(self) -> int:
+        now = self._clock()
+        with self._lock:
+            return sum(
+                1 for index in range(len(self.engines)) if self._ejected_until.get(index, 0) <= now
+            )
+
+    def choose(self) -> AsyncEngine | None:
+        now = self._clock()
+        with self._lock:
+            for _ in range(len(self.engines)):
+                index = next(self._order)
+                if self._ejected_until.get(index, 0) <= now:
+                    return self.engines[index]
+        return None
+
+    def eject(self, index: int) -> None:
+        with self._lock:
+            self._ejected_until[index] = self._clock() + self.eject_seconds
+            self.ejections += 1
+        logger.warning("ejecting read replica %d for %.0fs", index, self.eject_seconds)
+
+    def _error_listener(self, index: int) -> Callable[[ExceptionContext], None]:
+        def on_error(context: ExceptionContext) -> None:
+            # Lost connections and failed connects; query errors say nothing about health.
+            if context.is_disconnect or context.connection is None:
+                self.eject(index)
+
+        return on_error
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+
+# Sync session class behind every AsyncSession from get_db. Plain SELECTs go to a replica;
+# anything else goes to the primary and pins the rest of the session there, so reads that
+# follow a write in the same request see it.
+class RoutingSession(Session):
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Engine:
+        replicas: ReplicaSet | None = self.info.get("replicas")
+        if replicas is not None and not self.info.get("force_primary"):
+            if not self._flushing and isinstance(clause, Select) and clause._for_update_arg is None:
+                replica = replicas.choose()
+                if replica is not None:
+                    return replica.sync_engine
+            else:
+                self.info["force_primary"] = True
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+def use_primary(db: AsyncSession) -> AsyncSession:
+    db.info["force_primary"] = True
+    return db
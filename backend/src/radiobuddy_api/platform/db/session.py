@@ -1,12 +1,29 @@
 from __future__ import annotations
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator
 
 from fastapi import HTTPException
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
 
 from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.db.pool import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    apply_statement_timeout,
+    async_checkout_stats,
+    engine_options,
+    register_pool_gauges,
+    sync_checkout_stats,
+)
+from radiobuddy_api.platform.db.routing import ReplicaSet, RoutingSession
+from radiobuddy_api.platform.metrics import register_gauge
 
 
 def _require_database_url() -> str:
@@ -18,6 +35,8 @@ def _require_database_url() -> str:
     return settings.database_url
 
 
+# The sync engine serves background jobs, the write-behind buffer thread and scripts;
+# request handlers use the async engine below.
 _engine = None
 _SessionLocal = None
 
@@ -26,18 +45,88 @@ def get_engine():
     global _engine, _SessionLocal
     if _engine is None:
         database_url = _require_database_url()
-        _engine = create_engine(database_url, pool_pre_ping=True)
+        _engine = create_engine(database_url, poolclass=InstrumentedQueuePool, **engine_options())
+        apply_statement_timeout(_engine)
         _SessionLocal = sessionmaker(bind=_engine, autoflush=False, autocommit=False)
     return _engine
 
 
-def get_db() -> Generator[Session, None, None]:
+def get_sessionmaker() -> sessionmaker[Session]:
     if _SessionLocal is None:
         get_engine()
     assert _SessionLocal is not None
+    return _SessionLocal
 
-    db: Session = _SessionLocal()
-    try:
+
+_async_engine: AsyncEngine | None = None
+_AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+_replicas: ReplicaSet | None = None
+
+
+def _create_async_engine(database_url: str) -> AsyncEngine:
+    # A postgresql+psycopg URL resolves to psycopg's async driver here.
+    engine = create_async_engine(
+        database_url, poolclass=InstrumentedAsyncQueuePool, **engine_options()
+    )
+    apply_statement_timeout(engine.sync_engine)
+    return engine
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine, _AsyncSessionLocal, _replicas
+    if _async_engine is None:
+        database_url = _require_database_url()
+        _async_engine = _create_async_engine(database_url)
+        replica_urls = [
+            url.strip() for url in (settings.database_replica_url or "").split(",") if url.strip()
+        ]
+        if replica_urls:
+            _replicas = ReplicaSet(
+                [_create_async_engine(url) for url in replica_urls],
+                eject_seconds=settings.database_replica_eject_seconds,
+            )
+        # Loaded attributes stay usable after commit instead of triggering implicit IO.
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=_async_engine,
+            sync_session_class=RoutingSession,
+            info={"replicas": _replicas},
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_engine
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    if _AsyncSessionLocal is None:
+        get_async_engine()
+    assert _AsyncSessionLocal is not None
+    return _AsyncSessionLocal
+
+
+# Each engine has its own pool, so a worker may hold up to
+# 2 * (database_pool_size + database_max_overflow) connections.
+register_pool_gauges("db.pool.sync", lambda: _engine.pool if _engine else None, sync_checkout_stats)
+register_pool_gauges(
+    "db.pool.async",
+    lambda: _async_engine.pool if _async_engine else None,
+    async_checkout_stats,
+)
+register_gauge("db.replicas.configured", lambda: len(_replicas.engines) if _replicas else 0)
+register_gauge("db.replicas.healthy", lambda: _replicas.healthy if _replicas else 0)
+register_gauge("db.replicas.ejections", lambda: _replicas.ejections if _replicas else 0)
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_sessionmaker()() as db:
         yield db
-    finally:
-        db.close()
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _AsyncSessionLocal, _replicas
+    if _replicas is not None:
+        await _replicas.dispose()
+        _replicas = None
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _AsyncSessionLocal = None
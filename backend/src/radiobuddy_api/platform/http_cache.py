@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+from dataclasses import dataclass
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import cached_property
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import Response
+
+
+def render_json(payload: Any) -> bytes:
+    # Same encoding JSONResponse uses, so cached bytes match freshly rendered responses.
+    return json.dumps(
+        payload,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def strong_etag(*parts: bytes | str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8") if isinstance(part, str) else part)
+        digest.update(b"\x00")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+@dataclass(frozen=True)
+class JsonDocument:
+    payload: Any
+    etag: str
+    last_modified: dt.datetime
+
+    @cached_property
+    def body(self) -> bytes:
+        return render_json(self.payload)
+
+
+def content_document(payload: Any, last_modified: dt.datetime) -> JsonDocument:
+    return JsonDocument(
+        payload=payload,
+        etag=strong_etag(render_json(payload)),
+        last_modified=last_modified,
+    )
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        # If-None-Match uses the weak comparison function (RFC 9110 13.1.2).
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _not_modified_since(if_modified_since: str, last_modified: dt.datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=dt.timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def _validator_headers(document: JsonDocument) -> dict[str, str]:
+    last_modified = document.last_modified.astimezone(dt.timezone.utc)
+    return {
+        "ETag": document.etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+
+def is_not_modified(request: Request, document: JsonDocument) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, document.etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        return _not_modified_since(if_modified_since, document.last_modified)
+
+    return False
+
+
+def conditional_json_response(request: Request, document: JsonDocument) -> Response:
+    headers = _validator_headers(document)
+    if is_not_modified(request, document):
+        return Response(status_code=304, headers=headers)
+    return Response(content=document.body, media_type="application/json", headers=headers)
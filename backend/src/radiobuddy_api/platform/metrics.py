@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+
+_gauges: dict[str, Callable[[], float | int]] = {}
+_lock = threading.Lock()
+
+
+def register_gauge(name: str, read: Callable[[], float | int]) -> None:
+    with _lock:
+        _gauges[name] = read
+
+
+def snapshot() -> dict[str, float | int]:
+    with _lock:
+        gauges = dict(_gauges)
+    return {name: read() for name, read in sorted(gauges.items())}
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+
+logger = logging.getLogger("radiobuddy_api.periodic")
+
+
+# Runs `job` on a daemon thread right away and then every `interval_seconds` until stopped.
+class PeriodicTask:
+    def __init__(self, name: str, interval_seconds: float, job: Callable[[], object]) -> None:
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self._job = job
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 10) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self._job()
+            except Exception:
+                logger.exception("periodic task %s failed", self.name)
+            if self._stop.wait(self.interval_seconds):
+                return
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+
+# Values at or below this land in the zero bucket.
+_MIN_VALUE = 1e-9
+_ZERO_KEY = "z"
+
+
+# Mergeable quantile sketch with bounded relative error (DDSketch-style): each positive value
+# goes to the logarithmic bucket ceil(log_gamma(v)), so any quantile is answered within
+# `relative_accuracy` of the true value and two sketches merge by adding bucket counts.
+# Serialized as a flat {"<bucket>": count, "z": zero_count} mapping so Postgres can merge
+# stored sketches with a plain per-key sum.
+class LogHistogram:
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: defaultdict[int, int] = defaultdict(int)
+        self.zero_count = 0
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.buckets.values())
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value <= _MIN_VALUE:
+            self.zero_count += count
+        else:
+            self.buckets[math.ceil(math.log(value) / self._log_gamma)] += count
+
+    def merge(self, other: LogHistogram) -> None:
+        if other.gamma != self.gamma:
+            raise ValueError("cannot merge sketches with different relative accuracy")
+        self.zero_count += other.zero_count
+        for index, count in other.buckets.items():
+            self.buckets[index] += count
+
+    def quantile(self, q: float) -> float | None:
+        total = self.count
+        if total == 0:
+            return None
+        rank = min(max(q, 0.0), 1.0) * (total - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Midpoint of the bucket (gamma^(i-1), gamma^i] in relative terms.
+                return 2 * self.gamma**index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_json(self) -> dict[str, int]:
+        data = {str(index): count for index, count in self.buckets.items() if count}
+        if self.zero_count:
+            data[_ZERO_KEY] = self.zero_count
+        return data
+
+    @classmethod
+    def from_json(
+        cls, data: dict[str, int] | None, relative_accuracy: float = 0.01
+    ) -> LogHistogram:
+        sketch = cls(relative_accuracy)
+        for key, count in (data or {}).items():
+            if key == _ZERO_KEY:
+                sketch.zero_count += int(count)
+            else:
+                sketch.buckets[int(key)] += int(count)
+        return sketch
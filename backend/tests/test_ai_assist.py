@@ -93,3 +93,282 @@ def test_ai_assist_local_when_remote_disabled(monkeypatch) -> None:
     assert response.status_code == 200
     data = response.json()
     assert data["source"] == "local"
+
+
+def test_local_instructions_vectorized_matches_scalar() -> None:
+    import random
+
+    from radiobuddy_api.features.ai_assist import service
+    from radiobuddy_api.features.ai_assist.schemas import AiAssistAnalyzeIn
+
+    rng = random.Random(7)
+    payloads = [
+        AiAssistAnalyzeIn(
+            procedure_id="chest_pa",
+            stage_id="coarse",
+            metrics={m: rng.random() for m in service._LOCAL_METRICS if rng.random() > 0.1},
+        )
+        for _ in range(500)
+    ]
+
+    assert service._local_instructions(payloads) == [
+        service._local_instruction(p) for p in payloads
+    ]
+
+
+def test_ai_assist_batch_groups_remote_calls(monkeypatch) -> None:
+    from radiobuddy_api.features.ai_assist import service
+
+    calls: list[int] = []
+
+    async def fake_batch(payloads):
+        calls.append(len(payloads))
+        if len(calls) == 2:
+            raise RuntimeError("boom")
+        return [f"remote {p.stage_id}" for p in payloads]
+
+    monkeypatch.setattr(service.settings, "do_inference_enabled", True)
+    monkeypatch.setattr(service.settings, "do_model_access_key", "test_key")
+    monkeypatch.setattr(service.settings, "do_inference_batch_size", 2)
+    monkeypatch.setattr(service, "_do_inference_batch", fake_batch)
+    service._instruction_cache.clear()
+
+    client = TestClient(app)
+    items = [
+        {"procedure_id": "chest_pa", "stage_id": stage, "metrics": {"pose_confidence": 0.2}}
+        for stage in ["a", "b", "a", "c"]
+    ]
+    response = client.post("/ai/positioning/analyze:batch", json={"items": items})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert sorted(calls) == [1, 2]
+    assert [r["source"] for r in results] == [
+        "do_inference",
+        "do_inference",
+        "do_inference",
+        "do_inference_fallback",
+    ]
+    assert results[0]["instruction"] == results[2]["instruction"] == "remote a"
+    assert results[3]["instruction"] == "Step back and keep full torso in view."
+
+
+def test_ai_assist_batch_caps_concurrent_remote_calls(monkeypatch) -> None:
+    import asyncio
+
+    from radiobuddy_api.features.ai_assist import service
+
+    in_flight = peak = 0
+
+    async def fake_batch(payloads):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [f"remote {p.stage_id}" for p in payloads]
+
+    monkeypatch.setattr(service.settings, "do_inference_enabled", True)
+    monkeypatch.setattr(service.settings, "do_model_access_key", "test_key")
+    monkeypatch.setattr(service.settings, "do_inference_batch_size", 1)
+    monkeypatch.setattr(service.settings, "do_inference_batch_concurrency", 2)
+    monkeypatch.setattr(service, "_do_inference_batch", fake_batch)
+    service._instruction_cache.clear()
+
+    items = [
+        {"procedure_id": "chest_pa", "stage_id": f"s{index}", "metrics": {}} for index in range(8)
+    ]
+    response = TestClient(app).post("/ai/positioning/analyze:batch", json={"items": items})
+
+    assert response.status_code == 200
+    assert {r["source"] for r in response.json()["results"]} == {"do_inference"}
+    assert peak == 2
+    service._instruction_cache.clear()
+
+
+def test_ai_assist_batch_local(monkeypatch) -> None:
+    from radiobuddy_api.features.ai_assist import service
+
+    monkeypatch.setattr(service.settings, "do_inference_enabled", False)
+
+    client = TestClient(app)
+    items = [
+        {"procedure_id": "chest_pa", "stage_id": "coarse", "metrics": {"pose_confidence": 0.2}},
+        {
+            "procedure_id": "chest_pa",
+            "stage_id": "coarse",
+            "metrics": {"pose_confidence": 0.9, "framing_score": 0.9},
+        },
+    ]
+    response = client.post("/ai/positioning/analyze:batch", json={"items": items})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["source"] for r in results] == ["local", "local"]
+    assert results[1]["instruction"] == "Positioning looks good. Hold still."
+
+
+def test_ai_assist_accepts_non_finite_metrics(monkeypatch) -> None:
+    from radiobuddy_api.features.ai_assist import service
+
+    async def fake_remote(payload):
+        return "Remote instruction."
+
+    monkeypatch.setattr(service.settings, "do_inference_enabled", True)
+    monkeypatch.setattr(service.settings, "do_model_access_key", "test_key")
+    monkeypatch.setattr(service, "_do_inference_instruction", fake_remote)
+    service._instruction_cache.clear()
+
+    client = TestClient(app)
+    body = (
+        '{"procedure_id": "chest_pa", "stage_id": "fine", '
+        '"metrics": {"rotation_risk": NaN, "pose_confidence": Infinity}}'
+    )
+    headers = {"Content-Type": "application/json"}
+    first = client.post("/ai/positioning/analyze", content=body, headers=headers)
+    second = client.post("/ai/positioning/analyze", content=body, headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    # Non-finite values still key the cache consistently.
+    assert (first.json()["cached"], second.json()["cached"]) == (False, True)
+    service._instruction_cache.clear()
+
+
+def test_inference_client_is_shared_across_lifespan(monkeypatch) -> None:
+    from radiobuddy_api.features.ai_assist import client as inference_client
+
+    monkeypatch.setattr(inference_client.settings, "do_inference_http2", True)
+    monkeypatch.setattr(inference_client.settings, "do_inference_connect_timeout_seconds", 1.5)
+
+    with TestClient(app):
+        shared = inference_client.get_inference_client()
+        assert inference_client.get_inference_client() is shared
+        assert shared.timeout.connect == 1.5
+        assert shared.timeout.read == inference_client.settings.do_inference_timeout_seconds
+    assert shared.is_closed
+    assert inference_client._client is None
+
+
+def test_ai_assist_caches_remote_instruction_by_metric_bucket(monkeypatch) -> None:
+    from radiobuddy_api.features.ai_assist import service
+
+    calls: list[dict] = []
+
+    async def fake_remote(payload):
+        calls.append(payload.metrics)
+        return "Remote instruction."
+
+    monkeypatch.setattr(service.settings, "do_inference_enabled", True)
+    monkeypatch.setattr(service.settings, "do_model_access_key", "test_key")
+    monkeypatch.setattr(service.settings, "do_inference_cache_resolution", 0.05)
+    monkeypatch.setattr(service, "_do_inference_instruction", fake_remote)
+    service._instruction_cache.clear()
+
+    client = TestClient(app)
+    base = {"procedure_id": "chest_pa", "stage_id": "fine"}
+    first = client.post(
+        "/ai/positioning/analyze", json=base | {"metrics": {"rotation_risk": 0.301}}
+    ).json()
+    second = client.post(
+        "/ai/positioning/analyze", json=base | {"metrics": {"rotation_risk": 0.309}}
+    ).json()
+    third = client.post(
+        "/ai/positioning/analyze", json=base | {"metrics": {"rotation_risk": 0.5}}
+    ).json()
+
+    assert len(calls) == 2
+    assert (first["cached"], second["cached"], third["cached"]) == (False, True, False)
+    assert second["instruction"] == "Remote instruction."
+
+    metrics = client.get("/metrics").json()
+    assert metrics["ai_assist.instruction_cache.hits"] >= 1
+    assert metrics["ai_assist.instruction_cache.misses"] >= 2
+    service._instruction_cache.clear()
+
+
+def test_live_session_pushes_only_changed_instructions(monkeypatch) -> None:
+    from radiobuddy_api.features.ai_assist import service
+
+    monkeypatch.setattr(service.settings, "do_inference_enabled", False)
+
+    good = {"pose_confidence": 0.9, "framing_score": 0.9}
+    client = TestClient(app)
+    with client.websocket_connect("/ai/positioning/live?procedure_id=chest_pa") as ws:
+        ws.send_json({"stage_id": "coarse", "metrics": {"pose_confidence": 0.2}})
+        first = ws.receive_json()
+        assert first["type"] == "instruction"
+        assert first["instruction"] == "Step back and keep full torso in view."
+
+        ws.send_json({"stage_id": "coarse", "metrics": {"pose_confidence": 0.3}})
+        ws.send_json({"stage_id": "coarse", "metrics": {"bad": "value"}})
+        assert ws.receive_json() == {"type": "error", "detail": "invalid_frame"}
+
+        ws.send_json({"stage_id": "fine", "metrics": good})
+        second = ws.receive_json()
+        assert second["instruction"] == "Positioning looks good. Hold still."
+        assert second["stage_id"] == "fine"
+
+
+def test_live_session_survives_malformed_frame(monkeypatch) -> None:
+    from radiobuddy_api.features.ai_assist import service
+
+    monkeypatch.setattr(service.settings, "do_inference_enabled", False)
+
+    client = TestClient(app)
+    with client.websocket_connect("/ai/positioning/live?procedure_id=chest_pa") as ws:
+        ws.send_text("{not json")
+        assert ws.receive_json() == {"type": "error", "detail": "invalid_frame"}
+
+        ws.send_json({"stage_id": "coarse", "metrics": {"pose_confidence": 0.2}})
+        assert ws.receive_json()["type"] == "instruction"
+
+
+def test_latest_frame_slot_drops_stale_frames() -> None:
+    import asyncio
+
+    from radiobuddy_api.features.ai_assist.live import LatestFrameSlot
+
+    async def run() -> tuple[object, object, int]:
+        slot = LatestFrameSlot()
+        for index in range(5):
+            slot.put(index)
+        latest = await slot.take()
+        slot.close()
+        return latest, await slot.take(), slot.dropped
+
+    assert asyncio.run(run()) == (4, None, 4)
+
+
+def test_live_session_rejects_binary_frame(monkeypatch) -> None:
+    from radiobuddy_api.features.ai_assist import service
+
+    monkeypatch.setattr(service.settings, "do_inference_enabled", False)
+
+    client = TestClient(app)
+    with client.websocket_connect("/ai/positioning/live?procedure_id=chest_pa") as ws:
+        ws.send_bytes(b"\x00\x01")
+        assert ws.receive_json() == {"type": "error", "detail": "invalid_frame"}
+
+        ws.send_json({"stage_id": "coarse", "metrics": {"pose_confidence": 0.2}})
+        assert ws.receive_json()["type"] == "instruction"
+
+
+def test_live_session_closes_when_receiver_fails(monkeypatch) -> None:
+    import pytest
+    from starlette.websockets import WebSocket, WebSocketDisconnect
+
+    receive = WebSocket.receive
+
+    async def broken_receive(self):
+        # accept() reads the connect message; fail on the first frame after it.
+        if self.client_state.name == "CONNECTING":
+            return await receive(self)
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(WebSocket, "receive", broken_receive)
+
+    client = TestClient(app)
+    with client.websocket_connect("/ai/positioning/live?procedure_id=chest_pa") as ws:
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            ws.receive_json()
+    assert exc_info.value.code == 1011
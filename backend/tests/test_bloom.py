@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import uuid
+
+from radiobuddy_api.platform.bloom import BloomFilter, RotatingBloomFilter
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [uuid.uuid4().bytes for _ in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(uuid.uuid4().bytes in bloom for _ in range(10_000))
+    assert false_positives < 300
+
+
+def test_rotating_filter_forgets_old_generations() -> None:
+    bloom = RotatingBloomFilter(capacity=2, error_rate=1e-9)
+    keys = [bytes([i]) * 16 for i in range(6)]
+    for key in keys[:4]:
+        bloom.add(key)
+    assert all(key in bloom for key in keys[:4])
+
+    bloom.add(keys[4])
+    bloom.add(keys[5])
+    assert bloom.rotations == 2
+    assert keys[0] not in bloom
+    assert keys[4] in bloom and keys[5] in bloom
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+
+from radiobuddy_api.platform.cache import MISSING, TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires_entries() -> None:
+    clock = FakeClock()
+    cache = TTLCache(max_entries=4, ttl_seconds=10, clock=clock)
+    cache.set("a", None)
+
+    assert cache.get("a") is None
+    clock.now = 11
+    assert cache.get("a") is MISSING
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_room_protocol_lookup_is_cached_and_invalidated(monkeypatch) -> None:
+    from radiobuddy_api.features.exposure_protocols import service
+
+    updated_at = dt.datetime(2026, 1, 1, tzinfo=dt.timezone.utc)
+    payload = service.get_chest_pa_protocol() | {"protocol_id": "room_override"}
+    calls: list[dict] = []
+
+    class FakeRow:
+        site_id = "site"
+        room_id = "room"
+        procedure_id = "chest_pa_erect"
+
+        def __init__(self) -> None:
+            self.payload = payload
+            self.updated_at = updated_at
+
+    class FakeSession:
+        def __init__(self) -> None:
+            self.info: dict = {}
+
+        async def __aenter__(self) -> FakeSession:
+            return self
+
+        async def __aexit__(self, *exc) -> None:
+            return None
+
+        async def get(self, model, key):
+            calls.append(key | {"primary": self.info.get("force_primary", False)})
+            return FakeRow() if key["room_id"] == "room" else None
+
+    monkeypatch.setattr(service.settings, "database_url", "postgresql+psycopg://unused")
+    monkeypatch.setattr(service, "get_async_sessionmaker", lambda: FakeSession)
+    service._room_protocol_cache.clear()
+    service._recent_writes.clear()
+
+    for _ in range(3):
+        doc = asyncio.run(service.get_protocol_document("chest-pa", site_id="site", room_id="room"))
+        assert doc.payload["protocol_id"] == "room_override"
+        fallback = asyncio.run(
+            service.get_protocol_document("chest-pa", site_id="site", room_id="other")
+        )
+        assert fallback is service.get_chest_pa_protocol_document()
+    assert len(calls) == 2
+
+    service.invalidate_room_protocol("site", "room", "chest_pa_erect")
+    asyncio.run(service.get_protocol_document("chest_pa_erect", site_id="site", room_id="room"))
+    assert len(calls) == 3
+    # Just written: read from the primary rather than a possibly lagging replica.
+    assert [call["primary"] for call in calls] == [False, False, True]
+    service._room_protocol_cache.clear()
+    service._recent_writes.clear()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from radiobuddy_api.main import app
+from radiobuddy_api.platform.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    Bulkhead,
+    CircuitBreaker,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(clock: FakeClock) -> CircuitBreaker:
+    return CircuitBreaker(
+        window_size=4,
+        min_calls=4,
+        failure_rate_threshold=0.5,
+        slow_call_seconds=1.0,
+        open_seconds=10,
+        clock=clock,
+    )
+
+
+def test_breaker_trips_on_failures_and_slow_calls() -> None:
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    breaker.record_success(0.1)
+    breaker.record_success(0.1)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.record_success(5.0)
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+
+def test_breaker_half_open_probe_closes_or_reopens() -> None:
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 11
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 22
+    assert breaker.allow_request()
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+
+
+def test_bulkhead_rejects_when_full() -> None:
+    bulkhead = Bulkhead(1)
+    assert bulkhead.try_acquire()
+    assert not bulkhead.try_acquire()
+    bulkhead.release()
+    assert bulkhead.try_acquire()
+    assert bulkhead.rejected == 1
+
+
+def _payload(stage_id: str) -> dict:
+    metrics = {"pose_confidence": 0.9, "framing_score": 0.9, "tilt_risk": 0.9}
+    return {"procedure_id": "chest_pa", "stage_id": stage_id, "metrics": metrics}
+
+
+def test_open_breaker_short_circuits_to_local(monkeypatch) -> None:
+    from radiobuddy_api.features.ai_assist import service
+
+    calls = 0
+
+    async def remote(payload):
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("down")
+
+    breaker = _breaker(FakeClock())
+    monkeypatch.setattr(service, "_breaker", breaker)
+    monkeypatch.setattr(service.settings, "do_inference_enabled", True)
+    monkeypatch.setattr(service.settings, "do_model_access_key", "test_key")
+    monkeypatch.setattr(service, "_do_inference_instruction", remote)
+
+    client = TestClient(app)
+    for index in range(6):
+        data = client.post("/ai/positioning/analyze", json=_payload(f"s{index}")).json()
+        assert data["source"] == "do_inference_fallback"
+        assert data["instruction"] == "Straighten up to reduce lateral tilt."
+
+    assert calls == 4
+    assert breaker.state == OPEN
+
+
+def test_latency_budget_returns_local_and_cancels_remote(monkeypatch) -> None:
+    from radiobuddy_api.features.ai_assist import service
+
+    cancelled = []
+
+    async def slow_remote(payload):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "too late"
+
+    monkeypatch.setattr(service, "_breaker", _breaker(FakeClock()))
+    monkeypatch.setattr(service.settings, "do_inference_enabled", True)
+    monkeypatch.setattr(service.settings, "do_model_access_key", "test_key")
+    monkeypatch.setattr(service.settings, "do_inference_latency_budget_seconds", 0.05)
+    monkeypatch.setattr(service, "_do_inference_instruction", slow_remote)
+
+    client = TestClient(app)
+    start = time.monotonic()
+    data = client.post("/ai/positioning/analyze", json=_payload("budget")).json()
+
+    assert time.monotonic() - start < 2
+    assert data["source"] == "do_inference_fallback"
+    assert cancelled == [True]
+    assert service._bulkhead.in_use == 0
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from radiobuddy_api.main import app
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["/procedure-rules/chest-pa", "/exposure-protocols/chest-pa", "/exposure-protocols/chest_pa"],
+)
+def test_documents_carry_validators(path: str) -> None:
+    client = TestClient(app)
+    resp = client.get(path)
+    assert resp.status_code == 200
+    assert resp.headers["etag"].startswith('"')
+    assert resp.headers["last-modified"].endswith("GMT")
+
+
+@pytest.mark.parametrize("path", ["/procedure-rules/chest-pa", "/exposure-protocols/chest-pa"])
+def test_if_none_match_returns_304(path: str) -> None:
+    client = TestClient(app)
+    etag = client.get(path).headers["etag"]
+
+    resp = client.get(path, headers={"If-None-Match": f'"other", W/{etag}'})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+
+    resp = client.get(path, headers={"If-None-Match": '"stale"'})
+    assert resp.status_code == 200
+    assert resp.json()["procedure_id"] == "chest_pa_erect"
+
+
+def test_if_modified_since_returns_304() -> None:
+    client = TestClient(app)
+    last_modified = client.get("/procedure-rules/chest-pa").headers["last-modified"]
+
+    resp = client.get("/procedure-rules/chest-pa", headers={"If-Modified-Since": last_modified})
+    assert resp.status_code == 304
+
+    resp = client.get(
+        "/procedure-rules/chest-pa",
+        headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"},
+    )
+    assert resp.status_code == 200
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, exc
+
+from radiobuddy_api.platform import metrics
+from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.db.pool import (
+    InstrumentedQueuePool,
+    apply_statement_timeout,
+    connect_args,
+    register_pool_gauges,
+    sync_checkout_stats,
+)
+
+
+def test_connect_args_follow_settings(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "database_application_name", "radiobuddy-worker")
+    monkeypatch.setattr(settings, "database_statement_timeout_ms", 5000)
+    monkeypatch.setattr(settings, "database_disable_prepared_statements", False)
+
+    # Direct connection: the timeout is a startup parameter.
+    assert connect_args() == {
+        "application_name": "radiobuddy-worker",
+        "options": "-c statement_timeout=5000",
+    }
+    engine = create_engine("sqlite://")
+    apply_statement_timeout(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("SELECT 1")
+
+    # PgBouncer transaction pooling: no `options`; SET LOCAL in every transaction instead.
+    monkeypatch.setattr(settings, "database_disable_prepared_statements", True)
+    assert connect_args() == {"application_name": "radiobuddy-worker", "prepare_threshold": None}
+    engine = create_engine("sqlite://")
+    apply_statement_timeout(engine)
+    # SQLite has no SET LOCAL; the failing statement shows it ran at transaction start.
+    with pytest.raises(exc.OperationalError, match="SET LOCAL statement_timeout = 5000"):
+        with engine.begin():
+            pass
+
+
+def test_pool_gauges_track_checkouts_and_timeouts(tmp_path) -> None:
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    register_pool_gauges("test.pool", lambda: engine.pool, sync_checkout_stats)
+    checkouts, timeouts = sync_checkout_stats.checkouts, sync_checkout_stats.timeouts
+
+    with engine.connect():
+        snapshot = metrics.snapshot()
+        assert snapshot["test.pool.in_use"] == 1
+        assert snapshot["test.pool.idle"] == 0
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+    engine.dispose()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["test.pool.checkouts"] == checkouts + 1
+    assert snapshot["test.pool.checkout_timeouts"] == timeouts + 1
+    assert snapshot["test.pool.in_use"] == 0
+    assert snapshot["test.pool.checkout_wait_ms_max"] >= 0
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, exc, insert, select
+
+from radiobuddy_api.features.site_presets.models import Site
+from radiobuddy_api.platform.db.routing import ReplicaSet, RoutingSession
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _replica(url: str = "sqlite://"):
+    # ReplicaSet only needs the sync side of an AsyncEngine.
+    return SimpleNamespace(sync_engine=create_engine(url))
+
+
+def test_replicas_round_robin_and_eject() -> None:
+    clock = FakeClock()
+    first, second = _replica(), _replica()
+    replicas = ReplicaSet([first, second], eject_seconds=30, clock=clock)
+
+    assert [replicas.choose() for _ in range(4)] == [first, second, first, second]
+    replicas.eject(0)
+    assert [replicas.choose() for _ in range(2)] == [second, second]
+    replicas.eject(1)
+    assert replicas.choose() is None
+    assert replicas.healthy == 0
+
+    clock.now = 31
+    assert replicas.healthy == 2
+    assert replicas.ejections == 2
+
+
+def test_failed_connect_ejects_replica(tmp_path) -> None:
+    broken = _replica(f"sqlite:///{tmp_path / 'missing' / 'db.sqlite'}")
+    replicas = ReplicaSet([broken], eject_seconds=30)
+
+    with pytest.raises(exc.OperationalError):
+        broken.sync_engine.connect()
+
+    assert replicas.healthy == 0
+
+
+def test_routing_session_pins_primary_after_write() -> None:
+    primary, replica = create_engine("sqlite://"), _replica()
+    replicas = ReplicaSet([replica], eject_seconds=30)
+    db = RoutingSession(bind=primary, info={"replicas": replicas})
+
+    assert db.get_bind(clause=select(Site)) is replica.sync_engine
+    assert db.get_bind(clause=select(Site).with_for_update()) is primary
+    assert db.get_bind(clause=insert(Site).values(site_id="s")) is primary
+    # Reads after a write in the same session must see it.
+    assert db.get_bind(clause=select(Site)) is primary
+
+    forced = RoutingSession(bind=primary, info={"replicas": replicas, "force_primary": True})
+    assert forced.get_bind(clause=select(Site)) is primary
+    assert RoutingSession(bind=primary).get_bind(clause=select(Site)) is primary
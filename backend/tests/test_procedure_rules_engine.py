@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import random
+
+from fastapi.testclient import TestClient
+
+from radiobuddy_api.features.procedure_rules import registry
+from radiobuddy_api.features.procedure_rules.engine import CompiledRules, Frame
+from radiobuddy_api.main import app
+
+_COMPARE = {
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+}
+
+
+def _scalar_decide(payload: dict, frame: Frame) -> str | None:
+    # Mirrors GuidanceEngine.decide in the mobile app.
+    rules = sorted(payload["rules"], key=lambda rule: -rule["priority"])
+    for rule in rules:
+        if frame.stage_id not in rule["stage_ids"]:
+            continue
+        if all(
+            cond["metric"] in frame.metrics
+            and _COMPARE[cond["op"]](frame.metrics[cond["metric"]], cond["value"])
+            for cond in rule["when"]["all"]
+        ):
+            return rule["rule_id"]
+    return None
+
+
+def test_engine_matches_scalar_evaluation() -> None:
+    payload = registry.get_document("chest_pa_erect").payload
+    metric_ids = [metric["metric_id"] for metric in payload["metrics"]]
+    stage_ids = [stage["stage_id"] for stage in payload["stages"]] + ["unknown"]
+    rng = random.Random(1234)
+
+    frames = []
+    for _ in range(2000):
+        metrics = {m: round(rng.random(), 2) for m in metric_ids if rng.random() > 0.05}
+        frames.append(Frame(stage_id=rng.choice(stage_ids), metrics=metrics))
+
+    decisions = CompiledRules(payload).evaluate(frames)
+
+    for frame, decision in zip(frames, decisions):
+        expected = _scalar_decide(payload, frame)
+        assert (decision.rule_id if decision else None) == expected
+
+
+def test_evaluate_endpoint_returns_decision_per_frame() -> None:
+    client = TestClient(app)
+    resp = client.post(
+        "/procedure-rules/chest-pa/evaluate",
+        json={
+            "frames": [
+                {"stage_id": "acquire_view", "metrics": {"pose_confidence": 0.2}},
+                {"stage_id": "coarse", "metrics": {"motion_score": 0.9}},
+                {"stage_id": "coarse", "metrics": {}},
+            ]
+        },
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["procedure_id"] == "chest_pa_erect"
+    first, second, third = body["decisions"]
+    assert first["rule_id"] == "acquire_low_pose_conf"
+    assert first["prompt_id"] == "improve_view_step_back"
+    assert second["rule_id"] == "avoid_coaching_during_motion"
+    assert third is None
+
+
+def test_evaluate_unknown_procedure_returns_404() -> None:
+    client = TestClient(app)
+    resp = client.post("/procedure-rules/nope/evaluate", json={"frames": []})
+    assert resp.status_code == 404
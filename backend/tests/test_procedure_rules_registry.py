@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from radiobuddy_api.features.procedure_rules import registry
+from radiobuddy_api.main import app
+
+
+def test_registry_loads_bundled_rules() -> None:
+    documents = registry.load_documents()
+    document = documents["chest_pa_erect"]
+    assert json.loads(document.body) == document.payload
+
+
+def test_registry_rejects_invalid_document(tmp_path: Path) -> None:
+    (tmp_path / "broken_rules.json").write_text(
+        json.dumps({"schema_version": "v1", "procedure_id": "broken"}), encoding="utf-8"
+    )
+    with pytest.raises(registry.ProcedureRulesLoadError, match="broken_rules.json"):
+        registry.load_documents(tmp_path)
+
+
+def test_registry_rejects_duplicate_procedure_id(tmp_path: Path) -> None:
+    source = (registry.RESOURCES_DIR / "chest_pa_rules.json").read_text(encoding="utf-8")
+    (tmp_path / "a_rules.json").write_text(source, encoding="utf-8")
+    (tmp_path / "b_rules.json").write_text(source, encoding="utf-8")
+    with pytest.raises(registry.ProcedureRulesLoadError, match="already defined"):
+        registry.load_documents(tmp_path)
+
+
+def test_procedure_rules_served_from_registry_bytes() -> None:
+    client = TestClient(app)
+    resp = client.get("/procedure-rules/chest_pa_erect")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.content == registry.get_document("chest_pa_erect").body
+
+
+def test_procedure_rules_unknown_returns_404_envelope() -> None:
+    client = TestClient(app)
+    resp = client.get("/procedure-rules/not_a_real_procedure")
+    assert resp.status_code == 404
+    assert resp.json()["error"] == "http_error"
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from radiobuddy_api.platform.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_flight() -> None:
+    flights = SingleFlight()
+    calls = 0
+
+    async def slow() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def run() -> list[str]:
+        return await asyncio.gather(*(flights.do("k", slow) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["done"] * 5
+    assert calls == 1
+    assert (flights.started, flights.coalesced) == (1, 4)
+    assert len(flights) == 0
+
+
+def test_flight_timeout_releases_all_waiters() -> None:
+    flights = SingleFlight()
+
+    async def hang() -> str:
+        await asyncio.sleep(10)
+        return "never"
+
+    async def run() -> list[object]:
+        return await asyncio.gather(
+            *(flights.do("k", hang, timeout=0.01) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, TimeoutError) for r in results)
+    assert len(flights) == 0
+
+
+def test_upstream_cancelled_when_last_waiter_leaves() -> None:
+    flights = SingleFlight()
+
+    async def run() -> bool:
+        upstream_cancelled = asyncio.Event()
+
+        async def hang() -> None:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                upstream_cancelled.set()
+                raise
+
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(flights.do("k", hang), 0.01)
+        await asyncio.sleep(0)
+        return upstream_cancelled.is_set()
+
+    assert asyncio.run(run())
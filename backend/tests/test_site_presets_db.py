@@ -41,6 +41,13 @@ def test_site_room_protocol_roundtrip() -> None:
         assert resp.status_code == 200
         assert resp.json()["room_id"] == room_id
 
+        resp = client.post("/sites", json={"site_id": site_id}, headers=headers)
+        assert resp.status_code == 409
+        resp = client.post(f"/sites/{site_id}/rooms", json={"room_id": room_id}, headers=headers)
+        assert resp.status_code == 409
+        resp = client.post("/sites/no_such_site/rooms", json={"room_id": room_id}, headers=headers)
+        assert resp.status_code == 404
+
         payload = {
             "schema_version": "v1",
             "protocol_id": "demo_chest_pa_protocol",
@@ -91,3 +98,55 @@ def test_site_room_protocol_roundtrip() -> None:
             )
             conn.execute(text("DELETE FROM rooms WHERE site_id = :site_id"), {"site_id": site_id})
             conn.execute(text("DELETE FROM sites WHERE site_id = :site_id"), {"site_id": site_id})
+
+
+@pytest.mark.skipif(not settings.database_url, reason="RADIOBUDDY_DATABASE_URL not set")
+def test_import_manifest_rerun_is_unchanged() -> None:
+    assert settings.database_url
+
+    site_id = f"test_site_{uuid.uuid4().hex[:8]}"
+    protocol = {
+        "schema_version": "v1",
+        "site_id": site_id,
+        "room_id": "room_1",
+        "protocol_id": "demo_chest_pa_protocol",
+        "protocol_name": "Chest PA (Erect)",
+        "protocol_version": "v1",
+        "procedure_id": "chest_pa_erect",
+        "recommendations": [
+            {
+                "inputs": {"projection": "chest_pa_erect", "size_class": "average"},
+                "output": {"kvp": 120, "mas": 1.6},
+            }
+        ],
+    }
+    manifest = {
+        "sites": [{"site_id": site_id, "name": "Test Site"}],
+        "rooms": [{"site_id": site_id, "room_id": "room_1"}],
+        "protocols": [protocol],
+    }
+
+    client = TestClient(app)
+    settings.admin_api_key = "test_admin_key"
+    headers = {"x-api-key": settings.admin_api_key}
+
+    try:
+        resp = client.post("/sites:import", json=manifest, headers=headers)
+        assert resp.status_code == 200
+        assert resp.json()["inserted"] == 3
+
+        resp = client.post("/sites:import", json=manifest, headers=headers)
+        assert resp.status_code == 200
+        assert resp.json()["unchanged"] == 3
+
+        manifest["sites"][0]["name"] = "Renamed"
+        resp = client.post("/sites:import", json=manifest, headers=headers)
+        assert [row["status"] for row in resp.json()["results"]] == [
+            "updated",
+            "unchanged",
+            "unchanged",
+        ]
+    finally:
+        engine = create_engine(settings.database_url)
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM sites WHERE site_id = :site_id"), {"site_id": site_id})
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from radiobuddy_api.features.site_presets.provisioning import (
+    InvalidManifestError,
+    import_manifest,
+    parse_manifest,
+)
+from radiobuddy_api.features.site_presets.schemas import ProvisioningManifestIn
+from radiobuddy_api.main import app
+from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.db.session import get_db
+
+PROTOCOL = {
+    "schema_version": "v1",
+    "site_id": "north",
+    "room_id": "r1",
+    "protocol_id": "chest_pa",
+    "protocol_name": "Chest PA (Erect)",
+    "protocol_version": "v1",
+    "procedure_id": "chest_pa_erect",
+    "recommendations": [
+        {
+            "inputs": {"projection": "chest_pa_erect", "size_class": "average"},
+            "output": {"kvp": 120, "mas": 1.6},
+        }
+    ],
+}
+
+
+class ImportSession:
+    def __init__(self, returned: list[list[tuple]] | None = None) -> None:
+        self.info: dict = {}
+        self.returned = list(returned or [])
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return self.returned.pop(0) if self.returned else []
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+    async def rollback(self) -> None:
+        pass
+
+
+def test_parse_ndjson_manifest() -> None:
+    lines = [
+        {"kind": "site", "site_id": "north"},
+        {"kind": "room", "site_id": "north", "room_id": "r1"},
+        {"kind": "protocol", **PROTOCOL},
+    ]
+    body = b"\n".join(json.dumps(line).encode() for line in lines) + b"\n\n"
+
+    manifest = parse_manifest(body, ndjson=True)
+
+    assert manifest.sites == [{"site_id": "north"}]
+    assert manifest.rooms == [{"site_id": "north", "room_id": "r1"}]
+    assert manifest.protocols == [PROTOCOL]
+    with pytest.raises(InvalidManifestError, match="line 1"):
+        parse_manifest(b'{"kind": "hospital"}\n', ndjson=True)
+    with pytest.raises(InvalidManifestError):
+        parse_manifest(b'{"sites": {}}', ndjson=False)
+
+
+def test_import_upserts_only_changed_rows() -> None:
+    manifest = ProvisioningManifestIn(
+        sites=[{"site_id": "north"}, {"site_id": "south"}],
+        rooms=[{"site_id": "north", "room_id": "r1"}],
+        protocols=[PROTOCOL],
+    )
+    # RETURNING yields inserted and updated rows; south is unchanged.
+    db = ImportSession([[("north", True)], [("north", "r1", False)], []])
+
+    result = asyncio.run(import_manifest(db, manifest))
+
+    assert result.applied
+    assert (result.inserted, result.updated, result.unchanged) == (1, 1, 2)
+    assert [row.status for row in result.results] == [
+        "inserted",
+        "unchanged",
+        "updated",
+        "unchanged",
+    ]
+    assert [row.key for row in result.results][-1] == "north/r1/chest_pa_erect"
+    assert (len(db.statements), db.commits) == (3, 1)
+    assert db.info["force_primary"]
+
+    sql = str(db.statements[2].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (site_id, room_id, procedure_id) DO UPDATE" in sql
+    assert "room_exposure_protocols.payload IS DISTINCT FROM excluded.payload" in sql
+    assert "RETURNING" in sql and "xmax = 0" in sql
+
+
+def test_import_with_rejected_rows_writes_nothing(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "admin_api_key", "secret")
+    db = ImportSession()
+    manifest = {
+        "sites": [{"site_id": "north"}, {"site_id": "north"}, {"site_id": "Bad Id"}],
+        "rooms": [{"site_id": "north", "room_id": "r1"}],
+        "protocols": [{**PROTOCOL, "recommendations": []}],
+    }
+    client = TestClient(app)
+    try:
+        app.dependency_overrides[get_db] = lambda: db
+        resp = client.post("/sites:import", json=manifest, headers={"X-API-Key": "secret"})
+        unsupported = client.post(
+            "/sites:import",
+            content=b"sites",
+            headers={"X-API-Key": "secret", "Content-Type": "text/csv"},
+        )
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert resp.status_code == 422
+    body = resp.json()
+    assert (body["applied"], body["rejected"]) == (False, 3)
+    statuses = [(row["kind"], row["status"]) for row in body["results"]]
+    assert statuses == [
+        ("site", "skipped"),
+        ("site", "rejected"),
+        ("site", "rejected"),
+        ("room", "skipped"),
+        ("protocol", "rejected"),
+    ]
+    assert body["results"][1]["errors"][0]["type"] == "duplicate_key"
+    assert body["results"][4]["errors"][0]["type"] == "schema"
+    assert (db.statements, db.commits) == ([], 0)
+    assert unsupported.status_code == 415
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from radiobuddy_api.features.site_presets.models import Site
+from radiobuddy_api.features.site_presets.service import SiteExistsError, create_site
+from radiobuddy_api.main import app
+from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.db.session import get_db
+
+
+class ForeignKeyViolation(Exception):
+    sqlstate = "23503"
+
+
+class WriteSession:
+    def __init__(self, row=None, error: Exception | None = None) -> None:
+        self.row = row
+        self.error = error
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def scalar(self, statement):
+        self.statements.append(statement)
+        if self.error is not None:
+            raise self.error
+        return self.row
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+    async def rollback(self) -> None:
+        self.rollbacks += 1
+
+
+def test_create_site_is_one_statement() -> None:
+    site = Site(site_id="north", name="North")
+    db = WriteSession(row=site)
+
+    assert asyncio.run(create_site(db, site_id="north", name="North")) is site
+
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (site_id) DO NOTHING RETURNING" in sql
+    assert (len(db.statements), db.commits) == (1, 1)
+
+
+def test_duplicate_site_raises_without_commit() -> None:
+    db = WriteSession(row=None)
+
+    with pytest.raises(SiteExistsError):
+        asyncio.run(create_site(db, site_id="north", name=None))
+
+    assert (db.commits, db.rollbacks) == (0, 1)
+
+
+def test_write_conflicts_map_to_http_errors(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "admin_api_key", "secret")
+    headers = {"X-API-Key": "secret"}
+    missing_parent = IntegrityError("INSERT", {}, ForeignKeyViolation())
+    client = TestClient(app)
+    try:
+        app.dependency_overrides[get_db] = lambda: WriteSession(row=None)
+        duplicate = client.post("/sites", json={"site_id": "north"}, headers=headers)
+        app.dependency_overrides[get_db] = lambda: WriteSession(error=missing_parent)
+        orphan = client.post("/sites/nowhere/rooms", json={"room_id": "r1"}, headers=headers)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert (duplicate.status_code, duplicate.json()["detail"]) == (409, "site_exists")
+    assert (orphan.status_code, orphan.json()["detail"]) == (404, "site_not_found")
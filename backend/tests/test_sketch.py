@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import random
+
+from radiobuddy_api.platform.sketch import LogHistogram
+
+
+def _exact_quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_quantiles_within_relative_accuracy() -> None:
+    rng = random.Random(7)
+    values = [rng.lognormvariate(3.0, 0.8) for _ in range(20_000)]
+    sketch = LogHistogram(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.5, 0.9, 0.95, 0.99):
+        exact = _exact_quantile(values, q)
+        assert abs(sketch.quantile(q) - exact) <= 0.011 * exact
+
+
+def test_merge_matches_single_sketch_and_survives_json() -> None:
+    rng = random.Random(11)
+    values = [rng.uniform(1, 100) for _ in range(2_000)] + [0.0] * 10
+    whole = LogHistogram()
+    left, right = LogHistogram(), LogHistogram()
+    for index, value in enumerate(values):
+        whole.add(value)
+        (left if index % 2 else right).add(value)
+
+    merged = LogHistogram.from_json(left.to_json())
+    merged.merge(LogHistogram.from_json(right.to_json()))
+
+    assert merged.count == whole.count == len(values)
+    assert merged.to_json() == whole.to_json()
+    assert merged.quantile(0.0) == 0.0
+    assert LogHistogram().quantile(0.5) is None
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from radiobuddy_api.features.telemetry.service import parse_batch, typed_columns
+from radiobuddy_api.main import app
+from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.db.session import get_db
+
+
+def _event(**overrides) -> dict:
+    event = {
+        "schema_version": "v1",
+        "event_id": str(uuid.uuid4()),
+        "timestamp": "2026-01-01T22:25:30.509Z",
+        "event_type": "prompt_emitted",
+        "procedure_id": "chest_pa",
+        "session_id": str(uuid.uuid4()),
+        "prompt": {"prompt_id": "chin_up", "rule_id": "coarse_chin"},
+    }
+    event.update(overrides)
+    return event
+
+
+def test_parse_batch_rejects_bad_events_individually() -> None:
+    good = _event()
+    bad = _event(event_type="not_a_type")
+    events, results = parse_batch([good, bad, good, "nope"])
+
+    assert [e.event_id for e in events] == [uuid.UUID(good["event_id"])]
+    assert [r.status for r in results] == ["accepted", "rejected", "accepted", "rejected"]
+    assert results[1].event_id == uuid.UUID(bad["event_id"])
+    assert results[1].errors[0]["loc"] == ("event_type",)
+    assert results[3].event_id is None
+
+
+def test_typed_columns_copy_hot_json_fields() -> None:
+    events, _ = parse_batch(
+        [
+            _event(
+                performance={"frame_latency_ms": 22.0, "fps": 30.0},
+                habitus={"size_class_final": "large"},
+            ),
+            _event(prompt=None),
+        ]
+    )
+
+    columns = typed_columns(events[0])
+    assert columns["perf_fps"] == 30.0
+    assert columns["habitus_size_class_final"] == "large"
+    assert columns["prompt_rule_id"] == "coarse_chin"
+    assert columns["exposure_kvp"] is None
+    assert set(typed_columns(events[1]).values()) == {None}
+
+
+class RecordingResult:
+    def __init__(self, rows: list) -> None:
+        self.rows = rows
+
+    def scalars(self) -> RecordingResult:
+        return self
+
+    def all(self) -> list:
+        return self.rows
+
+
+class RecordingSession:
+    def __init__(self) -> None:
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return RecordingResult([])
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+
+def test_batch_endpoint_writes_one_statement() -> None:
+    db = RecordingSession()
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        client = TestClient(app)
+        resp = client.post(
+            "/telemetry/events:batch",
+            json={"events": [_event(), _event(), _event(schema_version="x")]},
+        )
+    finally:
+        app.dependency_overrides.pop(get_db)
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert (body["accepted"], body["rejected"]) == (2, 1)
+    assert len(db.statements) == 1
+    assert db.commits == 1
+
+
+def test_recently_stored_events_skip_the_database() -> None:
+    db = RecordingSession()
+    app.dependency_overrides[get_db] = lambda: db
+    event = _event()
+    try:
+        client = TestClient(app)
+        first = client.post("/telemetry/events", json=event)
+        retry = client.post("/telemetry/events", json=event)
+        metrics = client.get("/metrics").json()
+    finally:
+        app.dependency_overrides.pop(get_db)
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.json()["event_id"] == event["event_id"]
+    assert len(db.statements) == 1
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT DO NOTHING" in sql
+    # Stamped by the database, so the rollup watermark can bound it by open transactions.
+    assert "now()" in sql
+    assert metrics["telemetry.dedupe.filtered"] >= 1
+
+
+@pytest.mark.skipif(not settings.database_url, reason="RADIOBUDDY_DATABASE_URL not set")
+def test_duplicate_event_is_accepted() -> None:
+    client = TestClient(app)
+    event = _event()
+    assert client.post("/telemetry/events", json=event).status_code == 200
+    assert client.post("/telemetry/events:batch", json={"events": [event]}).json()["accepted"] == 1
+
+
+@pytest.mark.skipif(not settings.database_url, reason="RADIOBUDDY_DATABASE_URL not set")
+def test_batch_endpoint_roundtrip() -> None:
+    client = TestClient(app)
+    events = [_event() for _ in range(3)]
+    resp = client.post("/telemetry/events:batch", json={"events": events})
+    assert resp.status_code == 200
+    assert resp.json()["accepted"] == 3
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+
+from radiobuddy_api.features.telemetry import router as telemetry_router
+from radiobuddy_api.features.telemetry.buffer import TelemetryWriteBuffer
+from radiobuddy_api.features.telemetry.schemas import TelemetryEventIn
+from radiobuddy_api.main import app
+from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.db.session import get_db
+
+
+def _event() -> TelemetryEventIn:
+    return TelemetryEventIn.model_validate(
+        {
+            "schema_version": "v1",
+            "event_id": str(uuid.uuid4()),
+            "timestamp": "2026-01-01T22:25:30.509Z",
+            "event_type": "session_start",
+            "procedure_id": "chest_pa",
+            "session_id": str(uuid.uuid4()),
+        }
+    )
+
+
+class RecordingWriter:
+    def __init__(self, fail: bool = False) -> None:
+        self.batches: list[list[TelemetryEventIn]] = []
+        self.fail = fail
+        self.called = threading.Event()
+
+    def __call__(self, events: list[TelemetryEventIn]) -> None:
+        self.called.set()
+        if self.fail:
+            raise RuntimeError("database down")
+        self.batches.append(events)
+
+    @property
+    def event_ids(self) -> list[uuid.UUID]:
+        return [event.event_id for batch in self.batches for event in batch]
+
+
+def _buffer(writer, **overrides) -> TelemetryWriteBuffer:
+    options = {"max_events": 100, "batch_size": 2, "flush_interval_seconds": 60.0}
+    options.update(overrides)
+    return TelemetryWriteBuffer(writer, **options)
+
+
+def test_stop_flushes_queue_in_batches() -> None:
+    writer = RecordingWriter()
+    buffer = _buffer(writer, batch_size=10)
+    buffer.start()
+    events = [_event() for _ in range(3)]
+    for event in events:
+        assert buffer.enqueue(event)
+
+    buffer.stop(timeout=5)
+
+    assert writer.event_ids == [event.event_id for event in events]
+    assert buffer.flushed == 3
+    assert len(buffer) == 0
+
+
+def test_full_batch_triggers_flush_before_interval() -> None:
+    writer = RecordingWriter()
+    buffer = _buffer(writer, batch_size=2)
+    buffer.start()
+    buffer.enqueue(_event())
+    buffer.enqueue(_event())
+
+    assert writer.called.wait(timeout=5)
+    buffer.stop(timeout=5)
+    assert len(writer.event_ids) == 2
+
+
+def test_overflow_policies() -> None:
+    rejecting = _buffer(RecordingWriter(), max_events=2)
+    assert rejecting.enqueue(_event())
+    assert rejecting.enqueue(_event())
+    assert not rejecting.enqueue(_event())
+    assert rejecting.rejected == 1
+
+    dropping = _buffer(RecordingWriter(), max_events=2, overflow_policy="drop_oldest")
+    events = [_event() for _ in range(3)]
+    for event in events:
+        assert dropping.enqueue(event)
+    assert dropping.dropped == 1
+    assert [e.event_id for e in dropping._queue] == [e.event_id for e in events[1:]]
+
+
+def test_failed_flush_requeues_without_spill() -> None:
+    writer = RecordingWriter(fail=True)
+    buffer = _buffer(writer)
+    buffer.start()
+    buffer.enqueue(_event())
+    buffer.stop(timeout=5)
+
+    assert buffer.flush_failures == 1
+    assert len(buffer) == 1
+
+
+def test_failed_flush_backs_off_with_full_queue() -> None:
+    writer = RecordingWriter(fail=True)
+    calls = 0
+
+    def write(events: list[TelemetryEventIn]) -> None:
+        nonlocal calls
+        calls += 1
+        writer(events)
+
+    buffer = _buffer(write, flush_interval_seconds=0.05, max_backoff_seconds=0.2)
+    for _ in range(5):
+        buffer.enqueue(_event())
+    buffer.start()
+    time.sleep(0.5)
+    buffer.stop(timeout=5)
+
+    # Backoff of 0.05, 0.1, 0.2, 0.2... rather than a retry per loop iteration.
+    assert 2 <= calls <= 8
+    assert buffer.flush_failures == calls
+    assert len(buffer) == 5
+
+
+def test_spill_journal_is_replayed_after_failed_flush(tmp_path) -> None:
+    spill_path = tmp_path / "telemetry.ndjson"
+    failing = _buffer(RecordingWriter(fail=True), spill_path=spill_path)
+    failing.start()
+    events = [_event() for _ in range(3)]
+    for event in events:
+        failing.enqueue(event)
+    failing.stop(timeout=5)
+
+    assert list(tmp_path.glob("telemetry.ndjson.*.pending"))
+
+    writer = RecordingWriter()
+    recovered = _buffer(writer, spill_path=spill_path)
+    recovered.start()
+    recovered.stop(timeout=5)
+
+    assert writer.event_ids == [event.event_id for event in events]
+    assert not list(tmp_path.glob("telemetry.ndjson.*.pending"))
+
+
+def test_segment_left_by_crash_is_replayed_on_start(tmp_path) -> None:
+    spill_path = tmp_path / "telemetry.ndjson"
+    event = _event()
+    segment = tmp_path / "telemetry.ndjson.0.1.pending"
+    segment.write_text(event.model_dump_json() + "\n" + '{"torn": ', encoding="utf-8")
+
+    writer = RecordingWriter()
+    buffer = _buffer(writer, spill_path=spill_path)
+    buffer.start()
+    buffer.stop(timeout=5)
+
+    assert writer.event_ids == [event.event_id]
+    assert not segment.exists()
+
+
+def test_workers_sharing_a_spill_path_use_separate_slots(tmp_path) -> None:
+    spill_path = tmp_path / "telemetry.ndjson"
+    first = _buffer(RecordingWriter(fail=True), spill_path=spill_path)
+    other_writer = RecordingWriter()
+    other = _buffer(other_writer, spill_path=spill_path)
+    first.start()
+    other.start()
+    first.enqueue(_event())
+    first.stop(timeout=5)
+    other.stop(timeout=5)
+
+    assert [path.name.split(".")[2] for path in tmp_path.glob("*.pending")] == ["0"]
+    assert other_writer.batches == []
+
+
+class FakeBuffer:
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.events: list[TelemetryEventIn] = []
+
+    def enqueue(self, event: TelemetryEventIn) -> bool:
+        if len(self.events) >= self.capacity:
+            return False
+        self.events.append(event)
+        return True
+
+
+def test_ingest_returns_202_when_write_behind_enabled(monkeypatch) -> None:
+    buffer = FakeBuffer(capacity=2)
+    monkeypatch.setattr(settings, "telemetry_write_behind_enabled", True)
+    monkeypatch.setattr(telemetry_router, "get_write_buffer", lambda: buffer)
+    app.dependency_overrides[get_db] = lambda: None
+    try:
+        client = TestClient(app)
+        event = _event().model_dump(mode="json")
+        resp = client.post("/telemetry/events", json=event)
+        assert resp.status_code == 202
+        assert resp.json()["event_id"] == event["event_id"]
+
+        resp = client.post(
+            "/telemetry/events:batch",
+            json={"events": [_event().model_dump(mode="json") for _ in range(2)]},
+        )
+        assert resp.status_code == 202
+        body = resp.json()
+        assert (body["accepted"], body["rejected"]) == (1, 1)
+        assert body["results"][1]["errors"] == [{"type": "buffer_full"}]
+
+        resp = client.post("/telemetry/events", json=_event().model_dump(mode="json"))
+        assert resp.status_code == 503
+    finally:
+        app.dependency_overrides.pop(get_db, None)
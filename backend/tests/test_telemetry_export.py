@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import datetime as dt
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from radiobuddy_api.features.telemetry import export
+from radiobuddy_api.features.telemetry.export import (
+    ExportResult,
+    flatten_event,
+    partition_path,
+    read_watermark,
+    write_watermark,
+)
+from radiobuddy_api.main import app
+from radiobuddy_api.platform.config import settings
+
+TS = dt.datetime(2026, 10, 17, 23, 30, tzinfo=dt.timezone.utc)
+HEADERS = {"X-API-Key": "secret"}
+
+
+def _row(**overrides):
+    values = {
+        "event_id": uuid.uuid4(),
+        "timestamp": TS,
+        "created_at": TS,
+        "schema_version": "v1",
+        "event_type": "stage_enter",
+        "procedure_id": "chest_pa",
+        "procedure_version": "v1",
+        "session_id": None,
+        "stage_id": "setup",
+        "device": {"platform": "android", "model": "Pixel 8"},
+        "metrics": {"confidence": 0.9, "label": "x"},
+        "prompt": None,
+        "habitus": {"size_class_final": "large", "height_cm": 180},
+        "exposure": {"kvp": "110", "mas": 2.5},
+        "performance": {"frame_latency_ms": 22, "fps": 30.0},
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_flatten_event_expands_json_into_typed_columns() -> None:
+    flat = flatten_event(_row())
+
+    assert set(flat) == {name for name, _ in export.EXPORT_COLUMNS}
+    assert flat["device_platform"] == "android"
+    assert flat["device_app_version"] is None
+    assert flat["habitus_height_cm"] == 180.0
+    # Non-numeric values never reach the float columns.
+    assert flat["exposure_kvp"] is None
+    assert flat["exposure_mas"] == 2.5
+    assert flat["perf_frame_latency_ms"] == 22.0
+    assert flat["prompt_spoken"] is None
+    assert flat["metrics"] == [("confidence", 0.9)]
+
+
+def test_partition_path_uses_utc_day_and_procedure() -> None:
+    local = TS.astimezone(dt.timezone(dt.timedelta(hours=2)))
+
+    assert str(partition_path(local, "chest/pa")) == "date=2026-10-17/procedure_id=chest_pa"
+
+
+def test_watermark_round_trip(tmp_path) -> None:
+    assert read_watermark(tmp_path) is None
+    write_watermark(tmp_path, TS)
+    assert read_watermark(tmp_path) == TS
+
+
+def test_partition_writers_bound_open_files(tmp_path) -> None:
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    writers = export._PartitionWriters(pa, tmp_path, "run", max_open=1)
+    first, second = partition_path(TS, "chest_pa"), partition_path(TS, "hand_pa")
+    writers.write(first, [flatten_event(_row())])
+    writers.write(second, [flatten_event(_row(procedure_id="hand_pa"))])
+    writers.write(first, [flatten_event(_row()), flatten_event(_row())])
+    writers.commit()
+
+    # Evicting a writer finishes its file; the partition continues in a new part.
+    assert len(writers.files) == 3
+    assert not list(tmp_path.rglob("*.tmp"))
+    table = pq.read_table(tmp_path / first / "part-run-00001.parquet")
+    assert table.num_rows == 2
+    assert table.column("metrics").to_pylist()[0] == [("confidence", 0.9)]
+
+
+def _fake_pyarrow() -> MagicMock:
+    pa = MagicMock()
+
+    def parquet_writer(path: str, *args, **kwargs) -> MagicMock:
+        Path(path).touch()
+        return MagicMock()
+
+    pa.parquet.ParquetWriter.side_effect = parquet_writer
+    return pa
+
+
+def test_partition_writers_abort_removes_partial_files(tmp_path) -> None:
+    writers = export._PartitionWriters(_fake_pyarrow(), tmp_path, "run", max_open=1)
+    writers.write(partition_path(TS, "chest_pa"), [flatten_event(_row())])
+    writers.write(partition_path(TS, "hand_pa"), [flatten_event(_row(procedure_id="hand_pa"))])
+    writers.abort()
+
+    # The evicted writer's file is dropped too; the rerun exports its rows again.
+    assert writers.files == []
+    assert not [path for path in tmp_path.rglob("*") if path.is_file()]
+
+
+def test_export_endpoint_requires_export_dir(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "admin_api_key", "secret")
+    monkeypatch.setattr(settings, "telemetry_export_dir", None)
+
+    resp = TestClient(app).post("/telemetry/exports", headers=HEADERS)
+
+    assert resp.status_code == 503
+
+
+def test_export_endpoint_runs_job_in_background(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(settings, "admin_api_key", "secret")
+    monkeypatch.setattr(settings, "telemetry_export_dir", str(tmp_path))
+    monkeypatch.setattr(export, "_import_pyarrow", lambda: None)
+    monkeypatch.setattr(export, "get_engine", lambda: None)
+    monkeypatch.setattr(
+        export,
+        "export_events",
+        lambda *args, **kwargs: ExportResult(rows=3, files=["a.parquet"], watermark=TS),
+    )
+    client = TestClient(app)
+
+    resp = client.post("/telemetry/exports", headers=HEADERS)
+    assert resp.status_code == 202
+    export_id = resp.json()["export_id"]
+
+    status = client.get(f"/telemetry/exports/{export_id}", headers=HEADERS).json()
+    assert status["status"] == "succeeded"
+    assert status["rows"] == 3
+    assert client.get("/telemetry/exports/missing", headers=HEADERS).status_code == 404
+
+
+def test_export_endpoint_rejects_concurrent_runs(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(settings, "admin_api_key", "secret")
+    monkeypatch.setattr(settings, "telemetry_export_dir", str(tmp_path))
+    monkeypatch.setattr(export, "_import_pyarrow", lambda: None)
+    monkeypatch.setattr(export, "_jobs", type(export._jobs)())
+    export.begin_export_job()
+
+    resp = TestClient(app).post("/telemetry/exports", headers=HEADERS)
+
+    assert resp.status_code == 409
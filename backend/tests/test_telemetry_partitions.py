@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import datetime as dt
+
+from radiobuddy_api.features.telemetry.partitions import (
+    add_months,
+    ensure_partitions,
+    expire_partitions,
+    partition_name,
+)
+
+
+class FakeResult:
+    def __init__(self, value, rowcount: int = 0) -> None:
+        self.value = value
+        self.rowcount = rowcount
+
+    def scalars(self):
+        return iter(self.value)
+
+    def scalar(self):
+        return self.value
+
+
+class FakeConnection:
+    def __init__(
+        self,
+        partitions: list[str],
+        default_rows: bool = False,
+        old_default_months: list[dt.date] | None = None,
+        delete_counts: list[int] | None = None,
+    ) -> None:
+        self.partitions = partitions
+        self.default_rows = default_rows
+        self.old_default_months = old_default_months or []
+        self.delete_counts = list(delete_counts or [])
+        self.statements: list[str] = []
+
+    def execute(self, statement, params=None) -> FakeResult:
+        sql = str(statement)
+        if "FROM pg_inherits" in sql:
+            return FakeResult(self.partitions)
+        if sql.startswith("SELECT EXISTS"):
+            return FakeResult(self.default_rows)
+        if sql.startswith("SELECT DISTINCT"):
+            return FakeResult(self.old_default_months)
+        self.statements.append(sql)
+        if sql.startswith("DELETE FROM telemetry_events_default"):
+            return FakeResult(None, self.delete_counts.pop(0) if self.delete_counts else 0)
+        return FakeResult(None)
+
+
+def test_add_months_wraps_years() -> None:
+    assert add_months(dt.date(2026, 11, 1), 3) == dt.date(2027, 2, 1)
+    assert add_months(dt.date(2026, 1, 1), -1) == dt.date(2025, 12, 1)
+    assert partition_name(dt.date(2026, 3, 1)) == "telemetry_events_p202603"
+
+
+def test_ensure_partitions_creates_missing_months_ahead() -> None:
+    conn = FakeConnection(["telemetry_events_default", "telemetry_events_p202610"])
+    created = ensure_partitions(conn, dt.date(2026, 10, 17), months_ahead=2)
+
+    assert created == ["telemetry_events_p202611", "telemetry_events_p202612"]
+    assert conn.statements[0] == (
+        "CREATE TABLE IF NOT EXISTS telemetry_events_p202611 PARTITION OF telemetry_events "
+        "FOR VALUES FROM ('2026-11-01 00:00:00+00') TO ('2026-12-01 00:00:00+00')"
+    )
+
+
+def test_ensure_partitions_moves_rows_out_of_default_partition() -> None:
+    conn = FakeConnection(["telemetry_events_p202610"], default_rows=True)
+    ensure_partitions(conn, dt.date(2026, 10, 17), months_ahead=1)
+
+    assert conn.statements[0].startswith("CREATE TABLE telemetry_events_p202611 (LIKE")
+    assert "DELETE FROM telemetry_events_default" in conn.statements[1]
+    assert conn.statements[2].startswith(
+        "ALTER TABLE telemetry_events ATTACH PARTITION telemetry_events_p202611"
+    )
+
+
+def test_expire_partitions_respects_retention_and_action() -> None:
+    partitions = [
+        "telemetry_events_p202607",
+        "telemetry_events_p202608",
+        "telemetry_events_p202609",
+    ]
+
+    conn = FakeConnection(partitions)
+    expired = expire_partitions(conn, dt.date(2026, 10, 17), retention_months=2, action="drop")
+    assert expired == ["telemetry_events_p202607"]
+    assert conn.statements[1:] == [
+        "ALTER TABLE telemetry_events DETACH PARTITION telemetry_events_p202607",
+        "DROP TABLE telemetry_events_p202607",
+    ]
+
+    conn = FakeConnection(partitions)
+    expire_partitions(conn, dt.date(2026, 10, 17), retention_months=1, action="detach")
+    assert not any(sql.startswith("DROP") for sql in conn.statements)
+    assert len(conn.statements) == 2
+
+
+def test_expire_partitions_deletes_old_default_rows_in_batches(monkeypatch) -> None:
+    from radiobuddy_api.features.telemetry import partitions
+
+    monkeypatch.setattr(partitions, "_DEFAULT_DELETE_BATCH_ROWS", 2)
+    conn = FakeConnection(["telemetry_events_default"], delete_counts=[2, 2, 1])
+
+    expired = expire_partitions(conn, dt.date(2026, 10, 17), retention_months=2, action="drop")
+
+    assert expired == []
+    assert len(conn.statements) == 3
+    assert all(
+        sql.startswith("DELETE FROM telemetry_events_default WHERE ctid IN")
+        and "WHERE timestamp < CAST(:cutoff AS timestamptz) LIMIT :limit" in sql
+        for sql in conn.statements
+    )
+
+
+def test_expire_partitions_detaches_old_default_rows_as_partitions() -> None:
+    conn = FakeConnection(
+        ["telemetry_events_default", "telemetry_events_p202609"],
+        default_rows=True,
+        old_default_months=[dt.date(2023, 5, 1)],
+    )
+
+    expire_partitions(conn, dt.date(2026, 10, 17), retention_months=2, action="detach")
+
+    assert conn.statements[0].startswith("CREATE TABLE telemetry_events_p202305 (LIKE")
+    assert "DELETE FROM telemetry_events_default" in conn.statements[1]
+    assert conn.statements[2].startswith(
+        "ALTER TABLE telemetry_events ATTACH PARTITION telemetry_events_p202305"
+    )
+    assert not any(sql.startswith("DROP") for sql in conn.statements)
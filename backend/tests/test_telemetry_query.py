@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from radiobuddy_api.features.telemetry.service import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    list_events,
+)
+from radiobuddy_api.main import app
+from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.db.session import get_db
+
+
+def test_cursor_roundtrip() -> None:
+    timestamp = dt.datetime(2026, 1, 1, 22, 25, 30, 509000, tzinfo=dt.timezone.utc)
+    event_id = uuid.uuid4()
+    cursor = encode_cursor(timestamp, event_id)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (timestamp, event_id)
+    for bad in ("", "not-a-cursor", encode_cursor(timestamp, event_id)[:-4]):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(bad)
+
+
+class RecordingSession:
+    def __init__(self, rows: list) -> None:
+        self.rows = rows
+        self.statements = []
+
+    async def scalars(self, statement):
+        self.statements.append(statement)
+        return iter(self.rows)
+
+
+def _row(timestamp: dt.datetime):
+    return type(
+        "Row",
+        (),
+        {
+            "event_id": uuid.uuid4(),
+            "timestamp": timestamp,
+            "schema_version": "v1",
+            "event_type": "session_start",
+            "procedure_id": "chest_pa",
+            "created_at": timestamp,
+        },
+    )()
+
+
+def test_list_endpoint_returns_keyset_cursor(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "admin_api_key", "secret")
+    start = dt.datetime(2026, 1, 1, tzinfo=dt.timezone.utc)
+    rows = [_row(start - dt.timedelta(seconds=i)) for i in range(3)]
+    db = RecordingSession(rows)
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        client = TestClient(app)
+        headers = {"X-API-Key": "secret"}
+        assert client.get("/telemetry/events").status_code == 401
+
+        resp = client.get(
+            "/telemetry/events",
+            params={"limit": 2, "procedure_id": "chest_pa", "since": "2025-12-31T00:00:00Z"},
+            headers=headers,
+        )
+        assert resp.status_code == 200
+        body = resp.json()
+        assert len(body["items"]) == 2
+        assert decode_cursor(body["next_cursor"]) == (rows[1].timestamp, rows[1].event_id)
+
+        sql = str(db.statements[0].compile())
+        assert "(telemetry_events.timestamp, telemetry_events.event_id) <" not in sql
+        assert "ORDER BY telemetry_events.timestamp DESC, telemetry_events.event_id DESC" in sql
+
+        resp = client.get(
+            "/telemetry/events", params={"cursor": body["next_cursor"]}, headers=headers
+        )
+        assert resp.status_code == 200
+        sql = str(db.statements[1].compile())
+        assert "(telemetry_events.timestamp, telemetry_events.event_id) <" in sql
+
+        resp = client.get("/telemetry/events", params={"cursor": "garbage"}, headers=headers)
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "invalid_cursor"
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+def test_list_events_filters_on_typed_columns() -> None:
+    db = RecordingSession([])
+
+    asyncio.run(list_events(db, prompt_rule_id="coarse_chin", habitus_size_class="large"))
+
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert "telemetry_events.prompt_rule_id = " in sql
+    assert "telemetry_events.habitus_size_class_final = " in sql
+    assert "->>" not in sql
+
+
+@pytest.mark.skipif(not settings.database_url, reason="RADIOBUDDY_DATABASE_URL not set")
+def test_list_endpoint_pages_through_session(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "admin_api_key", "secret")
+    client = TestClient(app)
+    session_id = str(uuid.uuid4())
+    events = [
+        {
+            "schema_version": "v1",
+            "event_id": str(uuid.uuid4()),
+            "timestamp": f"2026-01-01T10:00:0{i}Z",
+            "event_type": "prompt_emitted",
+            "procedure_id": "chest_pa",
+            "session_id": session_id,
+        }
+        for i in range(5)
+    ]
+    assert client.post("/telemetry/events:batch", json={"events": events}).status_code == 200
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"session_id": session_id, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/telemetry/events", params=params, headers={"X-API-Key": "secret"})
+        page = body.json()
+        seen.extend(item["event_id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [event["event_id"] for event in reversed(events)]
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import datetime as dt
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from radiobuddy_api.features.telemetry.models import TelemetryPerfRollup
+from radiobuddy_api.features.telemetry.rollups import (
+    aggregate_rows,
+    committed_upper_bound,
+    merge_into_rollups,
+)
+from radiobuddy_api.main import app
+from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.db.session import get_db
+
+HOUR = dt.datetime(2026, 10, 17, 9, tzinfo=dt.timezone.utc)
+
+
+def _rows():
+    return [
+        (HOUR, "chest_pa", "setup", "android", "Pixel 8", 20.0, 30.0),
+        (HOUR, "chest_pa", "setup", "android", "Pixel 8", 40.0, None),
+        (HOUR, "chest_pa", None, "ios", "iPhone 15", 10.0, 60.0),
+        (HOUR + dt.timedelta(hours=1), "chest_pa", "setup", "android", "Pixel 8", 80.0, 24.0),
+    ]
+
+
+def test_aggregate_rows_groups_by_hour_and_dimensions() -> None:
+    aggregates = aggregate_rows(_rows())
+
+    pixel = aggregates[(HOUR, "chest_pa", "setup", "android", "Pixel 8")]
+    assert (pixel.event_count, pixel.latency_count, pixel.fps_count) == (2, 2, 1)
+    assert pixel.latency_sum == 60.0
+    assert (HOUR, "chest_pa", "", "ios", "iPhone 15") in aggregates
+    assert len(aggregates) == 3
+
+
+class RecordingConnection:
+    def __init__(self) -> None:
+        self.statements = []
+
+    def execute(self, statement, parameters=None):
+        self.statements.append(statement)
+        return SimpleNamespace(scalar_one=lambda: HOUR)
+
+
+def test_merge_into_rollups_sums_sketches_on_conflict() -> None:
+    conn = RecordingConnection()
+    merge_into_rollups(conn, aggregate_rows(_rows()), HOUR)
+
+    sql = str(conn.statements[0].compile(dialect=postgresql.dialect()))
+    assert (
+        "ON CONFLICT (bucket_start, procedure_id, stage_id, device_platform, device_model)" in sql
+    )
+    assert "telemetry_sketch_merge(telemetry_perf_rollups.latency_sketch" in sql
+
+
+def test_upper_bound_stops_before_open_transactions() -> None:
+    conn = RecordingConnection()
+    assert committed_upper_bound(conn, 60) == HOUR
+
+    sql = str(conn.statements[0])
+    assert "min(xact_start)" in sql
+    assert "clock_timestamp() - make_interval(secs => :lag_seconds)" in sql
+
+
+class RollupSession:
+    async def scalars(self, statement):
+        rows = []
+        for (hour, procedure_id, stage_id, platform, model), aggregate in aggregate_rows(
+            _rows()
+        ).items():
+            rows.append(
+                TelemetryPerfRollup(
+                    bucket_start=hour,
+                    procedure_id=procedure_id,
+                    stage_id=stage_id,
+                    device_platform=platform,
+                    device_model=model,
+                    event_count=aggregate.event_count,
+                    latency_count=aggregate.latency_count,
+                    latency_sum=aggregate.latency_sum,
+                    latency_sketch=aggregate.latency_sketch.to_json(),
+                    fps_count=aggregate.fps_count,
+                    fps_sum=aggregate.fps_sum,
+                    fps_sketch=aggregate.fps_sketch.to_json(),
+                )
+            )
+        return iter(rows)
+
+
+def test_percentiles_endpoint_merges_rollups(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "admin_api_key", "secret")
+    app.dependency_overrides[get_db] = lambda: RollupSession()
+    try:
+        client = TestClient(app)
+        resp = client.get(
+            "/telemetry/performance/percentiles",
+            params=[("group_by", "device_model"), ("q", "0.5"), ("q", "1")],
+            headers={"X-API-Key": "secret"},
+        )
+        bad = client.get(
+            "/telemetry/performance/percentiles",
+            params={"q": "1.5"},
+            headers={"X-API-Key": "secret"},
+        )
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["metric"] == "frame_latency_ms"
+    groups = {group["device_model"]: group for group in body["groups"]}
+    assert groups["Pixel 8"]["count"] == 3
+    assert groups["Pixel 8"]["mean"] == 140.0 / 3
+    assert abs(groups["Pixel 8"]["quantiles"]["p100"] - 80.0) <= 0.8
+    assert groups["iPhone 15"]["hour"] is None
+    assert bad.status_code == 400
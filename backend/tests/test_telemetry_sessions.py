@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from radiobuddy_api.features.telemetry.models import TelemetrySession
+from radiobuddy_api.features.telemetry.schemas import TelemetryEventIn
+from radiobuddy_api.features.telemetry.service import store_events
+from radiobuddy_api.features.telemetry.sessions import summarize_events
+from radiobuddy_api.main import app
+from radiobuddy_api.platform.config import settings
+from radiobuddy_api.platform.db.session import get_db
+
+START = dt.datetime(2026, 10, 17, 9, tzinfo=dt.timezone.utc)
+SESSION_ID = uuid.uuid4()
+
+
+def _event(event_type: str, seconds: int, **extra) -> TelemetryEventIn:
+    return TelemetryEventIn.model_validate(
+        {
+            "schema_version": "v1",
+            "event_id": str(uuid.uuid4()),
+            "timestamp": (START + dt.timedelta(seconds=seconds)).isoformat(),
+            "event_type": event_type,
+            "procedure_id": "chest_pa",
+            "session_id": str(SESSION_ID),
+            **extra,
+        }
+    )
+
+
+def _session_events() -> list[TelemetryEventIn]:
+    # Deliberately out of order.
+    return [
+        _event("ready_state_entered", 40),
+        _event("session_start", 0),
+        _event("prompt_emitted", 10, prompt={"rule_id": "chin_up"}),
+        _event("prompt_emitted", 20, prompt={"rule_id": "chin_up"}),
+        _event("exposure_suggested", 45, exposure={"kvp": 110.0, "mas": 2.0}),
+        _event("exposure_suggested", 30, exposure={"kvp": 100.0, "mas": 2.0}),
+        _event("habitus_overridden", 15),
+        _event("session_end", 60),
+    ]
+
+
+def test_summarize_events_folds_a_session() -> None:
+    other = _session_events()[0].model_copy(update={"session_id": None})
+    summaries = summarize_events([*_session_events(), other], START)
+
+    assert len(summaries) == 1
+    summary = summaries[0]
+    assert summary["started_at"] == START
+    assert summary["ready_at"] == START + dt.timedelta(seconds=40)
+    assert summary["ended_at"] == START + dt.timedelta(seconds=60)
+    assert summary["event_count"] == 8
+    assert summary["prompt_counts"] == {"chin_up": 2}
+    assert summary["habitus_overridden"] is True
+    assert summary["last_exposure"]["kvp"] == 110.0
+
+
+class RecordingResult:
+    def __init__(self, rows: list) -> None:
+        self.rows = rows
+
+    def scalars(self) -> RecordingResult:
+        return self
+
+    def all(self) -> list:
+        return self.rows
+
+
+class InsertingSession:
+    def __init__(self, inserted: list) -> None:
+        self.inserted = inserted
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return RecordingResult(self.inserted)
+
+    async def commit(self) -> None:
+        pass
+
+
+def test_store_events_upserts_sessions_for_inserted_rows_only() -> None:
+    events = _session_events()
+    # Only the first two rows are new; the rest were stored before.
+    db = InsertingSession([events[0].event_id, events[1].event_id])
+
+    asyncio.run(store_events(db, events))
+
+    assert len(db.statements) == 2
+    upsert = db.statements[1]
+    assert upsert.compile().params["event_count_m0"] == 2
+    sql = str(upsert.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (session_id) DO UPDATE" in sql
+    assert "least(telemetry_sessions.ready_at" in sql
+    assert "telemetry_sketch_merge(telemetry_sessions.prompt_counts" in sql
+
+
+def test_duplicate_in_one_batch_counts_once() -> None:
+    event = _event("prompt_emitted", 10, prompt={"rule_id": "r1"})
+    db = InsertingSession([event.event_id])
+
+    assert asyncio.run(store_events(db, [event, event.model_copy()])) == 1
+
+    insert, upsert = db.statements
+    assert "event_id_m1" not in insert.compile().params
+    params = upsert.compile().params
+    assert params["event_count_m0"] == 1
+    assert params["prompt_counts_m0"] == {"r1": 1}
+
+
+def test_duplicate_in_one_upload_chunk_counts_once() -> None:
+    event = _event("prompt_emitted", 10, prompt={"rule_id": "r1"})
+    line = event.model_dump_json().encode() + b"\n"
+    db = InsertingSession([event.event_id])
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        resp = TestClient(app).post("/telemetry/events:upload", content=line + line)
+    finally:
+        app.dependency_overrides.pop(get_db)
+
+    assert resp.status_code == 200
+    params = db.statements[1].compile().params
+    assert params["event_count_m0"] == 1
+    assert params["prompt_counts_m0"] == {"r1": 1}
+
+
+class SessionLookup:
+    def __init__(self, row) -> None:
+        self.row = row
+
+    async def get(self, model, key):
+        return self.row
+
+
+def test_session_endpoint_derives_timings(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "admin_api_key", "secret")
+    row = TelemetrySession(
+        session_id=SESSION_ID,
+        procedure_id="chest_pa",
+        started_at=START,
+        first_event_at=START,
+        last_event_at=START + dt.timedelta(seconds=60),
+        ready_at=START + dt.timedelta(seconds=40),
+        ended_at=START + dt.timedelta(seconds=60),
+        event_count=8,
+        prompt_counts={"chin_up": 2},
+        habitus_overridden=True,
+        updated_at=START,
+    )
+    client = TestClient(app)
+    try:
+        app.dependency_overrides[get_db] = lambda: SessionLookup(row)
+        body = client.get(f"/telemetry/sessions/{SESSION_ID}", headers={"X-API-Key": "secret"})
+        app.dependency_overrides[get_db] = lambda: SessionLookup(None)
+        missing = client.get(f"/telemetry/sessions/{uuid.uuid4()}", headers={"X-API-Key": "secret"})
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert body.status_code == 200
+    assert body.json()["status"] == "ended"
+    assert body.json()["seconds_to_ready"] == 40.0
+    assert body.json()["duration_seconds"] == 60.0
+    assert missing.status_code == 404
+
+
+@pytest.mark.skipif(not settings.database_url, reason="RADIOBUDDY_DATABASE_URL not set")
+def test_session_summary_roundtrip(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "admin_api_key", "secret")
+    client = TestClient(app)
+    events = [event.model_dump(mode="json") for event in _session_events()]
+    # Split across batches and resent: the summary must not change.
+    client.post("/telemetry/events:batch", json={"events": events[:4]})
+    client.post("/telemetry/events:batch", json={"events": events})
+
+    body = client.get(f"/telemetry/sessions/{SESSION_ID}", headers={"X-API-Key": "secret"}).json()
+
+    assert body["event_count"] == 8
+    assert body["prompt_counts"] == {"chin_up": 2}
+    assert body["seconds_to_ready"] == 40.0
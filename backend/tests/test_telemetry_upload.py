@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import uuid
+
+from fastapi.testclient import TestClient
+
+from radiobuddy_api.features.telemetry import router as telemetry_router
+from radiobuddy_api.features.telemetry.upload import gunzip_chunks, ingest_ndjson, ndjson_lines
+from radiobuddy_api.main import app
+from radiobuddy_api.platform.db.session import get_db
+
+
+def _line(**overrides) -> bytes:
+    event = {
+        "schema_version": "v1",
+        "event_id": str(uuid.uuid4()),
+        "timestamp": "2026-01-01T22:25:30.509Z",
+        "event_type": "session_start",
+        "procedure_id": "chest_pa",
+    }
+    event.update(overrides)
+    return json.dumps(event).encode() + b"\n"
+
+
+async def _chunks(data: bytes, size: int = 7):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def _collect(iterator) -> list:
+    return [item async for item in iterator]
+
+
+def _ingest(chunks, chunk_events: int = 2, max_line_bytes: int = 4096, **kwargs):
+    stored: list[list] = []
+
+    async def store(events) -> None:
+        stored.append(list(events))
+
+    result = asyncio.run(
+        ingest_ndjson(
+            chunks,
+            store,
+            chunk_events=chunk_events,
+            max_line_bytes=max_line_bytes,
+            max_errors=kwargs.pop("max_errors", 10),
+            **kwargs,
+        )
+    )
+    return result, stored
+
+
+def test_ndjson_lines_reports_offsets_and_drops_oversized_lines() -> None:
+    data = b"ab\n" + b"x" * 50 + b"\n\ncd"
+    lines = asyncio.run(_collect(ndjson_lines(_chunks(data, size=4), max_line_bytes=10)))
+
+    assert lines == [(0, 3, b"ab"), (3, 54, None), (54, 55, b""), (55, 57, b"cd")]
+
+
+def test_gunzip_handles_concatenated_members() -> None:
+    data = gzip.compress(b"one\n") + gzip.compress(b"two\n")
+    out = asyncio.run(_collect(gunzip_chunks(_chunks(data))))
+    assert b"".join(out) == b"one\ntwo\n"
+
+
+def test_ingest_writes_chunks_and_reports_line_errors() -> None:
+    body = _line() + _line(event_type="bogus") + b"not json\n" + _line() + _line()
+    result, stored = _ingest(gunzip_chunks(_chunks(gzip.compress(body))))
+
+    assert [len(chunk) for chunk in stored] == [2, 1]
+    assert (result.accepted, result.rejected, result.lines) == (3, 2, 5)
+    assert [error.line for error in result.errors] == [2, 3]
+    assert result.errors[0].offset == len(_line())
+    assert result.committed_offset == len(body)
+    assert result.complete
+
+
+def test_truncated_gzip_commits_whole_lines_only() -> None:
+    body = b"".join(_line() for _ in range(5))
+    compressed = gzip.compress(body)
+    result, stored = _ingest(gunzip_chunks(_chunks(compressed[: len(compressed) // 2 + 40])))
+
+    assert not result.complete
+    assert result.detail == "truncated_gzip_stream"
+    assert result.accepted == sum(len(chunk) for chunk in stored)
+    assert body[: result.committed_offset].endswith(b"\n")
+    assert result.committed_offset == len(_line()) * result.accepted
+
+    resumed, _ = _ingest(
+        _chunks(body[result.committed_offset :]), start_offset=result.committed_offset
+    )
+    assert resumed.accepted == 5 - result.accepted
+    assert resumed.committed_offset == len(body)
+
+
+def test_error_list_is_capped() -> None:
+    result, _ = _ingest(_chunks(b"x\n" * 5), max_errors=2)
+    assert result.rejected == 5
+    assert len(result.errors) == 2
+    assert result.errors_truncated
+
+
+def test_upload_endpoint_accepts_gzip(monkeypatch) -> None:
+    stored: list = []
+
+    async def store_events(db, events) -> None:
+        stored.extend(events)
+
+    monkeypatch.setattr(telemetry_router, "store_events", store_events)
+    app.dependency_overrides[get_db] = lambda: None
+    try:
+        client = TestClient(app)
+        body = _line() + _line() + b"{}\n"
+        resp = client.post(
+            "/telemetry/events:upload?offset=100",
+            content=gzip.compress(body),
+            headers={"Content-Encoding": "gzip", "Content-Type": "application/x-ndjson"},
+        )
+        assert resp.status_code == 200
+        data = resp.json()
+        assert (data["accepted"], data["rejected"]) == (2, 1)
+        assert data["committed_offset"] == 100 + len(body)
+        assert len(stored) == 2
+
+        resp = client.post(
+            "/telemetry/events:upload", content=body, headers={"Content-Encoding": "br"}
+        )
+        assert resp.status_code == 415
+    finally:
+        app.dependency_overrides.pop(get_db, None)